@@ -7,11 +7,15 @@ from hopp.simulation.technologies.sites import SiteInfo
 from hopp.simulation.technologies.layout.wind_layout_tools import create_grid
 from hopp.simulation.hopp_interface import HoppInterface
 
+from new_greenheart.core.utilities import get_n_timesteps
+from new_greenheart.resources.store import shared_site_resources
+
 
 # Function to set up the HOPP model
 def setup_hopp(hopp_config, plant_config, electrolyzer_rating=None):
     # overwrite individual fin_model values with cost_info values
     hopp_config = overwrite_fin_values(hopp_config)
+    n_timesteps = get_n_timesteps(plant_config)
 
     # TODO: improve this if logic to correctly account for if the user
     # defines a desired schedule or uses the electrolyzer rating as the desired schedule
@@ -19,12 +23,14 @@ def setup_hopp(hopp_config, plant_config, electrolyzer_rating=None):
         "desired_schedule" not in hopp_config["site"].keys()
         or hopp_config["site"]["desired_schedule"] == []
     ):
-        hopp_config["site"]["desired_schedule"] = [10.] * 8760
+        hopp_config["site"]["desired_schedule"] = [10.] * n_timesteps
 
     if electrolyzer_rating is not None:
-        hopp_config["site"]["desired_schedule"] = [electrolyzer_rating] * 8760
+        hopp_config["site"]["desired_schedule"] = [electrolyzer_rating] * n_timesteps
 
-    hopp_site = SiteInfo(**hopp_config["site"])
+    # the weather files are parsed once per process and shared with the PySAM models
+    with shared_site_resources():
+        hopp_site = SiteInfo(**hopp_config["site"])
 
     # setup hopp interface
     hopp_config_internal = copy.deepcopy(hopp_config)
@@ -44,8 +50,33 @@ def setup_hopp(hopp_config, plant_config, electrolyzer_rating=None):
     return hi
 
 
+# Function to prepare a HOPP interface that has already been simulated for another simulation
+def reset_hopp_financials(hi):
+    # The financial models keep the lifetime generation profile of the previous simulation and
+    # only copy over a new one when it is cleared. Re-simulating a resized system without clearing
+    # it gives stale financials, and for the grid it crashes PySAM.
+    for tech in hi.system.technologies:
+        getattr(hi.system, tech)._financial_model.value("gen", [0.])
+
+
+# Function to return the storage of a HOPP interface to the state of a freshly built one
+def reset_hopp_storage(hi):
+    # Resizing a battery does not update its C-rate, which a new battery derives from its
+    # power and energy capacities, and the dispatch may have moved its initial state of charge.
+    # Setting up the stateful model again discards the state left by the previous simulation.
+    if "battery" in hi.system.technologies:
+        battery = hi.system.battery
+        battery._system_model.ParamsCell.C_rate = (
+            battery.system_capacity_kw / battery.system_capacity_kwh
+        )
+        battery._system_model.value("initial_SOC", battery.config.initial_SOC)
+        battery.setup_performance_model()
+        if battery.dispatch is not None:
+            battery.dispatch.initialize_parameters()
+
+
 # Function to run hopp from provided inputs from setup_hopp()
-def run_hopp(hi, project_lifetime, verbose=True):
+def run_hopp(hi, project_lifetime, verbose=True, n_timesteps=8760):
     hi.simulate(project_life=project_lifetime)
 
     capex = 0.
@@ -79,7 +110,7 @@ def run_hopp(hi, project_lifetime, verbose=True):
         "hopp_interface": hi,
         "hybrid_plant": hi.system,
         "combined_hybrid_power_production_hopp": \
-            hi.system.grid._system_model.Outputs.system_pre_interconnect_kwac[0:8760],
+            hi.system.grid._system_model.Outputs.system_pre_interconnect_kwac[0:n_timesteps],
         "combined_hybrid_curtailment_hopp": hi.system.grid.generation_curtailed,
         "energy_shortfall_hopp": hi.system.grid.missed_load,
         "annual_energies": hi.system.annual_energies,
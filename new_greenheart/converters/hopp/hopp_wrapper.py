@@ -1,12 +1,44 @@
-import hashlib
-import dill
-import os
+import copy
 import numpy as np
 import openmdao.api as om
-from new_greenheart.converters.hopp.hopp_mgmt import setup_hopp, run_hopp
+from new_greenheart.converters.hopp.hopp_mgmt import (
+    setup_hopp, run_hopp, reset_hopp_financials, reset_hopp_storage
+)
+from new_greenheart.core.cache import SimulationCache, canonical_key
+from new_greenheart.core.utilities import get_n_timesteps, get_scenario_shape
 
 
-n_timesteps = 8760
+# The keys of interest from the HOPP results that we want to cache
+keys_of_interest = [
+    'combined_hybrid_power_production_hopp',
+    'capex',
+    'opex',
+]
+
+# Capacity inputs mapped to the HOPP technology and attribute that they set
+capacity_inputs = {
+    'pv_capacity_kw': ('pv', 'system_capacity_kw', 'kW'),
+    'wind_capacity_kw': ('wind', 'system_capacity_kw', 'kW'),
+    'wave_capacity_kw': ('wave', 'system_capacity_kw', 'kW'),
+    'battery_capacity_kw': ('battery', 'system_capacity_kw', 'kW'),
+    'battery_capacity_kwh': ('battery', 'system_capacity_kwh', 'kW*h'),
+}
+
+
+def get_default_capacity(technologies_config, name):
+    """Return the capacity given by the HOPP technologies config for a capacity input."""
+    if name == 'pv_capacity_kw':
+        return technologies_config['pv']['system_capacity_kw']
+    if name == 'wind_capacity_kw':
+        return technologies_config['wind']['num_turbines'] * technologies_config['wind']['turbine_rating_kw']
+    if name == 'wave_capacity_kw':
+        return technologies_config['wave']['num_devices'] * technologies_config['wave']['device_rating_kw']
+    if name == 'battery_capacity_kw':
+        return technologies_config['battery']['system_capacity_kw']
+    if name == 'battery_capacity_kwh':
+        return technologies_config['battery']['system_capacity_kwh']
+    raise KeyError(name)
+
 
 class HOPPComponent(om.ExplicitComponent):
     """
@@ -16,52 +48,97 @@ class HOPPComponent(om.ExplicitComponent):
     based on the configuration and project lifetime. The caching mechanism helps
     to avoid redundant computations and speeds up the execution by reusing previously
     computed results when the same configuration is encountered.
+
+    The cache is configured with an optional `cache` entry in the performance model config,
+    with `flag` (defaults to true), `dir` (defaults to 'cache'), `max_size_mb`, and
+    `max_age_days` keys. See `SimulationCache` for details. Its hit and miss counts are
+    printed at the end of `GreenHEARTModel.run`.
+
+    The PV, wind, wave, and battery capacities of the technologies in the HOPP config are
+    inputs, so they can be used as design variables. The HOPP interface is built on the first
+    cache miss and then kept; later misses only push the capacities that changed into the
+    live system and reset its financial, dispatch, and storage state before simulating again,
+    so the results match those of a freshly built interface whatever ran before. The
+    capacities are shared by all scenarios of a batched run.
     """
     def initialize(self):
         self.options.declare('tech_config', types=dict)
         self.options.declare('plant_config', types=dict)
 
     def setup(self):
-        # Outputs
-        self.add_output('electricity', val=np.zeros(n_timesteps), units='kW', desc='Power output')
-        self.add_output('CapEx', val=0.0, units='USD', desc='Total capital expenditures')
-        self.add_output('OpEx', val=0.0, units='USD/year', desc='Total fixed operating costs')
+        # Outputs; the capacity inputs are not batched, so each scenario shares the same results
+        plant_config = self.options['plant_config']
+        self.add_output('electricity', val=0.0, shape=get_scenario_shape(plant_config, get_n_timesteps(plant_config)), units='kW', desc='Power output')
+        self.add_output('CapEx', val=0.0, shape=get_scenario_shape(plant_config), units='USD', desc='Total capital expenditures')
+        self.add_output('OpEx', val=0.0, shape=get_scenario_shape(plant_config), units='USD/year', desc='Total fixed operating costs')
+
+        technologies_config = self.options['tech_config']['performance_model']['config']['technologies']
+        self.capacity_names = [name for name, (tech, _, _) in capacity_inputs.items() if tech in technologies_config]
+        for name in self.capacity_names:
+            self.add_input(
+                name,
+                val=get_default_capacity(technologies_config, name),
+                units=capacity_inputs[name][2],
+            )
+
+        # The HOPP interface is built on the first cache miss and then reused
+        self.hybrid_interface = None
+        self.applied_capacities = {}
+
+        cache_config = self.options['tech_config']['performance_model'].get('cache', {})
+        self.cache = None
+        if cache_config.get('flag', True):
+            self.cache = SimulationCache.from_config(cache_config)
 
     def compute(self, inputs, outputs):
-        # Create a unique hash for the current configuration to use as a cache key
-        config_hash = hashlib.md5(str(self.options['tech_config']['performance_model']['config']).encode('utf-8') + str(self.options['plant_config']['plant']['plant_life']).encode('utf-8')).hexdigest()
-
-        # Define the keys of interest from the HOPP results that we want to cache
-        keys_of_interest = [
-            'combined_hybrid_power_production_hopp',
-            'capex',
-            'opex',
-        ]
-
-        # Create a cache directory if it doesn't exist
-        if not os.path.exists("cache"):
-            os.makedirs("cache")
-        cache_file = f"cache/{config_hash}.pkl"
-
-        # Check if the results for the current configuration are already cached
-        if os.path.exists(cache_file):
-            # Load the cached results
-            with open(cache_file, 'rb') as f:
-                subset_of_hopp_results = dill.load(f)
-        else:
-            electrolyzer_rating = None
-            if 'electrolyzer_rating' in self.options['tech_config']:
-                electrolyzer_rating = self.options['tech_config']['electrolyzer_rating']
-                
-            self.hybrid_interface = setup_hopp(self.options['tech_config']['performance_model']['config'], self.options['plant_config'], electrolyzer_rating)
+        tech_config = self.options['tech_config']
+        plant_life = self.options['plant_config']['plant']['plant_life']
+        electrolyzer_rating = tech_config.get('electrolyzer_rating')
+        capacities = {name: float(inputs[name][0]) for name in self.capacity_names}
+
+        # The cache key covers every input that affects the HOPP results
+        cache_key = canonical_key({
+            'hopp_config': tech_config['performance_model']['config'],
+            'plant_life': plant_life,
+            'n_timesteps': get_n_timesteps(self.options['plant_config']),
+            'electrolyzer_rating': electrolyzer_rating,
+            'capacities': capacities,
+        })
+
+        subset_of_hopp_results = None
+        if self.cache is not None:
+            subset_of_hopp_results = self.cache.get(cache_key)
+
+        if subset_of_hopp_results is None:
+            if self.hybrid_interface is None:
+                # setup_hopp modifies the config it is given, so pass it a copy to keep the cache key stable
+                hopp_config = copy.deepcopy(tech_config['performance_model']['config'])
+                self.hybrid_interface = setup_hopp(hopp_config, self.options['plant_config'], electrolyzer_rating)
+                for name in self.capacity_names:
+                    tech, attribute, _ = capacity_inputs[name]
+                    self.applied_capacities[name] = getattr(getattr(self.hybrid_interface.system, tech), attribute)
+            else:
+                reset_hopp_financials(self.hybrid_interface)
+
+            # Only push the capacities that changed since the last simulation
+            for name, capacity in capacities.items():
+                if capacity != self.applied_capacities[name]:
+                    tech, attribute, _ = capacity_inputs[name]
+                    setattr(getattr(self.hybrid_interface.system, tech), attribute, capacity)
+                    self.applied_capacities[name] = capacity
+
+            # Nothing of a previous simulation or resize may carry over into this simulation
+            reset_hopp_storage(self.hybrid_interface)
 
             # Run the HOPP model and get the results
-            hopp_results = run_hopp(self.hybrid_interface, self.options['plant_config']['plant']['plant_life'])
+            hopp_results = run_hopp(
+                self.hybrid_interface, plant_life, n_timesteps=get_n_timesteps(self.options['plant_config'])
+            )
             # Extract the subset of results we are interested in
             subset_of_hopp_results = {key: hopp_results[key] for key in keys_of_interest}
             # Cache the results for future use
-            with open(cache_file, 'wb') as f:
-                dill.dump(subset_of_hopp_results, f)
+            if self.cache is not None:
+                self.cache.put(cache_key, subset_of_hopp_results)
 
         # Set the outputs from the cached or newly computed results
         outputs['electricity'] = subset_of_hopp_results["combined_hybrid_power_production_hopp"]
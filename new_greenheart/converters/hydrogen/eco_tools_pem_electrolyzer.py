@@ -16,8 +16,11 @@ from new_greenheart.converters.hydrogen.electrolyzer_baseclass import (
     ElectrolyzerCostBaseClass,
     ElectrolyzerFinanceBaseClass,
 )
+from new_greenheart.core.representative_periods import annualization_factor
 from new_greenheart.core.utilities import (
     BaseConfig,
+    get_n_scenarios,
+    get_scenario_shape,
     merge_shared_performance_inputs,
     merge_shared_cost_inputs
 )
@@ -67,13 +70,22 @@ class ECOElectrolyzerPerformanceModel(ElectrolyzerPerformanceBaseClass):
     """
     An OpenMDAO component that wraps the PEM electrolyzer model.
     Takes electricity input and outputs hydrogen and oxygen generation rates.
+    The wrapped model simulates hourly time steps only.
     """
+    hourly_time_steps_only = True
+
     def setup(self):
         super().setup()
         self.config = ECOElectrolyzerPerformanceModelConfig.from_dict(
             merge_shared_performance_inputs(self.options["tech_config"]["model_inputs"])
         )
-        self.add_output('efficiency', val=0.0, desc='Average efficiency of the electrolyzer')
+        self.n_scenarios = get_n_scenarios(self.options['plant_config'])
+        self.add_output(
+            'efficiency',
+            val=0.0,
+            shape=get_scenario_shape(self.options['plant_config']),
+            desc='Average efficiency of the electrolyzer',
+        )
 
         self.add_input('electrolyzer_size_mw', units='MW', desc='Size of the electrolyzer in MW')
 
@@ -101,7 +113,7 @@ class ECOElectrolyzerPerformanceModel(ElectrolyzerPerformanceBaseClass):
         # else:
         hydrogen_production_capacity_required_kgphr = []
         grid_connection_scenario = "off-grid"
-        energy_to_electrolyzer_kw = inputs['electricity']
+        energy_to_electrolyzer_kw = inputs['electricity'].reshape(self.n_scenarios, -1)
 
         n_pem_clusters = int(
             ceildiv(electrolyzer_size_mw, self.config.cluster_rating_MW)
@@ -115,25 +127,40 @@ class ECOElectrolyzerPerformanceModel(ElectrolyzerPerformanceBaseClass):
             "turndown_ratio": self.config.turndown_ratio,
         }
 
-        H2_Results, h2_ts, h2_tot, power_to_electrolyzer_kw = run_h2_PEM(
-            electrical_generation_timeseries=energy_to_electrolyzer_kw,
-            electrolyzer_size=electrolyzer_size_mw,
-            useful_life=plant_life,
-            n_pem_clusters=n_pem_clusters,
-            pem_control_type=self.config.pem_control_type,
-            electrolyzer_direct_cost_kw=electrolyzer_capex_kw,
-            user_defined_pem_param_dictionary=pem_param_dict,
-            grid_connection_scenario=grid_connection_scenario,  # if not offgrid, assumes steady h2 demand in kgphr for full year  # noqa: E501
-            hydrogen_production_capacity_required_kgphr=hydrogen_production_capacity_required_kgphr,
-            debug_mode=False,
-            verbose=False,
-        )
+        hydrogen = np.zeros_like(energy_to_electrolyzer_kw)
+        total_hydrogen_produced = np.zeros(self.n_scenarios)
+        efficiency = np.zeros(self.n_scenarios)
+        time_until_replacement = np.zeros(self.n_scenarios)
 
-        # Assuming `h2_results` includes hydrogen and oxygen rates per timestep
-        outputs['hydrogen'] = H2_Results["Hydrogen Hourly Production [kg/hr]"]
-        outputs['total_hydrogen_produced'] = H2_Results["Life: Annual H2 production [kg/year]"]
-        outputs['efficiency'] = H2_Results["Sim: Average Efficiency [%-HHV]"]
-        outputs['time_until_replacement'] = H2_Results["Time Until Replacement [hrs]"]
+        # run_h2_PEM is not vectorized, so each scenario is run in turn
+        for scenario in range(self.n_scenarios):
+            H2_Results, h2_ts, h2_tot, power_to_electrolyzer_kw = run_h2_PEM(
+                electrical_generation_timeseries=energy_to_electrolyzer_kw[scenario],
+                electrolyzer_size=electrolyzer_size_mw,
+                useful_life=plant_life,
+                n_pem_clusters=n_pem_clusters,
+                pem_control_type=self.config.pem_control_type,
+                electrolyzer_direct_cost_kw=electrolyzer_capex_kw,
+                user_defined_pem_param_dictionary=pem_param_dict,
+                grid_connection_scenario=grid_connection_scenario,  # if not offgrid, assumes steady h2 demand in kgphr for full year  # noqa: E501
+                hydrogen_production_capacity_required_kgphr=hydrogen_production_capacity_required_kgphr,
+                debug_mode=False,
+                verbose=False,
+            )
+
+            # Assuming `h2_results` includes hydrogen and oxygen rates per timestep
+            hydrogen[scenario] = H2_Results["Hydrogen Hourly Production [kg/hr]"]
+            total_hydrogen_produced[scenario] = H2_Results["Life: Annual H2 production [kg/year]"]
+            efficiency[scenario] = H2_Results["Sim: Average Efficiency [%-HHV]"]
+            time_until_replacement[scenario] = H2_Results["Time Until Replacement [hrs]"]
+
+        outputs['hydrogen'] = hydrogen
+        # The lifetime model treats the simulated time steps as a year
+        outputs['total_hydrogen_produced'] = total_hydrogen_produced * annualization_factor(
+            hydrogen, self.options['plant_config']
+        )
+        outputs['efficiency'] = efficiency
+        outputs['time_until_replacement'] = time_until_replacement
 
 
 @define
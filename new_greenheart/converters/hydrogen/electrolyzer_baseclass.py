@@ -1,19 +1,31 @@
 import openmdao.api as om
 
+from new_greenheart.core.utilities import get_dt_hours, get_scenario_shape
+
 
 class ElectrolyzerPerformanceBaseClass(om.ExplicitComponent):
+    # Set by models that can only simulate hourly time steps
+    hourly_time_steps_only = False
 
     def initialize(self):
         self.options.declare('plant_config', types=dict)
         self.options.declare('tech_config', types=dict)
 
     def setup(self):
+        self.dt_hours = get_dt_hours(self.options['plant_config'])
+        if self.hourly_time_steps_only and self.dt_hours != 1:
+            raise ValueError(
+                f"{type(self).__name__} only simulates hourly time steps, but dt_hours is "
+                f"{self.dt_hours}"
+            )
+
         # Define inputs for electricity and outputs for hydrogen and oxygen generation
         self.add_input('electricity', val=0.0, shape_by_conn=True, copy_shape='hydrogen', units='kW')
         self.add_output('hydrogen', val=0.0, shape_by_conn=True, copy_shape='electricity', units='kg/h')
-        self.add_output('time_until_replacement', val=80000., units='h', desc='Time until replacement')
+        shape = get_scenario_shape(self.options['plant_config'])
+        self.add_output('time_until_replacement', val=80000., shape=shape, units='h', desc='Time until replacement')
 
-        self.add_output('total_hydrogen_produced', val=0.0, units='kg/year')
+        self.add_output('total_hydrogen_produced', val=0.0, shape=shape, units='kg/year')
 
     def compute(self, inputs, outputs):
         """
@@ -32,11 +44,12 @@ class ElectrolyzerCostBaseClass(om.ExplicitComponent):
         self.options.declare('tech_config', types=dict)
 
     def setup(self):
-        self.add_input('total_hydrogen_produced', val=0.0, units='kg/year')
+        shape = get_scenario_shape(self.options['plant_config'])
+        self.add_input('total_hydrogen_produced', val=0.0, shape=shape, units='kg/year')
         self.add_input('electricity', val=0.0, shape_by_conn=True, units='kW')
         # Define outputs: CapEx and OpEx costs
-        self.add_output('CapEx', val=0.0, units='USD', desc='Capital expenditure')
-        self.add_output('OpEx', val=0.0, units='USD/year', desc='Operational expenditure')
+        self.add_output('CapEx', val=0.0, shape=shape, units='USD', desc='Capital expenditure')
+        self.add_output('OpEx', val=0.0, shape=shape, units='USD/year', desc='Operational expenditure')
 
     def compute(self, inputs, outputs):
         """
@@ -0,0 +1,462 @@
+"""
+Vectorized low-temperature PEM electrolyzer cluster model.
+
+A NumPy port of the `PEM_H2_Clusters` model and the even power split of `run_PEM_clusters`
+from `greenheart`. Each row of the 2-D arrays is one cluster, possibly of a different batched
+scenario, and each column is one time step, so the power split, turndown, I-V curve, degradation
+accumulation, and time until replacement of every cluster are evaluated at once instead of
+looping over clusters and hours in Python. The rainflow counting used for fatigue degradation
+follows the `rainflow` package (ASTM E1049-85) and is batched over every cluster and counting
+window.
+"""
+
+import functools
+
+import numpy as np
+import scipy.optimize
+
+
+# Stack design, all stacks are rated at 1 MW
+STACK_RATING_KW = 1000
+CELL_ACTIVE_AREA = 1920  # [cm^2]
+N_CELLS = 130
+MEMBRANE_THICKNESS = 0.018  # [cm]
+MAX_CELL_CURRENT = 2 * CELL_ACTIVE_AREA  # max current density of 2 A/cm^2
+STACK_TEMPERATURE = 80  # [C]
+
+# Constants
+MOLES_PER_G_H2 = 0.49606
+FARADAY = 96485.34  # [C/mol]
+GAS_CONSTANT = 8.314  # [J/mol/K]
+ETA_H2_HHV = 39.41  # [kWh/kg]
+MMHG_2_ATM = 133.322 / 101325
+
+# Degradation
+ONOFF_DEG_RATE = 1.47821515e-04  # [V/off-cycle]
+FATIGUE_DEG_RATE = 3.33330244e-07  # [V] per rainflow range-count
+FATIGUE_WINDOW_HOURS = 168
+FATIGUE_BINS = 10
+STARTUP_TIME = 600  # [s]
+
+
+def calc_current(power_kw, p1, p2, p3, p4, p5, p6):
+    """Stack current [A] from the stack power [kW] with the fitted I-V curve coefficients."""
+    return p1 * (power_kw**3) + p2 * (power_kw**2) + (p3 * power_kw) + (p4 * power_kw ** (1 / 2)) + p5
+
+
+def cell_voltage(stack_temperature, stack_current):
+    """Cell voltage [V] as the sum of the reversible, activation, and ohmic voltages."""
+    T_K = stack_temperature + 273.15
+
+    # Reversible voltage with the Antoine vapor pressure of water and 1 atm electrode pressures
+    p_h2o_sat_atm = 10 ** (8.07131 - (1730.63 / (233.426 + stack_temperature))) * MMHG_2_ATM
+    E_cell = 1.229 + ((GAS_CONSTANT * T_K) / (2 * FARADAY)) * (
+        np.log((1 - p_h2o_sat_atm) * np.sqrt(1 - p_h2o_sat_atm))
+    )
+
+    # Anode and cathode activation voltages
+    i = stack_current / CELL_ACTIVE_AREA
+    V_anode = ((GAS_CONSTANT * T_K) / (2 * FARADAY)) * np.arcsinh(i / (2 * (2 * (10 ** (-7)))))
+    V_cathode = ((GAS_CONSTANT * T_K) / (0.5 * FARADAY)) * np.arcsinh(i / (2 * (2 * (10 ** (-3)))))
+    V_act = V_anode + V_cathode
+
+    # Ohmic voltage of the membrane and electrodes
+    lambda_water_content = ((-2.89556 + (0.016 * T_K)) + 1.625) / 0.1875
+    sigma = ((0.005139 * lambda_water_content) - 0.00326) * np.exp(1268 * ((1 / 303) - (1 / T_K)))
+    R_cell = MEMBRANE_THICKNESS / sigma
+    R_elec = 3.5 * (10 ** (-5))
+    V_ohmic = i * (R_cell + R_elec)
+
+    return E_cell + V_act + V_ohmic
+
+
+def faradaic_efficiency(stack_current):
+    f_1 = 250  # [mA^2/cm^4]
+    f_2 = 0.996
+    I_cell = stack_current * 1000
+    return (
+        ((I_cell / CELL_ACTIVE_AREA) ** 2) / (f_1 + ((I_cell / CELL_ACTIVE_AREA) ** 2))
+    ) * f_2
+
+
+def h2_production_rate(stack_current, n_stacks_op, dt):
+    """Hydrogen production [kg per time step] from Faraday's law."""
+    n_Tot = faradaic_efficiency(stack_current)
+    h2_production_rate = n_Tot * ((N_CELLS * stack_current) / (2 * FARADAY))  # mol/s
+    h2_production_rate_g_s = h2_production_rate / MOLES_PER_G_H2
+    h2_produced_kg_hr = h2_production_rate_g_s * (dt / 1000)
+    return n_stacks_op * h2_produced_kg_hr
+
+
+@functools.lru_cache(maxsize=None)
+def iv_curve_coefficients(turndown_ratio):
+    """
+    Fit the stack current as a function of stack power at the stack temperature.
+
+    The fit is identical to `PEM_H2_Clusters.iv_curve`, and is cached because it only depends on
+    the turndown ratio.
+    """
+    current_range = np.arange(turndown_ratio * MAX_CELL_CURRENT, MAX_CELL_CURRENT + 10, 10)
+    powers = np.array([
+        current * cell_voltage(STACK_TEMPERATURE, current) * N_CELLS * (1e-3)
+        for current in current_range
+    ])
+    coefficients, _ = scipy.optimize.curve_fit(
+        lambda power, *p: calc_current(power[0], *p),
+        (powers, np.full(len(powers), STACK_TEMPERATURE)),
+        current_range,
+        p0=(1.0, 1.0, 1.0, 1.0, 1.0, 1.0),
+    )
+    return tuple(coefficients)
+
+
+def even_split_power(power_kw, n_clusters, cluster_min_power_kw):
+    """
+    Split the power evenly among as many clusters as can be run above their minimum power.
+
+    Args:
+        power_kw (np.ndarray): Power to the electrolyzer with one row per scenario.
+        n_clusters (int): Number of clusters.
+        cluster_min_power_kw (float): Minimum power of a cluster.
+
+    Returns:
+        np.ndarray: Power to each cluster, shaped (scenarios, clusters, time steps).
+    """
+    n_clusters_on = np.minimum(np.floor(power_kw / cluster_min_power_kw), n_clusters)
+    power_per_cluster = np.divide(
+        power_kw, n_clusters_on, out=np.zeros_like(power_kw), where=n_clusters_on > 0
+    )
+    cluster_on = np.arange(n_clusters)[:, None] < n_clusters_on[:, None, :]
+    return np.where(cluster_on, power_per_cluster[:, None, :], 0.0)
+
+
+def _pack(values, mask):
+    """Move the masked entries of each row to the front, keeping their order."""
+    order = np.argsort(~mask, axis=1, kind='stable')
+    return np.take_along_axis(values, order, axis=1), mask.sum(axis=1)
+
+
+def rainflow_range_sums(series, lengths, nbins=FATIGUE_BINS):
+    """
+    Sum of the binned ranges of the rainflow cycles of many series at once.
+
+    Equivalent to `sum(rng * count for rng, count in rainflow.count_cycles(s, nbins=nbins))` for
+    each series `s`: the reversals of every series are extracted with array operations, and the
+    ASTM E1049-85 stack of every series is advanced together, one reversal at a time.
+
+    Args:
+        series (np.ndarray): Series padded to a common length, one per row.
+        lengths (np.ndarray): Length of each series.
+        nbins (int, optional): Number of cycle counting bins. Defaults to 10.
+
+    Returns:
+        np.ndarray: The range-count sum of each series, zero for constant or empty series.
+    """
+    n_series, width = series.shape
+    range_sums = np.zeros(n_series)
+    if width < 2:
+        return range_sums
+
+    steps = np.arange(width)
+    valid = steps < lengths[:, None]
+    binsize = (
+        np.max(np.where(valid, series, -np.inf), axis=1)
+        - np.min(np.where(valid, series, np.inf), axis=1)
+    ) / nbins
+    counted = (lengths > 0) & (binsize > 0)
+    binsize = np.where(counted, binsize, 1.0)
+
+    # The first point is always a reversal; the remaining points are compressed to the values
+    # that differ from the previous point
+    start = series[:, 0]
+    rest, n_rest = _pack(
+        series[:, 1:],
+        valid[:, 1:] & np.concatenate(
+            [np.ones((n_series, 1), dtype=bool), series[:, 2:] != series[:, 1:-1]], axis=1
+        ),
+    )
+    slope_before = np.diff(np.concatenate([start[:, None], rest], axis=1), axis=1)
+    slope_after = np.diff(rest, axis=1, append=rest[:, -1:])
+    is_reversal = (slope_before * slope_after < 0) & (steps[:-1] < n_rest[:, None] - 1)
+    # The last point is a reversal if the series has at least three points
+    is_reversal |= (steps[:-1] == n_rest[:, None] - 1) & (lengths[:, None] >= 3)
+    reversals, n_reversals = _pack(rest, is_reversal)
+    reversals = np.concatenate([start[:, None], reversals], axis=1)
+    n_reversals = np.where(lengths > 0, n_reversals + 1, 0)
+
+    counts = np.zeros((n_series, nbins + 1))
+    rows = np.arange(n_series)
+
+    def count(mask, point_range, cycles):
+        quotient = point_range[mask] / binsize[mask]
+        n = np.ceil(quotient).astype(int)
+        # Due to floating point accuracy n may exceed nbins; the range belongs to the last bin
+        n = np.where(n > nbins, n - 1, n)
+        np.add.at(counts, (rows[mask], n), cycles)
+
+    stack = np.zeros((n_series, width + 1))
+    depth = np.zeros(n_series, dtype=int)
+    for step in range(reversals.shape[1]):
+        active = step < n_reversals
+        if not active.any():
+            break
+        stack[rows[active], depth[active]] = reversals[active, step]
+        depth[active] += 1
+
+        while True:
+            deep = depth >= 3
+            top = np.maximum(depth, 3)
+            x1 = stack[rows, top - 3]
+            x2 = stack[rows, top - 2]
+            x3 = stack[rows, top - 1]
+            X = np.abs(x3 - x2)
+            Y = np.abs(x2 - x1)
+            cycle = active & deep & (X >= Y)
+            if not cycle.any():
+                break
+
+            # With three points Y contains the starting point and is a half cycle
+            half = cycle & (depth == 3)
+            count(half, Y, 0.5)
+            stack[half, :2] = stack[half, 1:3]
+            depth[half] -= 1
+
+            # Otherwise Y is a full cycle and its peak and valley are discarded
+            full = cycle & ~half
+            count(full, Y, 1.0)
+            stack[rows[full], depth[full] - 3] = x3[full]
+            depth[full] -= 2
+
+    # The remaining ranges are half cycles
+    for k in range(int(depth.max(initial=0)) - 1):
+        remaining = k < depth - 1
+        count(remaining, np.abs(stack[:, k] - stack[:, k + 1]), 0.5)
+
+    range_sums = np.sum(np.arange(nbins + 1) * binsize[:, None] * counts, axis=1)
+    return np.where(counted, range_sums, 0.0)
+
+
+class PEMClusters(object):
+    """
+    Vectorized model of PEM electrolyzer clusters made up of 1 MW stacks.
+
+    Args:
+        cluster_size_mw (float or np.ndarray): Number of 1 MW stacks in each cluster, either
+            one value for all clusters or one value per cluster.
+        plant_life (int): Plant life in years.
+        eol_eff_percent_loss (float, optional): End of life defined as a percent increase in
+            the rated specific energy use. Defaults to 10.
+        uptime_hours_until_eol (float, optional): Operating hours until end of life without
+            fatigue or on/off cycling. Defaults to 77600.
+        include_degradation_penalty (bool, optional): Reduce the stack current, and so the
+            hydrogen production, as the cells degrade. Defaults to True.
+        turndown_ratio (float, optional): Fraction of the rated current below which the
+            stacks are turned off. Defaults to 0.1.
+        dt (float, optional): Length of a time step in seconds. The `hourly` results are per
+            time step, as in the hourly model they replicate. Defaults to 3600.
+    """
+    def __init__(
+        self,
+        cluster_size_mw,
+        plant_life,
+        eol_eff_percent_loss=10,
+        uptime_hours_until_eol=77600,
+        include_degradation_penalty=True,
+        turndown_ratio=0.1,
+        dt=3600,
+    ):
+        self.max_stacks = np.reshape(np.asarray(cluster_size_mw, dtype=float), (-1, 1))
+        self.plant_life = int(plant_life)
+        self.include_degradation_penalty = include_degradation_penalty
+        self.turndown_ratio = turndown_ratio
+        self.dt = dt
+        self.curve_coeff = iv_curve_coefficients(turndown_ratio)
+
+        # Beginning of life efficiency curve
+        power_in_signal = np.arange(turndown_ratio, 1.1, 0.1) * STACK_RATING_KW
+        stack_I = calc_current(power_in_signal, *self.curve_coeff)
+        stack_V = cell_voltage(STACK_TEMPERATURE, stack_I)
+        h2_stack_kg = h2_production_rate(stack_I, 1, dt)
+        rated = np.flatnonzero(power_in_signal == STACK_RATING_KW)[0]
+
+        # Degradation at end of life for the rated power and for the top of the curve
+        eol_eff_kWh_per_kg = (power_in_signal[rated] / h2_stack_kg[rated]) * (
+            1 + eol_eff_percent_loss / 100
+        )
+        v_tot_eol = eol_eff_kWh_per_kg * h2_stack_kg[rated] * 1000 / (N_CELLS * stack_I[rated])
+        self.d_eol = v_tot_eol - stack_V[rated]
+
+        h2_eol = h2_stack_kg / ((100 + eol_eff_percent_loss) / 100)
+        i_eol_no_faradaic_loss = (h2_eol * 1000 * 2 * FARADAY * MOLES_PER_G_H2) / (
+            1 * N_CELLS * dt
+        )
+        n_f = faradaic_efficiency(i_eol_no_faradaic_loss)
+        i_eol = (h2_eol * 1000 * 2 * FARADAY * MOLES_PER_G_H2) / (n_f * N_CELLS * dt)
+        self.death_threshold = (((stack_I * stack_V) / i_eol) - stack_V)[-1]
+
+        # Uptime degradation rate that reaches end of life after the given operating hours
+        I_max = calc_current(STACK_RATING_KW, *self.curve_coeff)
+        V_rated = cell_voltage(STACK_TEMPERATURE, I_max)
+        self.steady_deg_rate = self.d_eol / (V_rated * uptime_hours_until_eol * 3600)
+
+        # Rated stack performance
+        V_max = cell_voltage(STACK_TEMPERATURE, stack_I[rated])
+        self.rated_power_consumed_kw = stack_I[rated] * V_max * N_CELLS / 1000
+        self.rated_h2_kg = h2_production_rate(stack_I[rated], 1, dt)
+
+    def fatigue_degradation(self, voltage_signal):
+        """
+        Cumulative fatigue degradation from rainflow counting each week of the voltage signal.
+
+        As in `PEM_H2_Clusters.approx_fatigue_degradation`, each window counts the cycles of the
+        voltages at the window's nonzero positions, taken from the start of the signal.
+        """
+        n_rows, n_steps = voltage_signal.shape
+        window = FATIGUE_WINDOW_HOURS
+        n_windows = len(np.arange(0, n_steps + window, window)) - 1
+
+        padded = np.zeros((n_rows, n_windows * window))
+        padded[:, :n_steps] = voltage_signal
+        nonzero = (padded != 0).reshape(n_rows, n_windows, window)
+        start = padded[:, :window]
+
+        values = np.broadcast_to(start[:, None, :], nonzero.shape).reshape(-1, window)
+        series, lengths = _pack(values, nonzero.reshape(-1, window))
+        range_sums = rainflow_range_sums(series, lengths).reshape(n_rows, n_windows)
+
+        # A constant signal has no fatigue
+        constant = voltage_signal.max(axis=1) == voltage_signal.min(axis=1)
+        range_sums[constant] = 0.0
+
+        rf_track = np.cumsum(range_sums, axis=1)
+        fatigue = np.repeat(rf_track * FATIGUE_DEG_RATE, window, axis=1)[:, :n_steps]
+        return fatigue
+
+    def degradation(self, voltage_signal, cluster_status):
+        """Cumulative voltage degradation from uptime, on/off cycling, and fatigue."""
+        voltage_signal = voltage_signal * cluster_status
+        uptime_deg = self.dt * self.steady_deg_rate * voltage_signal * cluster_status
+
+        change = np.diff(cluster_status, axis=1)
+        self.off_cycles = np.concatenate(
+            [np.zeros((len(change), 1), dtype=int), np.where(change < 0, -1 * change, 0)], axis=1
+        )
+        onoff_deg = ONOFF_DEG_RATE * self.off_cycles
+
+        V_signal = voltage_signal + np.cumsum(uptime_deg, axis=1) + np.cumsum(onoff_deg, axis=1)
+        V_fatigue = self.fatigue_degradation(V_signal)
+        return np.cumsum(uptime_deg, axis=1) + np.cumsum(onoff_deg, axis=1) + V_fatigue
+
+    def annual_performance(self, power_per_stack, V_deg, V_init, h2_multiplier):
+        """
+        Hydrogen production and energy use in each year of the plant life.
+
+        The degradation of the simulated period is repeated every year and accumulated until
+        a cluster reaches end of life, after which its stacks are replaced.
+        """
+        n_rows, n_steps = V_deg.shape
+        steps = np.arange(n_steps)
+        max_stacks = np.broadcast_to(self.max_stacks[:, 0], n_rows)
+        I_in = calc_current(power_per_stack, *self.curve_coeff)
+
+        h2_kg = np.zeros((n_rows, self.plant_life))
+        energy_kwh = np.zeros((n_rows, self.plant_life))
+        refurbishment = np.zeros((n_rows, self.plant_life))
+        V_deg0 = np.zeros((n_rows, 1))
+        for year in range(self.plant_life):
+            V_deg_year = V_deg0 + V_deg
+
+            # Stacks that reach end of life are replaced, restarting their degradation
+            dead = V_deg_year > self.death_threshold
+            died = dead.any(axis=1)
+            replaced = died[:, None] & (steps >= np.argmax(dead, axis=1)[:, None])
+            V_deg_year = np.where(replaced, V_deg, V_deg_year)
+            refurbishment[died, year] = max_stacks[died]
+
+            stack_current = I_in / ((V_init + V_deg_year) / V_init)
+            h2_kg_init = h2_production_rate(stack_current, self.n_stacks_op, self.dt)
+            energy_kwh[:, year] = max_stacks * np.sum(power_per_stack, axis=1) * self.dt / 3600
+            h2_kg[:, year] = np.sum(h2_kg_init * h2_multiplier, axis=1)
+            V_deg0 = V_deg_year[:, -1:]
+
+        return {
+            'annual_h2_kg': h2_kg,
+            'annual_energy_kwh': energy_kwh,
+            'refurbishment_schedule_mw': refurbishment,
+        }
+
+    def run(self, input_power_kw):
+        """
+        Simulate every cluster for every time step.
+
+        Args:
+            input_power_kw (np.ndarray): Power to each cluster, shaped (clusters, time steps).
+
+        Returns:
+            dict: Time series with one row per cluster, and one value or one row of annual
+                values per cluster for the aggregate results.
+        """
+        input_external_power_kw = np.asarray(input_power_kw, dtype=float)
+        n_steps = input_external_power_kw.shape[1]
+        startup_ratio = 1 - (STARTUP_TIME / self.dt)
+
+        # Saturate the input power at the rated power and turn off clusters below turndown
+        rated_power_kw = self.max_stacks * STACK_RATING_KW
+        input_power_kw = np.where(
+            input_external_power_kw > rated_power_kw, rated_power_kw, input_external_power_kw
+        )
+        cluster_status = np.where(input_power_kw < self.turndown_ratio * self.max_stacks, 0, 1)
+
+        # Hydrogen production is reduced while a cluster warms up after being turned on
+        cluster_cycling = np.diff(cluster_status, axis=1, prepend=0)
+        cluster_cycling[:, 0] = 0
+        h2_multiplier = np.where(cluster_cycling > 0, startup_ratio, 1)
+
+        # Power is split evenly among the stacks of a cluster that is on
+        self.n_stacks_op = self.max_stacks * cluster_status
+        power_per_stack = np.divide(
+            input_power_kw,
+            self.n_stacks_op,
+            out=np.zeros_like(input_power_kw),
+            where=self.n_stacks_op > 0,
+        )
+        stack_current = calc_current(power_per_stack, *self.curve_coeff)
+
+        V_init = cell_voltage(STACK_TEMPERATURE, stack_current)
+        deg_signal = self.degradation(V_init, cluster_status)
+        if self.include_degradation_penalty:
+            stack_current = stack_current / ((V_init + deg_signal) / V_init)
+            V_cell = cell_voltage(STACK_TEMPERATURE, stack_current) + deg_signal
+        else:
+            V_cell = cell_voltage(STACK_TEMPERATURE, stack_current)
+
+        # Time until the degradation of the simulated period reaches end of life
+        frac_of_life_used = deg_signal[:, -1] / self.death_threshold
+        operating_steps = np.sum(cluster_status, axis=1)
+        hours_per_step = self.dt / 3600
+        time_until_replacement = (1 / frac_of_life_used) * n_steps * hours_per_step
+        stack_life = (1 / frac_of_life_used) * operating_steps * hours_per_step
+
+        annual = self.annual_performance(power_per_stack, deg_signal, V_init, h2_multiplier)
+
+        stack_power_consumed = (stack_current * V_cell * N_CELLS) / 1000
+        system_power_consumed = self.n_stacks_op * stack_power_consumed
+        h2_kg_hr_system_init = h2_production_rate(stack_current, self.n_stacks_op, self.dt)
+        h2_kg_hr_system = h2_kg_hr_system_init * h2_multiplier
+        total_h2 = np.sum(h2_kg_hr_system, axis=1)
+
+        return {
+            'hydrogen_hourly_production': h2_kg_hr_system,
+            'power_consumed_kw': system_power_consumed,
+            'water_hourly_usage_kg': h2_kg_hr_system * 10 / 3.79 * 3.79,
+            'total_h2_production_kg': total_h2,
+            'total_input_power_kwh': np.sum(input_external_power_kw, axis=1) * hours_per_step,
+            'warm_up_losses_kg': np.sum(h2_kg_hr_system_init, axis=1) - total_h2,
+            'capacity_factor': total_h2 / (self.rated_h2_kg * n_steps * self.max_stacks[:, 0]),
+            'operating_fraction': operating_steps / n_steps,
+            'total_off_cycles': np.sum(self.off_cycles, axis=1),
+            'final_degradation_v': deg_signal[:, -1],
+            'time_until_replacement_hrs': time_until_replacement,
+            'stack_life_hrs': stack_life,
+            **annual,
+        }
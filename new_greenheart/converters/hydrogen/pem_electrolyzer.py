@@ -16,8 +16,11 @@ from new_greenheart.converters.hydrogen.electrolyzer_baseclass import (
     ElectrolyzerCostBaseClass,
     ElectrolyzerFinanceBaseClass
 )
+from new_greenheart.core.representative_periods import annual_sum
 from new_greenheart.core.utilities import (
     BaseConfig,
+    get_n_scenarios,
+    get_scenario_shape,
     merge_shared_cost_inputs,
     merge_shared_performance_inputs
 )
@@ -37,7 +40,10 @@ class ElectrolyzerPerformanceModel(ElectrolyzerPerformanceBaseClass):
     """
     An OpenMDAO component that wraps the PEM electrolyzer model.
     Takes electricity input and outputs hydrogen and oxygen generation rates.
+    The wrapped model simulates hourly time steps only.
     """
+    hourly_time_steps_only = True
+
     def setup(self):
         super().setup()
         self.config = ElectrolyzerPerformanceModelConfig.from_dict(
@@ -51,16 +57,27 @@ class ElectrolyzerPerformanceModel(ElectrolyzerPerformanceBaseClass):
             self.config.include_degradation_penalty,
             self.config.turndown_ratio,
         )
-        self.add_input('cluster_size', val=1.0, units='MW')
+        self.n_scenarios = get_n_scenarios(self.options['plant_config'])
+        self.add_input('cluster_size', val=1.0, shape=get_scenario_shape(self.options['plant_config']), units='MW')
 
     def compute(self, inputs, outputs):
-        # Run the PEM electrolyzer model using the input power signal
-        self.electrolyzer.max_stacks = inputs['cluster_size']
-        h2_results, h2_results_aggregates = self.electrolyzer.run(inputs['electricity'])
-        
-        # Assuming `h2_results` includes hydrogen and oxygen rates per timestep
-        outputs['hydrogen'] = h2_results['hydrogen_hourly_production']
-        outputs['total_hydrogen_produced'] = h2_results_aggregates['Total H2 Production [kg]']
+        # The cluster model is not vectorized, so each scenario is run in turn
+        electricity = inputs['electricity'].reshape(self.n_scenarios, -1)
+        hydrogen = np.zeros_like(electricity)
+        total_hydrogen_produced = np.zeros(self.n_scenarios)
+        for scenario in range(self.n_scenarios):
+            # Run the PEM electrolyzer model using the input power signal
+            self.electrolyzer.max_stacks = inputs['cluster_size'][scenario]
+            h2_results, h2_results_aggregates = self.electrolyzer.run(electricity[scenario])
+
+            # Assuming `h2_results` includes hydrogen and oxygen rates per timestep
+            hydrogen[scenario] = h2_results['hydrogen_hourly_production']
+            total_hydrogen_produced[scenario] = annual_sum(
+                h2_results['hydrogen_hourly_production'], self.options['plant_config']
+            )
+
+        outputs['hydrogen'] = hydrogen
+        outputs['total_hydrogen_produced'] = total_hydrogen_produced
 
 
 @define
@@ -0,0 +1,94 @@
+import numpy as np
+from greenheart.tools.eco.utilities import ceildiv
+
+from new_greenheart.converters.hydrogen.eco_tools_pem_electrolyzer import (
+    ECOElectrolyzerPerformanceModel,
+)
+from new_greenheart.converters.hydrogen.pem_clusters import (
+    ETA_H2_HHV,
+    STACK_RATING_KW,
+    PEMClusters,
+    even_split_power,
+)
+from new_greenheart.converters.hydrogen.pem_electrolyzer import ElectrolyzerPerformanceModel
+from new_greenheart.core.representative_periods import annual_sum, annualization_factor
+
+
+class VectorizedElectrolyzerPerformanceModel(ElectrolyzerPerformanceModel):
+    """
+    A drop-in replacement for `ElectrolyzerPerformanceModel` that runs the cluster of every
+    scenario at once with the vectorized PEM cluster model, for any time step length.
+    """
+    hourly_time_steps_only = False
+
+    def compute(self, inputs, outputs):
+        electricity = inputs['electricity'].reshape(self.n_scenarios, -1)
+        electrolyzer = PEMClusters(
+            inputs['cluster_size'],
+            self.config.plant_life,
+            self.config.eol_eff_percent_loss,
+            self.config.uptime_hours_until_eol,
+            self.config.include_degradation_penalty,
+            self.config.turndown_ratio,
+            dt=3600 * self.dt_hours,
+        )
+        results = electrolyzer.run(electricity)
+
+        # The cluster model produces kilograms per time step
+        hydrogen = results['hydrogen_hourly_production'] / self.dt_hours
+        outputs['hydrogen'] = hydrogen
+        outputs['total_hydrogen_produced'] = annual_sum(hydrogen, self.options['plant_config'])
+
+
+class VectorizedECOElectrolyzerPerformanceModel(ECOElectrolyzerPerformanceModel):
+    """
+    A drop-in replacement for `ECOElectrolyzerPerformanceModel` that splits the power among the
+    clusters of every scenario and runs all of them at once with the vectorized PEM cluster model,
+    for any time step length.
+    """
+    hourly_time_steps_only = False
+
+    def compute(self, inputs, outputs):
+        plant_life = self.options['plant_config']['plant']['plant_life']
+        energy_to_electrolyzer_kw = inputs['electricity'].reshape(self.n_scenarios, -1)
+
+        n_pem_clusters = int(ceildiv(self.config.rating, self.config.cluster_rating_MW))
+        cluster_size_mw = np.round(self.config.rating / n_pem_clusters)
+        cluster_min_power_kw = self.config.turndown_ratio * STACK_RATING_KW * cluster_size_mw
+
+        power_to_clusters = even_split_power(
+            energy_to_electrolyzer_kw, n_pem_clusters, cluster_min_power_kw
+        )
+        electrolyzer = PEMClusters(
+            cluster_size_mw,
+            plant_life,
+            self.config.eol_eff_percent_loss,
+            self.config.uptime_hours_until_eol,
+            self.config.include_degradation_penalty,
+            self.config.turndown_ratio,
+            dt=3600 * self.dt_hours,
+        )
+        results = electrolyzer.run(power_to_clusters.reshape(-1, power_to_clusters.shape[-1]))
+
+        def by_scenario(values):
+            return values.reshape(self.n_scenarios, n_pem_clusters, *values.shape[1:])
+
+        # Clusters that are never on produce no hydrogen, as in the cluster-by-cluster model
+        with np.errstate(divide='ignore', invalid='ignore'):
+            kwh_per_kg = results['total_input_power_kwh'] / results['total_h2_production_kg']
+            efficiency = ETA_H2_HHV / np.mean(by_scenario(kwh_per_kg), axis=1)
+            time_until_replacement = np.nanmean(
+                by_scenario(results['time_until_replacement_hrs']), axis=1
+            )
+
+        # The cluster model produces kilograms per time step
+        hydrogen = by_scenario(results['hydrogen_hourly_production']).sum(axis=1) / self.dt_hours
+        total_hydrogen_produced = by_scenario(results['annual_h2_kg']).sum(axis=1).mean(axis=1)
+
+        outputs['hydrogen'] = hydrogen
+        # The lifetime model treats the simulated time steps as a year
+        outputs['total_hydrogen_produced'] = total_hydrogen_produced * annualization_factor(
+            hydrogen, self.options['plant_config']
+        )
+        outputs['efficiency'] = efficiency
+        outputs['time_until_replacement'] = time_until_replacement
@@ -1,8 +1,6 @@
 import PySAM.Pvwattsv8 as Pvwatts
 from attrs import define, field
 
-from hopp.simulation.technologies.resource import SolarResource
-
 from new_greenheart.converters.solar.solar_baseclass import (
     SolarPerformanceBaseClass,
     SolarCostBaseClass
@@ -12,6 +10,7 @@ from new_greenheart.core.utilities import (
     merge_shared_performance_inputs,
     merge_shared_cost_inputs
 )
+from new_greenheart.resources.store import get_solar_resource
 
 
 @define
@@ -42,7 +41,7 @@ class PYSAMSolarPlantPerformanceModel(SolarPerformanceBaseClass):
         self.config_name = "PVWattsSingleOwner"
         self.system_model = Pvwatts.default(self.config_name)
 
-        solar_resource = SolarResource(
+        solar_resource = get_solar_resource(
             lat=self.config.latitude,
             lon=self.config.longitude,
             year=self.config.year,
@@ -1,7 +1,7 @@
 import openmdao.api as om
 
+from new_greenheart.core.utilities import get_n_timesteps, get_scenario_shape
 
-n_timesteps = 8760
 
 class WindPerformanceBaseClass(om.ExplicitComponent):
 
@@ -10,7 +10,9 @@ class WindPerformanceBaseClass(om.ExplicitComponent):
         self.options.declare('tech_config', types=dict)
 
     def setup(self):
-        self.add_output('electricity', val=0.0, shape=n_timesteps, units='kW', desc='Power output from WindPlant')
+        plant_config = self.options['plant_config']
+        shape = get_scenario_shape(plant_config, get_n_timesteps(plant_config))
+        self.add_output('electricity', val=0.0, shape=shape, units='kW', desc='Power output from WindPlant')
 
     def compute(self, inputs, outputs):
         """
@@ -30,8 +32,9 @@ class WindCostBaseClass(om.ExplicitComponent):
 
     def setup(self):
         # Define outputs: CapEx and OpEx costs
-        self.add_output('CapEx', val=0.0, units='USD', desc='Capital expenditure')
-        self.add_output('OpEx', val=0.0, units='USD/year', desc='Operational expenditure')
+        shape = get_scenario_shape(self.options['plant_config'])
+        self.add_output('CapEx', val=0.0, shape=shape, units='USD', desc='Capital expenditure')
+        self.add_output('OpEx', val=0.0, shape=shape, units='USD/year', desc='Operational expenditure')
 
     def compute(self, inputs, outputs):
         """
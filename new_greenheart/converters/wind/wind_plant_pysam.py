@@ -1,8 +1,6 @@
 import PySAM.Windpower as Windpower
 from attrs import define, field
 
-from hopp.simulation.technologies.resource import WindResource
-
 from new_greenheart.converters.wind.wind_plant_baseclass import (
     WindPerformanceBaseClass,
     WindCostBaseClass
@@ -12,6 +10,7 @@ from new_greenheart.core.utilities import (
     merge_shared_cost_inputs,
     merge_shared_performance_inputs
 )
+from new_greenheart.resources.store import get_wind_resource
 
 
 @define
@@ -56,7 +55,7 @@ class PYSAMWindPlantPerformanceModel(WindPerformanceBaseClass):
         year = self.site_config.year
         resource_filepath = self.site_config.wind_resource_filepath
         hub_height = self.config.hub_height
-        wind_resource = WindResource(lat, lon, year, wind_turbine_hub_ht=hub_height, filepath=resource_filepath)
+        wind_resource = get_wind_resource(lat, lon, year, hub_height, filepath=resource_filepath)
         self.system_model.value("wind_resource_data", wind_resource.data)
 
     def compute(self, inputs, outputs):
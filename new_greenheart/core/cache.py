@@ -0,0 +1,258 @@
+"""
+A content-addressed, size-bounded simulation cache that can be shared between processes.
+
+Results are keyed by a hash of a canonical serialization of every input that affects them,
+so the key does not depend on dict ordering or on how numbers are stored. Entries are
+written atomically and the cache directory is locked while it is modified, so parallel sweep
+workers can safely share one cache. Least recently used entries are evicted once the cache
+exceeds its size limit, and entries older than the age limit are evicted as well.
+
+Each entry is a directory holding one `.npy` file per array and a `meta.json` sidecar with
+the remaining JSON values, so array data is memory-mapped on a hit rather than deserialized.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # File locking is not available on Windows; writes are still atomic
+    fcntl = None
+
+
+# Increment when the cached data layout changes so that old entries are not reused
+CACHE_VERSION = 2
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+def _key_default(value):
+    if isinstance(value, (np.ndarray, np.generic, set, frozenset)):
+        return _json_default(value)
+    if isinstance(value, os.PathLike):
+        return os.fspath(value)
+    # The string form of an arbitrary object need not identify its contents, so two
+    # different inputs could share a key
+    raise TypeError(f"Cannot create a cache key from an object of type {type(value).__name__}")
+
+
+def canonical_key(data):
+    """
+    Create a stable cache key from a JSON-like structure of inputs.
+
+    Dict keys are sorted, NumPy arrays and scalars are converted to Python values, sets are
+    sorted, and paths are converted to strings.
+
+    Args:
+        data: The inputs that determine the cached result.
+
+    Returns:
+        str: A SHA-256 hex digest of the canonical serialization of `data`.
+
+    Raises:
+        TypeError: If `data` holds an object of any other type.
+    """
+    serialized = json.dumps(
+        {'version': CACHE_VERSION, 'data': data},
+        sort_keys=True,
+        separators=(',', ':'),
+        default=_key_default,
+    )
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+class SimulationCache(object):
+    """
+    A directory of cached simulation results.
+
+    Cached values are dicts whose entries are arrays, or lists and tuples of numbers, which are
+    stored as `.npy` files, or any other JSON-serializable values, which are stored in the
+    metadata sidecar. Arrays are returned as read-only memory maps of the cached files.
+
+    Args:
+        cache_dir (str, optional): Directory that holds the cache entries. Defaults to 'cache'.
+        max_size_mb (float, optional): Maximum total size of the cache. The least recently used
+            entries are evicted once it is exceeded. Defaults to None, i.e. no size limit.
+        max_age_days (float, optional): Entries that have not been used for this many days are
+            evicted. Defaults to None, i.e. no age limit.
+    """
+    def __init__(self, cache_dir='cache', max_size_mb=None, max_age_days=None):
+        self.cache_dir = cache_dir
+        self.max_size_mb = max_size_mb
+        self.max_age_days = max_age_days
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, cache_config=None):
+        """
+        Create a cache from a config dict with optional `dir`, `max_size_mb`, and
+        `max_age_days` entries.
+        """
+        cache_config = cache_config or {}
+        return cls(
+            cache_dir=cache_config.get('dir', 'cache'),
+            max_size_mb=cache_config.get('max_size_mb'),
+            max_age_days=cache_config.get('max_age_days'),
+        )
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    @contextlib.contextmanager
+    def lock(self):
+        """Hold an exclusive lock on the cache directory."""
+        if fcntl is None:
+            yield
+            return
+
+        with open(os.path.join(self.cache_dir, '.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get(self, key):
+        """
+        Return the cached value for `key`, or None if there is no entry.
+
+        A hit refreshes the entry's modification time, which is used as its last access
+        time for least recently used eviction.
+        """
+        path = self.path(key)
+        try:
+            value = self._read(path)
+            os.utime(os.path.join(path, 'meta.json'))
+        except FileNotFoundError:
+            # Also covers an entry that was evicted by another process while it was read
+            self.stats['misses'] += 1
+            return None
+
+        self.stats['hits'] += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Store `value` under `key`.
+
+        The entry is written to a temporary directory in the cache directory and then moved
+        into place, so readers never see a partially written entry. The cache is then evicted
+        down to its size and age limits.
+        """
+        with self.lock():
+            self._write(self.path(key), value)
+            self.stats['writes'] += 1
+            self.evict()
+
+    def _read(self, path):
+        with open(os.path.join(path, 'meta.json'), 'r') as f:
+            meta = json.load(f)
+
+        value = meta['values']
+        for name in meta['arrays']:
+            value[name] = np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+        return value
+
+    def _write(self, path, value):
+        tmp_path = tempfile.mkdtemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            meta = {'version': CACHE_VERSION, 'arrays': [], 'values': {}}
+            for name, item in value.items():
+                if isinstance(item, (list, tuple)):
+                    item = np.asarray(item)
+                    if item.dtype == object:
+                        item = item.tolist()
+
+                if isinstance(item, np.ndarray):
+                    np.save(os.path.join(tmp_path, f'{name}.npy'), item)
+                    meta['arrays'].append(name)
+                else:
+                    meta['values'][name] = item
+
+            # The sidecar is written last and marks the entry as complete
+            with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+                json.dump(meta, f, default=_json_default)
+
+            if os.path.exists(path):
+                # Another process already stored the same result
+                shutil.rmtree(tmp_path)
+            else:
+                os.replace(tmp_path, path)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+    def entries(self):
+        """Return (path, size in bytes, last access time) of every entry, oldest first."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith('.tmp') or not os.path.isdir(path):
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+                last_access = os.stat(os.path.join(path, 'meta.json')).st_mtime
+                entries.append((path, size, last_access))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def _remove(self, path):
+        # Memory maps held by other processes stay valid after their files are removed
+        if os.path.exists(path):
+            shutil.rmtree(path, ignore_errors=True)
+            self.stats['evictions'] += 1
+
+    def evict(self):
+        """Remove entries that exceed the age limit, then the least recently used entries
+        until the cache is within its size limit."""
+        if self.max_size_mb is None and self.max_age_days is None:
+            return
+
+        entries = self.entries()
+
+        if self.max_age_days is not None:
+            oldest_allowed = time.time() - 86400. * self.max_age_days
+            for path, _, last_access in entries:
+                if last_access < oldest_allowed:
+                    self._remove(path)
+            entries = [entry for entry in entries if entry[2] >= oldest_allowed]
+
+        if self.max_size_mb is not None:
+            total_size = sum(size for _, size, _ in entries)
+            max_size = self.max_size_mb * 2**20
+            for path, size, _ in entries:
+                if total_size <= max_size:
+                    break
+                self._remove(path)
+                total_size -= size
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self.lock():
+            for path, _, _ in self.entries():
+                self._remove(path)
+
+    def summary(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        hit_rate = 100. * self.stats['hits'] / lookups if lookups else 0.
+        return (
+            f"Cache '{self.cache_dir}': {self.stats['hits']} hits, {self.stats['misses']} misses "
+            f"({hit_rate:.1f}% hit rate), {self.stats['writes']} writes, "
+            f"{self.stats['evictions']} evictions"
+        )
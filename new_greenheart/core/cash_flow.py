@@ -0,0 +1,495 @@
+"""
+A native, vectorized reimplementation of the ProFAST levelized price solve.
+
+`CashFlowModel` mirrors the part of the ProFAST interface that `ProFastComp` uses
+(`set_params`, `add_capital_item`, `add_fixed_cost`, and `solve_price`), but each capacity,
+cost, and refurbishment schedule may carry one value per scenario. A whole batch of scenarios
+is then solved with a few NumPy operations per analysis year instead of building and solving
+one ProFAST model per scenario.
+
+The annual cash flow follows ProFAST year by year: MACRS or straight-line depreciation of the
+capital items and their refurbishments, escalated fixed costs, revolving debt with a fixed
+debt/equity ratio, monetized income taxes, the sale of undepreciated capital at the end of
+the analysis, and the secant solve for the price at which the investor NPV is zero.
+
+Only the ProFAST features used by `ProFastComp` are implemented. Solving a model that sets any
+other feature to a non-default value raises a NotImplementedError.
+"""
+
+import copy
+
+import numpy as np
+
+
+# IRS Publication 946 MACRS mid-quarter convention percentages (Tables A-2 to A-5), as used by
+# ProFAST. Indexed by the recovery period, then by the quarter the property is placed in service.
+MACRS_TABLE = {
+    3: [
+        [0.5833, 0.2778, 0.1235, 0.0154],
+        [0.4167, 0.3889, 0.1414, 0.053],
+        [0.25, 0.5, 0.1667, 0.0833],
+        [0.0833, 0.6111, 0.2037, 0.1019],
+    ],
+    5: [
+        [0.35, 0.26, 0.156, 0.1101, 0.1101, 0.0138],
+        [0.25, 0.3, 0.18, 0.1137, 0.1137, 0.0426],
+        [0.15, 0.34, 0.204, 0.1224, 0.113, 0.0706],
+        [0.05, 0.38, 0.228, 0.1368, 0.1094, 0.0958],
+    ],
+    7: [
+        [0.25, 0.2143, 0.1531, 0.1093, 0.0875, 0.0874, 0.0875, 0.0109],
+        [0.1785, 0.2347, 0.1676, 0.1197, 0.0887, 0.0887, 0.0887, 0.0334],
+        [0.1071, 0.2551, 0.1822, 0.1302, 0.093, 0.0885, 0.0886, 0.0553],
+        [0.0357, 0.2755, 0.1968, 0.1406, 0.1004, 0.0873, 0.0873, 0.0764],
+    ],
+    10: [
+        [0.175, 0.165, 0.132, 0.1056, 0.0845, 0.0676, 0.0655, 0.0655, 0.0656, 0.0655, 0.0082],
+        [0.125, 0.175, 0.14, 0.112, 0.0896, 0.0717, 0.0655, 0.0655, 0.0656, 0.0655, 0.0246],
+        [0.075, 0.185, 0.148, 0.1184, 0.0947, 0.0758, 0.0655, 0.0655, 0.0656, 0.0655, 0.041],
+        [0.025, 0.195, 0.156, 0.1248, 0.0998, 0.0799, 0.0655, 0.0655, 0.0656, 0.0655, 0.0574],
+    ],
+    15: [
+        [0.0875, 0.0913, 0.0821, 0.0739, 0.0665, 0.0599, 0.059, 0.0591, 0.059, 0.0591, 0.059,
+         0.0591, 0.059, 0.0591, 0.059, 0.0074],
+        [0.0625, 0.0938, 0.0844, 0.0759, 0.0683, 0.0615, 0.0591, 0.059, 0.0591, 0.059, 0.0591,
+         0.059, 0.0591, 0.059, 0.0591, 0.0221],
+        [0.0375, 0.0963, 0.0866, 0.078, 0.0702, 0.0631, 0.059, 0.059, 0.0591, 0.059, 0.0591,
+         0.059, 0.0591, 0.059, 0.0591, 0.0369],
+        [0.0125, 0.0988, 0.0889, 0.08, 0.072, 0.0648, 0.059, 0.059, 0.059, 0.0591, 0.059,
+         0.0591, 0.059, 0.0591, 0.059, 0.0517],
+    ],
+    20: [
+        [0.06563, 0.07, 0.06482, 0.05996, 0.05546, 0.0513, 0.04746, 0.04459, 0.04459, 0.04459,
+         0.04459, 0.0446, 0.04459, 0.0446, 0.04459, 0.0446, 0.04459, 0.0446, 0.04459, 0.0446,
+         0.00565],
+        [0.04688, 0.07148, 0.06612, 0.06116, 0.05658, 0.05233, 0.04841, 0.04478, 0.04463,
+         0.04463, 0.04463, 0.04463, 0.04463, 0.04463, 0.04462, 0.04463, 0.04462, 0.04463,
+         0.04462, 0.04463, 0.01673],
+        [0.02813, 0.07289, 0.06742, 0.06237, 0.05769, 0.05336, 0.04936, 0.04566, 0.0446, 0.0446,
+         0.0446, 0.0446, 0.04461, 0.0446, 0.04461, 0.0446, 0.04461, 0.0446, 0.04461, 0.0446,
+         0.02788],
+        [0.00938, 0.0743, 0.06872, 0.06357, 0.0588, 0.05439, 0.05031, 0.04654, 0.04458,
+         0.04458, 0.04458, 0.04458, 0.04458, 0.04458, 0.04458, 0.04458, 0.04458, 0.04459,
+         0.04458, 0.04459, 0.03901],
+    ],
+}
+
+# Every MACRS schedule is padded to the 21 recovery years of 20-year property, as in ProFAST
+MACRS_YEARS = 21
+
+# ProFAST parameter defaults
+DEFAULT_PARAMS = {
+    'capacity': 1,
+    'long term utilization': 1,
+    'demand rampup': 0,
+    'analysis start year': 2016,
+    'operating life': 1,
+    'installation months': 0,
+    'TOPC': {'unit price': 0.0, 'decay': 0.0, 'support utilization': 0.0, 'sunset years': 0},
+    'commodity': {'initial price': 2.0, 'name': '-', 'unit': '-', 'escalation': 0.0},
+    'annual operating incentive': {'value': 0.0, 'decay': 0.0, 'sunset years': 0, 'taxable': True},
+    'incidental revenue': {'value': 0.0, 'escalation': 0.0},
+    'credit card fees': 0.0,
+    'sales tax': 0.0,
+    'road tax': {'value': 0.0, 'escalation': 0.0},
+    'labor': {'value': 0.0, 'rate': 0.0, 'escalation': 0.0},
+    'maintenance': {'value': 0.0, 'escalation': 0.0},
+    'rent': {'value': 0.0, 'escalation': 0.0},
+    'license and permit': {'value': 0.0, 'escalation': 0.0},
+    'non depr assets': 0.0,
+    'end of proj sale non depr assets': 0.0,
+    'installation cost': {'value': 0.0, 'depr type': 'Straight line', 'depr period': 3, 'depreciable': True},
+    'one time cap inct': {'value': 0.0, 'depr type': 'MACRS', 'depr period': 3, 'depreciable': True},
+    'property tax and insurance': 0.0,
+    'admin expense': 0.0,
+    'tax loss carry forward years': 0,
+    'capital gains tax rate': 0.0,
+    'tax losses monetized': True,
+    'sell undepreciated cap': True,
+    'loan period if used': 0,
+    'debt equity ratio of initial financing': 0.0,
+    'debt interest rate': 0.0,
+    'debt type': 'Revolving debt',
+    'total income tax rate': 0.0,
+    'cash onhand': 0.0,
+    'general inflation rate': 0.0,
+    'leverage after tax nominal discount rate': 0.0,
+}
+
+# Parameters whose features are not implemented, with the entry that enables each of them
+UNSUPPORTED_PARAMS = {
+    'TOPC': 'unit price',
+    'annual operating incentive': 'value',
+    'incidental revenue': 'value',
+    'non depr assets': None,
+    'end of proj sale non depr assets': None,
+    'installation cost': 'value',
+    'one time cap inct': 'value',
+}
+
+
+def depreciation_schedule(depr_type, depr_period, installation_months, fraction_of_year_operated):
+    """
+    Fraction of a capital cost that is depreciated in each year.
+
+    Entry `i` of the schedule is the depreciation charged in analysis year `i + 1`.
+
+    Args:
+        depr_type (str): 'MACRS' or 'Straight line'.
+        depr_period (int): Depreciation period in years.
+        installation_months (float): Installation time before operation starts.
+        fraction_of_year_operated (np.ndarray): Fraction of each analysis year, starting with
+            year 0, in which the plant operates.
+
+    Returns:
+        np.ndarray: The depreciation schedule.
+    """
+    if depr_type == 'MACRS':
+        years_placed_in_service = np.ceil((installation_months + 1) / 12)
+        service_fraction = (installation_months + 0.5) / 12
+        quarter = int(np.ceil((service_fraction - np.floor(service_fraction)) * 4))
+        try:
+            table = MACRS_TABLE[int(depr_period)][quarter - 1]
+        except KeyError:
+            raise ValueError(
+                f"No MACRS table for a depreciation period of {depr_period} years; "
+                f"supported periods are {sorted(MACRS_TABLE)}"
+            )
+        rates = np.zeros(MACRS_YEARS)
+        rates[:len(table)] = table
+        return np.concatenate((np.zeros(int(years_placed_in_service) - 1), rates))
+
+    if depr_type == 'Straight line':
+        return np.diff(np.minimum(np.cumsum(fraction_of_year_operated / depr_period), 1))
+
+    raise ValueError(f"Unknown depreciation type '{depr_type}'; use 'MACRS' or 'Straight line'")
+
+
+class CashFlowModel(object):
+    """
+    Vectorized annual cash flow and levelized price solve for a batch of scenarios.
+
+    Parameters are set with the same names and defaults as in ProFAST. The capacity, capital
+    item and fixed cost amounts, and the refurbishment schedules may be given either as
+    scalars, which apply to every scenario, or with one value (or row) per scenario.
+
+    Args:
+        n_scenarios (int, optional): Number of scenarios solved together. Defaults to 1.
+    """
+    def __init__(self, n_scenarios=1):
+        self.n_scenarios = n_scenarios
+        self.vals = copy.deepcopy(DEFAULT_PARAMS)
+        self.capital_items = {}
+        self.fixed_costs = {}
+
+    def set_params(self, name, value):
+        if name not in self.vals:
+            raise ValueError(f"Unknown cash flow parameter '{name}'")
+        self.vals[name] = value
+
+    def add_capital_item(self, name, cost, depr_type, depr_period, refurb):
+        self.capital_items[name] = {
+            'cost': self._per_scenario(cost),
+            'depr_type': depr_type,
+            'depr_period': depr_period,
+            'refurb': self._per_scenario_rows(refurb),
+        }
+
+    def add_fixed_cost(self, name, usage, unit, cost, escalation):
+        # As in ProFAST, the usage and unit are descriptive only
+        self.fixed_costs[name] = {'cost': self._per_scenario(cost), 'escalation': escalation}
+
+    def _per_scenario(self, value):
+        return np.broadcast_to(np.asarray(value, dtype=float), (self.n_scenarios,))
+
+    def _per_scenario_rows(self, value):
+        value = np.atleast_1d(np.asarray(value, dtype=float))
+        return np.broadcast_to(value, (self.n_scenarios, value.shape[-1]))
+
+    def check_supported(self):
+        """Raise a NotImplementedError if a ProFAST feature that is not implemented is used."""
+        for name, key in UNSUPPORTED_PARAMS.items():
+            value = self.vals[name] if key is None else self.vals[name][key]
+            if np.any(value != 0):
+                raise NotImplementedError(f"The '{name}' cash flow parameter is not supported")
+        if self.vals['debt type'] != 'Revolving debt':
+            raise NotImplementedError(
+                f"Only 'Revolving debt' is supported, not '{self.vals['debt type']}'"
+            )
+        if not self.vals['tax losses monetized']:
+            raise NotImplementedError("Only monetized tax losses are supported")
+        if isinstance(self.vals['long term utilization'], dict):
+            raise NotImplementedError("Yearly values of 'long term utilization' are not supported")
+
+    def _prepare(self):
+        """Compute the price-independent parts of the cash flow."""
+        self.check_supported()
+        vals = self.vals
+        n = self.n_scenarios
+
+        life = vals['operating life']
+        installation_months = vals['installation months']
+        analysis_length = int(life + np.ceil(installation_months / 12))
+        n_years = analysis_length + 1
+        analysis_year = np.arange(n_years)
+
+        years_of_operation = np.minimum(life, np.maximum(0, analysis_year - installation_months / 12))
+        fraction_of_year_operated = years_of_operation - np.concatenate(([0], years_of_operation[:-1]))
+
+        utilization = vals['long term utilization']
+        average_utilization = np.minimum(
+            utilization / (vals['demand rampup'] + 1) * years_of_operation,
+            utilization * np.minimum(1 + (life + installation_months / 12) - analysis_year, 1),
+        )
+        yearly_sales = self._per_scenario(vals['capacity'])[:, None] * average_utilization * 365
+
+        def escalate(value, rate):
+            return value * (1.0 + rate) ** (analysis_year - 1)
+
+        # Operating expenses except for the admin expense, which scales with the sales revenue
+        operating_expenses = (
+            fraction_of_year_operated
+            * escalate(vals['labor']['rate'], vals['labor']['escalation']) * vals['labor']['value']
+            + fraction_of_year_operated
+            * escalate(vals['maintenance']['value'], vals['maintenance']['escalation'])
+            + fraction_of_year_operated
+            * escalate(vals['rent']['value'], vals['rent']['escalation'])
+            + fraction_of_year_operated
+            * escalate(vals['license and permit']['value'], vals['license and permit']['escalation'])
+        )
+        operating_expenses = np.broadcast_to(operating_expenses, (n, n_years)).copy()
+        for fixed_cost in self.fixed_costs.values():
+            operating_expenses += (
+                escalate(fixed_cost['cost'][:, None], fixed_cost['escalation'])
+                * fraction_of_year_operated
+            )
+
+        # Capital expenditures, with refurbishment `j` spent in analysis year `j + 1`
+        max_refurb_len = max([item['refurb'].shape[1] for item in self.capital_items.values()] + [0])
+        capital_expenditure = np.zeros((n, max(n_years, max_refurb_len + 1)))
+        for item in self.capital_items.values():
+            refurb_len = item['refurb'].shape[1]
+            capital_expenditure[:, 0] += item['cost']
+            capital_expenditure[:, 1:refurb_len + 1] += item['cost'][:, None] * item['refurb']
+        net_cash_by_investing = -capital_expenditure[:, :n_years]
+
+        # Depreciation of each item and of its refurbishments. Each item's refurbishments are
+        # depreciated with the nonzero part of the item's own schedule, starting in the year
+        # the refurbishment is spent.
+        schedules = []
+        lengths = np.full(n, n_years)
+        for item in self.capital_items.values():
+            rates = depreciation_schedule(
+                item['depr_type'], item['depr_period'], installation_months, fraction_of_year_operated
+            )
+            rates_nonzero = rates[rates != 0]
+            refurb = item['refurb']
+            cost = item['cost'][:, None]
+
+            refurb_depreciation = np.zeros((n, refurb.shape[1] + len(rates_nonzero)))
+            for year, rate in enumerate(rates_nonzero):
+                refurb_depreciation[:, year:year + refurb.shape[1]] += refurb * rate
+            refurb_depreciation *= cost
+
+            schedules.extend([rates * cost, refurb_depreciation])
+            n_nonzero = np.where(item['cost'] != 0, len(rates_nonzero), 0)
+            lengths = np.maximum(lengths, np.maximum(len(rates), 2 * np.maximum(refurb.shape[1], n_nonzero)))
+
+        all_depreciation = np.zeros((n, lengths.max()))
+        for schedule in schedules:
+            all_depreciation[:, :schedule.shape[1]] += schedule
+        cumulative_depreciation = np.cumsum(all_depreciation, axis=1)
+
+        # ProFAST extends the depreciation years past the analysis up to the second
+        # (near) zero depreciation year
+        in_schedule = np.arange(all_depreciation.shape[1]) < lengths[:, None]
+        zero_years = np.cumsum((np.abs(all_depreciation) < 1e-6) & in_schedule, axis=1)
+        if np.any(zero_years[:, -1] < 2):
+            raise ValueError("The depreciation schedule must contain at least two zero years")
+        depreciation_years = np.maximum(np.argmax(zero_years >= 2, axis=1) + 1, n_years)
+
+        # Undepreciated capital at the end of the analysis, which is sold in the final year
+        depreciable_capital = np.zeros((n, max(max_refurb_len, 1)))
+        for item in self.capital_items.values():
+            refurb_len = item['refurb'].shape[1]
+            depreciable_capital[:, 0] += item['cost']
+            depreciable_capital[:, :refurb_len] += item['cost'][:, None] * item['refurb']
+        cumulative_capital = np.cumsum(depreciable_capital, axis=1)
+        final_capital = cumulative_capital[:, min(n_years - 2, cumulative_capital.shape[1] - 1)]
+        undepreciated_capital = final_capital - cumulative_depreciation[:, n_years - 2]
+
+        # Property tax and insurance on the net property, plant, and equipment
+        net_ppe = (
+            np.cumsum(-net_cash_by_investing, axis=1)
+            - np.concatenate((np.zeros((n, 1)), cumulative_depreciation[:, :n_years - 1]), axis=1)
+        )
+        operating_expenses += fraction_of_year_operated * net_ppe * vals['property tax and insurance']
+
+        # Depreciation expensed in each year of the financing calculation; ProFAST does not
+        # expense the last year of its depreciation schedule
+        n_loan_years = depreciation_years.max()
+        depreciation_expense = np.zeros((n, n_loan_years))
+        depreciation_expense[:, 1:] = all_depreciation[:, :n_loan_years - 1]
+        depreciation_expense[np.arange(n_loan_years) >= depreciation_years[:, None]] = 0.
+
+        self._cash_flow = {
+            'n_years': n_years,
+            'n_loan_years': n_loan_years,
+            'analysis_year': analysis_year,
+            'fraction_of_year_operated': fraction_of_year_operated,
+            'yearly_sales': yearly_sales,
+            'operating_expenses': operating_expenses,
+            'net_cash_by_investing': net_cash_by_investing,
+            'depreciation_expense': depreciation_expense,
+            'undepreciated_capital': undepreciated_capital,
+        }
+        return self._cash_flow
+
+    def npv(self, price):
+        """
+        Investor NPV for the given commodity price in each scenario.
+
+        Args:
+            price (float or np.ndarray): Commodity price in the first year of operation.
+
+        Returns:
+            np.ndarray: The NPV of the investor cash flow for each scenario.
+        """
+        self._prepare()
+        return self._npv(self._per_scenario(price))
+
+    def _npv(self, price):
+        vals = self.vals
+        cash_flow = self._cash_flow
+        n = self.n_scenarios
+        n_years = cash_flow['n_years']
+        n_loan_years = cash_flow['n_loan_years']
+
+        sales_price = price[:, None] * (1.0 + vals['commodity']['escalation']) ** (cash_flow['analysis_year'] - 1)
+        sales_revenue = sales_price * cash_flow['yearly_sales']
+        road_tax = vals['road tax']['value'] * (1.0 + vals['road tax']['escalation']) ** (cash_flow['analysis_year'] - 1)
+        total_revenue = (
+            sales_revenue * (1 - vals['credit card fees'] - vals['sales tax'])
+            - road_tax * cash_flow['yearly_sales']
+        )
+        operating_expenses = cash_flow['operating_expenses'] + sales_revenue * vals['admin expense']
+
+        def pad(values):
+            return np.pad(values, ((0, 0), (0, n_loan_years - values.shape[1])))
+
+        total_revenue = pad(total_revenue)
+        operating_expenses = pad(operating_expenses)
+        net_cash_by_investing = pad(cash_flow['net_cash_by_investing'])
+        depreciation_expense = cash_flow['depreciation_expense']
+        fraction_of_year_operated = np.pad(
+            cash_flow['fraction_of_year_operated'], (0, n_loan_years - n_years)
+        )
+
+        debt_equity_ratio = vals['debt equity ratio of initial financing']
+        sell_undepreciated = vals['sell undepreciated cap']
+        final_year = n_years - 1
+
+        interest = np.zeros((n, n_loan_years))
+        inflow_of_debt = np.zeros((n, n_loan_years))
+        inflow_of_equity = np.zeros((n, n_loan_years))
+        repayment_of_debt = np.zeros((n, n_loan_years))
+        cumulative_debt = np.zeros((n, n_loan_years))
+        cumulative_cash = np.zeros((n, n_loan_years))
+        net_cash_in_financing = np.zeros((n, n_loan_years))
+
+        extraordinary_items = np.zeros((n, n_loan_years))
+        extraordinary_items[:, final_year] = (
+            cash_flow['undepreciated_capital'] * (1 if sell_undepreciated else -1)
+        )
+
+        # The initial investment is split between debt and equity
+        inflow_of_equity[:, 0] = -net_cash_by_investing[:, 0] / (1 + debt_equity_ratio)
+        inflow_of_debt[:, 0] = -net_cash_by_investing[:, 0] - inflow_of_equity[:, 0]
+
+        # Index -1 refers to the last, not yet computed, year in the first iteration, as in ProFAST
+        for i in range(n_loan_years):
+            if i < n_years:
+                interest[:, i] = (
+                    vals['debt interest rate'] * cumulative_debt[:, i - 1]
+                    * (1 - (n_years == i + 1) * (1 - fraction_of_year_operated[i]))
+                )
+
+            taxable_income = (
+                total_revenue[:, i] - operating_expenses[:, i] - interest[:, i]
+                - depreciation_expense[:, i]
+            )
+            income_taxes = taxable_income * vals['total income tax rate']
+            net_income = taxable_income - income_taxes + extraordinary_items[:, i]
+            net_cash = net_income + depreciation_expense[:, i]
+
+            cumulative_cash[:, i] = (
+                (operating_expenses[:, i] + interest[:, i] + income_taxes) / 12
+                * (i < n_years - 1) * vals['cash onhand']
+            )
+            net_change_in_cash = cumulative_cash[:, i] - cumulative_cash[:, i - 1]
+            net_cash_in_financing[:, i] = net_change_in_cash - net_cash_by_investing[:, i] - net_cash
+
+            if i == final_year:
+                repayment_of_debt[:, i] = -cumulative_debt[:, i - 1]
+
+            if i > 0:
+                financing_need = np.maximum(net_cash_in_financing[:, i] - repayment_of_debt[:, i], 0)
+                investing = net_cash_by_investing[:, i]
+                inflow_of_debt[:, i] = np.where(
+                    investing < 0, financing_need / (1 + debt_equity_ratio) * debt_equity_ratio, 0.
+                )
+                inflow_of_equity[:, i] = np.where(
+                    investing != 0, financing_need / (1 + debt_equity_ratio), financing_need
+                )
+
+            cumulative_debt[:, i] = (
+                cumulative_debt[:, i - 1] + inflow_of_debt[:, i] + repayment_of_debt[:, i]
+            )
+
+        dividends_paid = np.minimum(net_cash_in_financing - inflow_of_debt - repayment_of_debt, 0)
+        dividends_paid[:, 0] = 0
+        investor_cash_flow = -(inflow_of_equity + dividends_paid)
+
+        discount_factors = (1 + vals['leverage after tax nominal discount rate']) ** -np.arange(n_loan_years)
+        return investor_cash_flow @ discount_factors
+
+    def solve_price(self, guess_value=1):
+        """
+        Solve for the commodity price at which the investor NPV is zero in each scenario.
+
+        Uses the same secant iteration and convergence criteria as ProFAST, applied to every
+        scenario at once.
+
+        Args:
+            guess_value (float, optional): Initial price guess. Defaults to 1.
+
+        Returns:
+            dict: 'price' and 'NPV' arrays with one value per scenario.
+        """
+        self._prepare()
+        n_iterations = 20
+
+        prices = np.zeros((n_iterations, self.n_scenarios))
+        npvs = np.zeros((n_iterations, self.n_scenarios))
+        prices[0] = guess_value
+        npvs[0] = self._npv(prices[0])
+        prices[1] = np.where(npvs[0] > 0, guess_value - 1, guess_value + 1)
+
+        price = prices[0].copy()
+        npv = npvs[0].copy()
+        active = np.ones(self.n_scenarios, dtype=bool)
+        for i in range(1, n_iterations - 1):
+            npvs[i] = self._npv(prices[i])
+            price[active] = prices[i][active]
+            npv[active] = npvs[i][active]
+
+            active &= (np.abs(npvs[i]) >= 1e-5) & (np.abs(prices[i] - prices[i - 1]) >= 1e-4)
+            if not active.any():
+                break
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                slope = (npvs[i] - npvs[i - 1]) / (prices[i] - prices[i - 1])
+                intercept = npvs[i] - slope * prices[i]
+                prices[i + 1] = np.where(active, -intercept / slope, prices[i])
+
+        return {'price': price, 'NPV': npv}
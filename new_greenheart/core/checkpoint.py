@@ -0,0 +1,169 @@
+"""
+Checkpointing of driver runs, so that a killed DOE or optimization can be resumed.
+
+`RunCheckpoint` stores the responses of every model evaluation of a driver, keyed by a hash
+of the values of all independent variables of the model, i.e. the design variables and any
+input set with `set_val`, and periodically writes them to a JSON file. The file also holds a
+fingerprint of the configs that the model was built from, and a run with different configs
+refuses to resume from it. When a run is restarted with the same checkpoint file and
+configs, evaluations at points that are already in the checkpoint are replayed from it
+instead of being recomputed: a DOE skips its finished cases and a deterministic optimizer
+retraces its path up to the point where it was stopped.
+The state of NumPy's global random number generator at the start of the first run is stored
+as well and restored on resume, so that randomized drivers such as `om.SimpleGADriver`
+generate the same populations again.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+from openmdao.api import IndepVarComp
+
+from new_greenheart.core.cache import canonical_key
+
+
+# Increment when the layout of the checkpoint file changes
+CHECKPOINT_VERSION = 2
+
+
+class RunCheckpoint(object):
+    """
+    Store the responses of a driver's model evaluations and replay them after a restart.
+
+    Only the model outputs of the driver's objectives and constraints are stored, so on a
+    replayed evaluation the other outputs of the model keep the values of the last computed
+    evaluation. Derivatives are recomputed.
+
+    Args:
+        file (str, optional): Checkpoint file, which is loaded if it exists. Defaults to
+            'checkpoint.json'.
+        interval (int, optional): Number of new evaluations after which the checkpoint is
+            written. Defaults to 10.
+        fingerprint (str, optional): Hash of the configs of the model. An existing checkpoint
+            file with a different fingerprint is not resumed from. Defaults to None.
+    """
+    def __init__(self, file='checkpoint.json', interval=10, fingerprint=None):
+        self.file = file
+        self.fingerprint = fingerprint
+        self.interval = int(interval)
+        if self.interval < 1:
+            raise ValueError(f"interval must be at least 1, but {interval} was given")
+
+        self.entries = {}
+        self.random_state = None
+        self.n_new = 0
+        self.n_replayed = 0
+        self._n_unsaved = 0
+
+        if os.path.exists(self.file):
+            self.load()
+
+    def load(self):
+        """Load the entries and random state of an earlier run."""
+        with open(self.file, 'r') as f:
+            checkpoint = json.load(f)
+        if checkpoint['version'] != CHECKPOINT_VERSION:
+            raise ValueError(
+                f"{self.file} was written in checkpoint version {checkpoint['version']}, but "
+                f"version {CHECKPOINT_VERSION} is supported"
+            )
+        if self.fingerprint is not None and checkpoint['fingerprint'] != self.fingerprint:
+            raise ValueError(
+                f"{self.file} was written by a run with different configs, so its evaluations "
+                "cannot be replayed. Delete it or choose another checkpoint file to start a new run."
+            )
+        self.entries = checkpoint['entries']
+        self.random_state = checkpoint['random_state']
+
+    def save(self):
+        """Write the checkpoint file atomically."""
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'fingerprint': self.fingerprint,
+            'random_state': self.random_state,
+            'entries': self.entries,
+        }
+        tmp_file = f'{self.file}.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_file, self.file)
+        self._n_unsaved = 0
+
+    def attach(self, driver):
+        """
+        Checkpoint the model evaluations of a driver.
+
+        The random state of the first run is restored, or stored if this is the first run.
+        """
+        self.driver = driver
+        # The auto-IVC holds the design variables and the unconnected inputs
+        model = driver._problem().model
+        self._independent_systems = list(model.system_iter(recurse=True, typ=IndepVarComp))
+
+        if self.random_state is None:
+            name, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+            self.random_state = [name, keys.tolist(), pos, has_gauss, cached_gaussian]
+        else:
+            name, keys, pos, has_gauss, cached_gaussian = self.random_state
+            np.random.set_state((name, np.array(keys, dtype=np.uint32), pos, has_gauss, cached_gaussian))
+
+        run_solve_nonlinear = driver._run_solve_nonlinear
+
+        def _run_solve_nonlinear():
+            key = self.key()
+            if self.restore(key):
+                return
+            run_solve_nonlinear()
+            self.add(key)
+
+        driver._run_solve_nonlinear = _run_solve_nonlinear
+        # Drivers that do not evaluate the model through `_run_solve_nonlinear`, e.g.
+        # ProcessPoolDOEDriver, use the checkpoint directly
+        driver.checkpoint = self
+
+    def key(self):
+        """
+        Return the key of the current point of the driver.
+
+        The key covers the design variables and every other independent variable, so that an
+        input changed with `set_val` between runs is not answered with stale responses.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for system in self._independent_systems:
+            digest.update(system._outputs.asarray().tobytes())
+        design_vars = self.driver.get_design_var_values(driver_scaling=False)
+        return canonical_key({
+            'design_vars': {name: np.asarray(value) for name, value in design_vars.items()},
+            'independent': digest.hexdigest(),
+        })
+
+    def _sources(self):
+        return sorted({meta['source'] for meta in self.driver._responses.values()})
+
+    def restore(self, key):
+        """
+        Set the response outputs of the model from the checkpoint entry for `key`.
+
+        Returns:
+            bool: Whether there was an entry to restore.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+
+        outputs = self.driver._problem().model._outputs
+        for source, value in entry.items():
+            outputs[source] = np.asarray(value)
+        self.n_replayed += 1
+        return True
+
+    def add(self, key):
+        """Store the current response outputs of the model under `key`."""
+        outputs = self.driver._problem().model._outputs
+        self.entries[key] = {source: np.asarray(outputs[source]).tolist() for source in self._sources()}
+        self.n_new += 1
+        self._n_unsaved += 1
+        if self._n_unsaved >= self.interval:
+            self.save()
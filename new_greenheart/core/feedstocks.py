@@ -2,42 +2,132 @@ import numpy as np
 
 import openmdao.api as om
 
+from new_greenheart.core.utilities import (
+    HOURS_PER_YEAR,
+    get_n_scenarios,
+    get_n_timesteps,
+    get_scenario_shape,
+)
+
 
 class FeedstockComponent(om.ExplicitComponent):
+    """
+    Feedstocks that are bought at a price, e.g. grid electricity or natural gas.
+
+    Each feedstock is supplied at its rated capacity, scaled by an optional availability
+    profile, and bought at a flat price or along an optional price profile. The profiles are
+    read from `.npy` or CSV files, see `new_greenheart.resources.store.get_profile`, with one
+    value per time step, or one row per scenario in batched mode. Each feedstock config has:
+
+    - `rated_capacity` and `capacity_units`: the rated supply.
+    - `price`: the price per unit of capacity and hour, used if there is no price profile.
+    - `availability_profile` (optional): file of the available fraction of the rated capacity.
+    - `price_profile` (optional): file of the price in each time step. The `<name>_price`
+      input is then a time series instead of a scalar.
+    """
     def initialize(self):
         self.options.declare('feedstocks_config', types=dict)
+        self.options.declare('plant_config', types=dict, default={})
 
     def setup(self):
+        plant_config = self.options['plant_config']
+        self.n_scenarios = get_n_scenarios(plant_config)
+        scalar_shape = get_scenario_shape(plant_config)
+        series_shape = get_scenario_shape(plant_config, get_n_timesteps(plant_config))
+
+        # Annual totals are scaled from the simulated time series, whatever its length
+        self.annual_scale = HOURS_PER_YEAR / get_n_timesteps(plant_config)
+
         self.feedstock_data = {}
+        self.availability = {}
+        self.price_profiles = set()
+        self.annual_hours = {}
         for feedstock_name, feedstock_data in self.options['feedstocks_config'].items():
             self.feedstock_data[feedstock_name] = feedstock_data
-            self.add_output(feedstock_name, shape=(8760,), units=feedstock_data['capacity_units'])
-            self.add_output(f'{feedstock_name}_CapEx', val=0.0, units='USD')
-            self.add_output(f'{feedstock_name}_OpEx', val=0.0, units='USD/yr')
-        
+
+            # The profiles do not change between computes, so they are loaded and checked once
+            availability = self._load_profile(feedstock_data, 'availability_profile', series_shape)
+            self.availability[feedstock_name] = availability
+            # Hours of operation at rated capacity in a year, for the flat price
+            self.annual_hours[feedstock_name] = (
+                HOURS_PER_YEAR if availability is None else availability.sum(axis=-1) * self.annual_scale
+            )
+
+            # Rated capacity and price are inputs so that batched runs can vary them per scenario
+            self.add_input(
+                f'{feedstock_name}_rated_capacity',
+                val=feedstock_data['rated_capacity'],
+                shape=scalar_shape,
+                units=feedstock_data['capacity_units'],
+            )
+            price_profile = self._load_profile(feedstock_data, 'price_profile', series_shape)
+            if price_profile is None:
+                self.add_input(f'{feedstock_name}_price', val=feedstock_data['price'], shape=scalar_shape)
+            else:
+                self.price_profiles.add(feedstock_name)
+                self.add_input(
+                    f'{feedstock_name}_price',
+                    val=np.broadcast_to(price_profile, series_shape),
+                    shape=series_shape,
+                )
+            self.add_output(feedstock_name, shape=series_shape, units=feedstock_data['capacity_units'])
+            self.add_output(f'{feedstock_name}_CapEx', val=0.0, shape=scalar_shape, units='USD')
+            self.add_output(f'{feedstock_name}_OpEx', val=0.0, shape=scalar_shape, units='USD/yr')
+
         # Add total CapEx and OpEx outputs
-        self.add_output('CapEx', val=0.0, units='USD')
-        self.add_output('OpEx', val=0.0, units='USD/yr')
+        self.add_output('CapEx', val=0.0, shape=scalar_shape, units='USD')
+        self.add_output('OpEx', val=0.0, shape=scalar_shape, units='USD/yr')
+
+    def _load_profile(self, feedstock_data, key, series_shape):
+        """Load a profile of a feedstock, or return None if it has none."""
+        if key not in feedstock_data:
+            return None
+
+        # Deferred so that feedstocks without profiles do not import HOPP with the store
+        from new_greenheart.resources.store import get_profile
+
+        profile = get_profile(feedstock_data[key])
+        # A profile of one scenario is shared by all scenarios
+        if profile.shape not in [series_shape, series_shape[-1:]]:
+            raise ValueError(
+                f"The {key} {feedstock_data[key]} has the shape {profile.shape}, but "
+                f"{series_shape[-1:]} or {series_shape} was expected"
+            )
+        return profile
 
     def compute(self, inputs, outputs):
         total_capex = 0.0
         total_opex = 0.0
 
-        for feedstock_name, feedstock_data in self.feedstock_data.items():
-            rated_capacity = feedstock_data['rated_capacity']
-            price = feedstock_data['price']
+        for feedstock_name in self.feedstock_data:
+            rated_capacity = inputs[f'{feedstock_name}_rated_capacity']
+            price = inputs[f'{feedstock_name}_price']
 
-            # Generate feedstock array operating at full capacity for the full year
-            outputs[feedstock_name] = np.full(8760, rated_capacity)
+            # Generate feedstock array operating at rated capacity, scaled by the availability,
+            # with one row per scenario in batched mode
+            if self.n_scenarios > 1:
+                rated_capacity_series = rated_capacity[:, np.newaxis]
+            else:
+                rated_capacity_series = rated_capacity[0]
+            availability = self.availability[feedstock_name]
+            if availability is None:
+                outputs[feedstock_name] = rated_capacity_series
+            else:
+                outputs[feedstock_name] = rated_capacity_series * availability
 
             # Calculate capex (given as $0)
-            capex = 0.0
+            capex = np.zeros_like(rated_capacity)
             outputs[f'{feedstock_name}_CapEx'] = capex
             total_capex += capex
 
-            # Calculate opex based on the cost of feedstock and total feedstock used
-            total_feedstock_used = rated_capacity * 8760
-            opex = total_feedstock_used * price
+            # Calculate opex based on the cost of feedstock and total feedstock used in a year,
+            # whatever the length of the simulated time series
+            if feedstock_name in self.price_profiles:
+                # One dot product of usage and price per scenario
+                usage = outputs[feedstock_name]
+                opex = np.einsum('...t,...t->...', usage, price) * self.annual_scale
+            else:
+                opex = rated_capacity * self.annual_hours[feedstock_name] * price
             outputs[f'{feedstock_name}_OpEx'] = opex
             total_opex += opex
 
@@ -3,6 +3,36 @@ import numpy_financial as npf
 import ProFAST  # system financial model
 import openmdao.api as om
 
+from new_greenheart.core.cash_flow import CashFlowModel
+from new_greenheart.core.utilities import get_n_scenarios, get_scenario_shape
+
+
+def refurbishment_schedule(time_until_replacement, plant_life, replacement_cost_percent):
+    """
+    Fraction of the capital cost that is spent on refurbishment in each year of operation.
+
+    Args:
+        time_until_replacement (float or np.ndarray): Operating hours between replacements,
+            with one value per scenario if an array.
+        plant_life (int): Plant life in years.
+        replacement_cost_percent (float): Refurbishment cost as a fraction of the capital cost.
+
+    Returns:
+        list or np.ndarray: The schedule as a list for a single scenario, or with one row
+            per scenario.
+    """
+    refurb_period = np.round(np.asarray(time_until_replacement) / (24 * 365)).astype(int)
+    if np.any(refurb_period < 1):
+        raise ValueError("The time until replacement must be at least half a year")
+
+    years = np.arange(plant_life)
+    refurb_period = refurb_period[..., None]
+    schedule = np.where(
+        (years >= refurb_period) & (years % refurb_period == 0), replacement_cost_percent, 0.0
+    )
+    return list(schedule) if schedule.ndim == 1 else schedule
+
+
 class AdjustedCapexOpexComp(om.ExplicitComponent):
     def initialize(self):
         self.options.declare('tech_config', types=dict)
@@ -14,22 +44,34 @@ class AdjustedCapexOpexComp(om.ExplicitComponent):
         self.discount_years = plant_config['finance_parameters']['discount_years']
         self.inflation_rate = plant_config['finance_parameters']['costing_general_inflation']
         self.cost_year = plant_config['plant']['cost_year']
+        shape = get_scenario_shape(plant_config)
 
         for tech in tech_config:
-            self.add_input(f'capex_{tech}', val=0.0, units='USD')
-            self.add_input(f'opex_{tech}', val=0.0, units='USD/year')
-            self.add_output(f'capex_adjusted_{tech}', val=0.0, units='USD')
-            self.add_output(f'opex_adjusted_{tech}', val=0.0, units='USD/year')
+            self.add_input(f'capex_{tech}', val=0.0, shape=shape, units='USD')
+            self.add_input(f'opex_{tech}', val=0.0, shape=shape, units='USD/year')
+            self.add_output(f'capex_adjusted_{tech}', val=0.0, shape=shape, units='USD')
+            self.add_output(f'opex_adjusted_{tech}', val=0.0, shape=shape, units='USD/year')
         
-        self.add_output('total_capex_adjusted', val=0.0, units='USD')
-        self.add_output('total_opex_adjusted', val=0.0, units='USD/year')
+        self.add_output('total_capex_adjusted', val=0.0, shape=shape, units='USD')
+        self.add_output('total_opex_adjusted', val=0.0, shape=shape, units='USD/year')
+
+        # The adjustment scales each scenario's cost by a constant inflation factor, so the
+        # partials are diagonal and do not change between evaluations
+        scenarios = np.arange(get_n_scenarios(plant_config))
+        for tech in tech_config:
+            periods = self.cost_year - self.discount_years[tech]
+            factor = -npf.fv(self.inflation_rate, periods, 0.0, 1.0)
+            for cost in ['capex', 'opex']:
+                for of in [f'{cost}_adjusted_{tech}', f'total_{cost}_adjusted']:
+                    self.declare_partials(of, f'{cost}_{tech}', rows=scenarios, cols=scenarios, val=factor)
 
     def compute(self, inputs, outputs):
+        # All scenarios are adjusted at once; each input carries one value per scenario
         total_capex_adjusted = 0.0
         total_opex_adjusted = 0.0
         for tech in self.options['tech_config']:
-            capex = float(inputs[f'capex_{tech}'][0])
-            opex = float(inputs[f'opex_{tech}'][0])
+            capex = inputs[f'capex_{tech}']
+            opex = inputs[f'opex_{tech}']
             cost_year = self.discount_years[tech]
             periods = self.cost_year - cost_year
             adjusted_capex = -npf.fv(self.inflation_rate, periods, 0.0, capex)
@@ -44,6 +86,9 @@ class AdjustedCapexOpexComp(om.ExplicitComponent):
 
 
 class ProFastComp(om.ExplicitComponent):
+    # Commodities whose levelized price has analytic partials; the others must be approximated
+    analytic_partials_commodities = ['hydrogen']
+
     def initialize(self):
         self.options.declare('tech_config', types=dict)
         self.options.declare('plant_config', types=dict)
@@ -55,30 +100,163 @@ class ProFastComp(om.ExplicitComponent):
         self.discount_rate = plant_config['finance_parameters']['discount_rate']
         self.inflation_rate = plant_config['finance_parameters']['costing_general_inflation']
         self.cost_year = plant_config['plant']['cost_year']
+        self.n_scenarios = get_n_scenarios(plant_config)
+        shape = get_scenario_shape(plant_config)
+
+        # 'profast' solves each scenario with ProFAST, 'native' solves all scenarios at once
+        # with the equivalent in-package cash flow model
+        self.cash_flow_model = plant_config['finance_parameters'].get('cash_flow_model', 'profast')
+        if self.cash_flow_model not in ('profast', 'native'):
+            raise ValueError(
+                f"Unknown cash_flow_model '{self.cash_flow_model}'; use 'profast' or 'native'"
+            )
 
         for tech in tech_config:
-            self.add_input(f'capex_adjusted_{tech}', val=0.0, units='USD')
-            self.add_input(f'opex_adjusted_{tech}', val=0.0, units='USD/year')
+            self.add_input(f'capex_adjusted_{tech}', val=0.0, shape=shape, units='USD')
+            self.add_input(f'opex_adjusted_{tech}', val=0.0, shape=shape, units='USD/year')
         
         if self.options['commodity_type'] == 'hydrogen':
-            self.add_output('LCOH', val=0.0, units='USD/kg')
+            self.add_output('LCOH', val=0.0, shape=shape, units='USD/kg')
 
         if self.options['commodity_type'] == 'steel':
-            self.add_output('LCOS', val=0.0, units='USD/ton')
+            self.add_output('LCOS', val=0.0, shape=shape, units='USD/ton')
 
         if self.options['commodity_type'] == 'electricity':
-            self.add_output('LCOE', val=0.0, units='USD/kW/h')
+            self.add_output('LCOE', val=0.0, shape=shape, units='USD/kW/h')
 
         if 'electrolyzer' in tech_config:
-            self.add_input('total_hydrogen_produced', val=0.0, units='kg/year')
-            self.add_input('time_until_replacement', units='h')
+            self.add_input('total_hydrogen_produced', val=0.0, shape=shape, units='kg/year')
+            self.add_input('time_until_replacement', shape=shape, units='h')
+
+        # Each scenario's LCOH depends only on that scenario's inputs. The replacement schedule
+        # is rounded to whole years, so the LCOH is piecewise constant in the time until
+        # replacement and no partial is declared for it.
+        self.partials_wrt = []
+        if self.options['commodity_type'] in self.analytic_partials_commodities:
+            self.partials_wrt = [
+                f'{cost}_adjusted_{tech}' for tech in tech_config for cost in ['capex', 'opex']
+            ]
+            if 'electrolyzer' in tech_config:
+                self.partials_wrt.append('total_hydrogen_produced')
+
+            scenarios = np.arange(self.n_scenarios)
+            for wrt in self.partials_wrt:
+                self.declare_partials('LCOH', wrt, rows=scenarios, cols=scenarios)
 
     def compute(self, inputs, outputs):
+        if self.cash_flow_model == 'native':
+            # The native cash flow model solves every scenario at once
+            sol = self.run_cash_flow(inputs)
+            if self.options['commodity_type'] == 'hydrogen':
+                outputs['LCOH'] = sol["price"]
+        else:
+            # ProFAST solves one price at a time, so batched scenarios are looped over here
+            for scenario in range(self.n_scenarios):
+                sol = self.run_profast(inputs, scenario)
+
+                # Only hydrogen supported in the very short term
+                if self.options['commodity_type'] == 'hydrogen':
+                    outputs['LCOH'][scenario] = sol["price"]
+
+        if self.options['commodity_type'] == 'hydrogen':
+            # Kept for compute_partials, which linearizes about the solved price
+            self.price = np.reshape(outputs['LCOH'], self.n_scenarios).copy()
+
+    def compute_partials(self, inputs, partials):
+        """
+        Semi-analytic partials of the LCOH from the cash flow model that solved it.
+
+        The LCOH is the price at which the investor NPV is zero, so by the implicit function
+        theorem dLCOH/dx = -(dNPV/dx) / (dNPV/dLCOH). The NPV is piecewise linear in the price
+        and in every input, so its derivatives are exact one-sided differences at the solved
+        price. All perturbed cases are stacked as extra scenarios, so no further price solves
+        are needed: the native cash flow model evaluates them at once, and ProFAST evaluates
+        the NPV of one case at a time.
+        """
+        if not self.partials_wrt:
+            return
+
+        n = self.n_scenarios
+        n_blocks = len(self.partials_wrt) + 2
+
+        # Block 0 is the solution, block 1 perturbs the price, and the remaining blocks each
+        # perturb one input
+        stacked = {
+            name: np.tile(np.reshape(inputs[name], n), n_blocks) for name in inputs.keys()
+        }
+        price_step = 1.e-6 * np.maximum(np.abs(self.price), 1.0)
+        prices = np.tile(self.price, n_blocks)
+        prices[n:2 * n] += price_step
+
+        steps = {}
+        for block, wrt in enumerate(self.partials_wrt, start=2):
+            steps[wrt] = 1.e-6 * np.maximum(np.abs(stacked[wrt][:n]), 1.0)
+            stacked[wrt][block * n:(block + 1) * n] += steps[wrt]
+
+        if self.cash_flow_model == 'native':
+            cf = CashFlowModel(n * n_blocks)
+            self.setup_financial_model(cf, stacked, slice(None))
+            npv = cf.npv(prices)
+        else:
+            npv = np.empty(n * n_blocks)
+            for case in range(n * n_blocks):
+                pf = ProFAST.ProFAST()
+                self.setup_financial_model(pf, stacked, case)
+                npv[case] = pf.cash_flow(prices[case])
+        npv = npv.reshape(n_blocks, n)
+
+        dnpv_dprice = (npv[1] - npv[0]) / price_step
+        for block, wrt in enumerate(self.partials_wrt, start=2):
+            dnpv_dwrt = (npv[block] - npv[0]) / steps[wrt]
+            partials['LCOH', wrt] = -dnpv_dwrt / dnpv_dprice
+
+    def run_profast(self, inputs, scenario=0):
+        """
+        Build and solve the ProFAST model for a single scenario.
+
+        Args:
+            inputs (openmdao vector): Component inputs, with one value per scenario.
+            scenario (int, optional): Index of the scenario to solve. Defaults to 0.
+
+        Returns:
+            dict: The ProFAST price solution.
+        """
+        pf = ProFAST.ProFAST()
+        self.setup_financial_model(pf, inputs, scenario)
+        return pf.solve_price()
+
+    def run_cash_flow(self, inputs):
+        """
+        Build and solve the native cash flow model for all scenarios at once.
+
+        Args:
+            inputs (openmdao vector): Component inputs, with one value per scenario.
+
+        Returns:
+            dict: The price solution, with one price per scenario.
+        """
+        cf = CashFlowModel(self.n_scenarios)
+        self.setup_financial_model(cf, inputs, slice(None))
+        return cf.solve_price()
+
+    def setup_financial_model(self, pf, inputs, scenario):
+        """
+        Set the parameters, capital items, and fixed costs of a financial model.
+
+        Args:
+            pf: A `ProFAST.ProFAST` or `CashFlowModel` instance.
+            inputs (openmdao vector): Component inputs, with one value per scenario.
+            scenario (int or slice): Index of the scenario to set up, or a slice of scenarios
+                for the native cash flow model.
+        """
+        def value(name):
+            val = inputs[name][scenario]
+            return float(val) if np.ndim(val) == 0 else np.array(val, dtype=float)
+
         gen_inflation = self.plant_config["finance_parameters"]["profast_general_inflation"]
 
         land_cost = 0.0
 
-        pf = ProFAST.ProFAST()
         if self.options['commodity_type'] == 'hydrogen':
             pf.set_params(
                 "commodity",
@@ -91,7 +269,7 @@ class ProFastComp(om.ExplicitComponent):
             )
             pf.set_params(
                 "capacity",
-                float(inputs["total_hydrogen_produced"]) / 365.0,
+                value("total_hydrogen_produced") / 365.0,
             )  # kg/day
         pf.set_params("maintenance", {"value": 0, "escalation": gen_inflation})
         pf.set_params(
@@ -175,18 +353,15 @@ class ProFastComp(om.ExplicitComponent):
         # ----------------------------------- Add capital and fixed items to ProFAST ----------------
         for tech in self.tech_config:
             if 'electrolyzer' in tech:
-                electrolyzer_refurbishment_schedule = np.zeros(
-                    self.plant_config["plant"]["plant_life"]
+                electrolyzer_refurbishment_schedule = refurbishment_schedule(
+                    value('time_until_replacement'),
+                    self.plant_config["plant"]["plant_life"],
+                    self.tech_config['electrolyzer']['model_inputs']["financial_parameters"]["replacement_cost_percent"],
                 )
-                refurb_period = round(float(inputs['time_until_replacement']) / (24 * 365))
-                electrolyzer_refurbishment_schedule[
-                    refurb_period : self.plant_config["plant"]["plant_life"] : refurb_period
-                ] = self.tech_config['electrolyzer']['model_inputs']["financial_parameters"]["replacement_cost_percent"]
-                electrolyzer_refurbishment_schedule = list(electrolyzer_refurbishment_schedule)
-                
+
                 pf.add_capital_item(
                     name="Electrolysis System",
-                    cost=float(inputs[f'capex_adjusted_{tech}']),
+                    cost=value(f'capex_adjusted_{tech}'),
                     depr_type=self.plant_config["finance_parameters"]["depreciation_method"],
                     depr_period=int(self.plant_config["finance_parameters"]["depreciation_period_electrolyzer"]),
                     refurb=electrolyzer_refurbishment_schedule,
@@ -195,13 +370,13 @@ class ProFastComp(om.ExplicitComponent):
                     name="Electrolysis System Fixed O&M Cost",
                     usage=1.0,
                     unit="$/year",
-                    cost=float(inputs[f'opex_adjusted_{tech}']),
+                    cost=value(f'opex_adjusted_{tech}'),
                     escalation=gen_inflation,
                 )
             else:
                 pf.add_capital_item(
                     name=f"{tech} System",
-                    cost=float(inputs[f'capex_adjusted_{tech}']),
+                    cost=value(f'capex_adjusted_{tech}'),
                     depr_type=self.plant_config["finance_parameters"]["depreciation_method"],
                     depr_period=self.plant_config["finance_parameters"]["depreciation_period"],
                     refurb=[0],
@@ -210,7 +385,7 @@ class ProFastComp(om.ExplicitComponent):
                     name=f"{tech} O&M Cost",
                     usage=1.0,
                     unit="$/year",
-                    cost=float(inputs[f'opex_adjusted_{tech}']),
+                    cost=value(f'opex_adjusted_{tech}'),
                     escalation=gen_inflation,
                 )
 
@@ -347,13 +522,3 @@ class ProFastComp(om.ExplicitComponent):
         #     tax_credit=True,
         # )  # TODO check decay
 
-        # ------------------------------------ solve and post-process -----------------------------
-
-        sol = pf.solve_price()
-
-        df = pf.cash_flow_out
-
-        # Only hydrogen supported in the very short term
-        if self.options['commodity_type'] == 'hydrogen':
-            lcoh = sol["price"]
-            outputs['LCOH'] = lcoh
@@ -1,26 +1,66 @@
+import copy
+import os
+import sys
+
 import yaml
 
 import numpy as np
 import openmdao.api as om
 
 from new_greenheart.core.supported_models import supported_models
-from new_greenheart.core.finances import AdjustedCapexOpexComp, ProFastComp
 from new_greenheart.core.pose_optimization import PoseOptimization
-from new_greenheart.core.inputs.validation import load_plant_yaml, load_tech_yaml, load_driver_yaml
-from new_greenheart.core.utilities import create_xdsm_from_config
+from new_greenheart.core.inputs.validation import load_plant_yaml, load_tech_yaml, load_driver_yaml, nested_set
+from new_greenheart.core.utilities import create_xdsm_from_config, resolve_file_paths
 from new_greenheart.core.feedstocks import FeedstockComponent
+from new_greenheart.core.profiling import ComponentProfiler
+from new_greenheart.core.recorders import ColumnRecorder
+from new_greenheart.core.parallel_fd import ParallelFiniteDifference
+from new_greenheart.core.parallel_doe import ProcessPoolDOEDriver
+from new_greenheart.core.cache import SimulationCache, canonical_key
+from new_greenheart.core.checkpoint import RunCheckpoint
+from new_greenheart.core.surrogate import surrogate_model
+from new_greenheart.core.memoize import memoized_model
+from new_greenheart.core.representative_periods import (
+    RepresentativePeriodComp,
+    get_representative_periods,
+    select_representative_periods,
+)
 
 try:
     import pyxdsm
 except:
     pyxdsm = None
 
+# models that declare analytic partials, so they are not finite differenced
+analytic_partials_models = ['cable', 'pipe', 'combiner_performance']
+
+# transport models whose output equals their input, which can be replaced by a direct connection
+lossless_transport_models = ['cable', 'pipe']
+
 
 class GreenHEARTModel(object):
 
-    def __init__(self, config_file):
+    def __init__(self, config_file, overrides=None, validate=True):
+        # track the model lifecycle so that the OpenMDAO problem is set up only once and
+        # can then be re-run many times with different inputs
+        self.recorder = None
+        self.profiler = None
+        self.parallel_fd = None
+        self.checkpoint = None
+        self.is_setup = False
+
         # read in config file; it's a yaml dict that looks like this:
-        self.load_config(config_file)
+        self.config_file = config_file
+        self.overrides = overrides
+        self.validate = validate
+        self.load_config(config_file, overrides, validate)
+
+        # select the representative periods from a full-year baseline run, if requested and
+        # not given already
+        self.baseline = None
+        representative_periods = self.plant_config['plant'].get('representative_periods', {})
+        if representative_periods.get('flag', False) and 'periods' not in representative_periods:
+            self.create_representative_periods(config_file, overrides)
 
         # create site-level model
         # this is an OpenMDAO group that contains all the site information
@@ -48,7 +88,26 @@ class GreenHEARTModel(object):
         # can draw a fair amount from WEIS
         self.create_driver_model()
 
-    def load_config(self, config_file):
+    def load_config(self, config_file, overrides=None, validate=True):
+        """
+        Load the driver, technology, and plant configs referenced by the top-level config file.
+
+        The config files and the input files that the technology and plant configs reference
+        are found relative to the directory of the top-level config file, whatever the working
+        directory. Validated configs are cached per process, so loading the same unchanged files
+        again skips parsing and validating them.
+
+        Args:
+            config_file (str): Path to the top-level GreenHEART yaml file.
+            overrides (dict, optional): Values that replace entries in the loaded configs,
+                keyed by a dotted path that starts with the config name, e.g.
+                'technology_config.technologies.electrolyzer.model_inputs.shared_parameters.rating'.
+                Defaults to None.
+            validate (bool, optional): Validate the configs against their schemas and fill in
+                the schema defaults. Only skip this for configs that are known to be valid and
+                complete, e.g. in batch runs of configs that have been validated before.
+                Defaults to True.
+        """
         with open(config_file, 'r') as file:
             config = yaml.safe_load(file)
 
@@ -56,9 +115,140 @@ class GreenHEARTModel(object):
         self.system_summary = config.get('system_summary')
 
         # Load each config file as yaml and save as dict on this object
-        self.driver_config = load_driver_yaml(config.get('driver_config'))
-        self.technology_config = load_tech_yaml(config.get('technology_config'))
-        self.plant_config = load_plant_yaml(config.get('plant_config'))
+        root = os.path.dirname(os.path.abspath(config_file))
+        self.driver_config = load_driver_yaml(
+            os.path.join(root, config.get('driver_config')), validate=validate
+        )
+        self.technology_config = load_tech_yaml(
+            os.path.join(root, config.get('technology_config')), validate=validate
+        )
+        self.plant_config = load_plant_yaml(
+            os.path.join(root, config.get('plant_config')), validate=validate
+        )
+        resolve_file_paths(self.technology_config, root)
+        resolve_file_paths(self.plant_config, root)
+
+        configs = {
+            'driver_config': self.driver_config,
+            'technology_config': self.technology_config,
+            'plant_config': self.plant_config,
+        }
+        for key, value in (overrides or {}).items():
+            config_name, *keylist = key.split('.')
+            if config_name not in configs or not keylist:
+                raise ValueError(
+                    f"Invalid override '{key}'; overrides must start with one of {list(configs)}"
+                )
+            # copied so that models loaded with the same overrides do not share config entries
+            nested_set(configs[config_name], keylist, copy.deepcopy(value))
+
+    def get_time_series_sources(self):
+        """
+        Return the (technology, commodity) pairs of the transport links whose source technology
+        does not receive a transported commodity itself, e.g. wind, HOPP, or the feedstocks.
+        """
+        links = [
+            connection for connection in self.plant_config.get('technology_interconnections', [])
+            if len(connection) == 4
+        ]
+        destinations = {dest_tech for _, dest_tech, _, _ in links}
+
+        sources = []
+        for source_tech, _, transport_item, _ in links:
+            if source_tech not in destinations and (source_tech, transport_item) not in sources:
+                sources.append((source_tech, transport_item))
+        return sources
+
+    def create_representative_periods(self, config_file, overrides=None):
+        """
+        Select the representative periods of the time series from a full-year baseline run.
+
+        The baseline is the same model without the reduction, run once with its default inputs.
+        The profiles that the source technologies send over transport links are clustered into
+        representative periods, whose indices and weights are stored in the
+        `representative_periods` plant config. The baseline is kept to report the reduction
+        error with `reduction_error`.
+
+        Args:
+            config_file (str): Path to the top-level GreenHEART yaml file.
+            overrides (dict, optional): Overrides of the loaded configs. Defaults to None.
+        """
+        config = self.plant_config['plant']['representative_periods']
+        baseline_overrides = {
+            **(overrides or {}),
+            'plant_config.plant.representative_periods.flag': False,
+        }
+        self.baseline = GreenHEARTModel(config_file, baseline_overrides, self.validate)
+
+        # the baseline is only used for comparison, so it is neither recorded nor profiled
+        self.baseline.driver_config.pop('recorder', None)
+        self.baseline.driver_config.pop('profile', None)
+        self.baseline.setup()
+        self.baseline.prob.run_model()
+
+        sources = self.baseline.get_time_series_sources()
+        if not sources:
+            raise ValueError(
+                "Representative periods need at least one technology that sends a time series "
+                "over a transport link in `technology_interconnections`"
+            )
+
+        period_hours = config.get('period_hours', 24)
+        periods, weights = select_representative_periods(
+            [self.baseline.get_val(f'{source}.{item}') for source, item in sources],
+            config['n_periods'],
+            period_hours,
+            seed=config.get('seed', 0),
+        )
+        config['period_hours'] = period_hours
+        config['periods'] = periods.tolist()
+        config['weights'] = weights.tolist()
+
+    def reduction_error(self, out_stream=sys.stdout):
+        """
+        Compare the outputs of the representative-period model with the full-year baseline.
+
+        Both models are run with the current values of the design variables. Outputs that are
+        reduced time series are not compared.
+
+        Args:
+            out_stream (file-like, optional): Stream the comparison table is written to.
+                Defaults to sys.stdout; None disables the table.
+
+        Returns:
+            dict: The baseline value, the reduced value, and the largest relative error of each
+                output that differs between the two models.
+        """
+        if self.baseline is None:
+            raise RuntimeError("The model does not use representative periods")
+
+        self.setup()
+        for name, value in self.prob.driver.get_design_var_values(driver_scaling=False).items():
+            self.baseline.set_val(name, value)
+        self.prob.run_model()
+        self.baseline.prob.run_model()
+
+        reduced = dict(self.prob.model.list_outputs(prom_name=True, out_stream=None))
+        baseline = dict(self.baseline.prob.model.list_outputs(prom_name=True, out_stream=None))
+
+        errors = {}
+        for name, meta in reduced.items():
+            if name not in baseline or np.shape(baseline[name]['val']) != np.shape(meta['val']):
+                continue
+            baseline_val = np.asarray(baseline[name]['val'], dtype=float)
+            reduced_val = np.asarray(meta['val'], dtype=float)
+            difference = np.abs(reduced_val - baseline_val)
+            if not np.any(difference > 0):
+                continue
+            with np.errstate(divide='ignore', invalid='ignore'):
+                relative = np.where(difference > 0, difference / np.abs(baseline_val), 0.)
+            errors[meta['prom_name']] = (baseline_val, reduced_val, float(np.max(relative)))
+
+        if out_stream is not None:
+            out_stream.write("Representative-period reduction error against the full year\n")
+            for name, (_, _, relative) in errors.items():
+                out_stream.write(f"  {name:<60} {100 * relative:10.4g} %\n")
+        return errors
 
     def create_site_model(self):
         # Create a site-level component
@@ -122,6 +312,8 @@ class GreenHEARTModel(object):
 
         self.tech_names = []
         self.performance_models = []
+        # systems without analytic partials, finite differenced when the driver asks for partials
+        self.approximated_systems = []
         self.cost_models = []
         self.financial_models = []
 
@@ -130,49 +322,48 @@ class GreenHEARTModel(object):
         # Create a technology group for each technology
         for tech_name, individual_tech_config in self.technology_config['technologies'].items():
             if 'feedstocks' in tech_name:
-                feedstock_component = FeedstockComponent(feedstocks_config=individual_tech_config)
+                feedstock_component = FeedstockComponent(
+                    feedstocks_config=individual_tech_config,
+                    plant_config=self.plant_config,
+                )
                 self.plant.add_subsystem(tech_name, feedstock_component)                
+                self.approximated_systems.append(feedstock_component)
             else:
                 tech_group = self.plant.add_subsystem(tech_name, om.Group())
                 self.tech_names.append(tech_name)
 
                 # Special HOPP handling for short-term
                 if tech_name in combined_performance_and_cost_model_technologies:
-                    hopp_comp = supported_models[tech_name](
-                        plant_config=self.plant_config, tech_config=individual_tech_config
+                    hopp_comp = self.create_model(
+                        tech_name, individual_tech_config['performance_model'], individual_tech_config
                     )
                     tech_group.add_subsystem(tech_name, hopp_comp, promotes=['*'])
                     self.performance_models.append(hopp_comp)
                     self.cost_models.append(hopp_comp)
                     self.financial_models.append(hopp_comp)
+                    self.approximated_systems.append(tech_group)
                     continue
 
+                # Combiners take one input per transport link into them
+                if 'combiner' in tech_name:
+                    self.set_combiner_inputs(tech_name, individual_tech_config)
+
                 # Process the technology models
-                performance_name = individual_tech_config['performance_model']['model']
-                performance_object = supported_models[performance_name]
-                tech_group.add_subsystem(
-                    performance_name,
-                    performance_object(
-                        plant_config=self.plant_config,
-                        tech_config=individual_tech_config
-                    ),
-                    promotes=['*']
+                performance_config = individual_tech_config['performance_model']
+                performance_name = performance_config['model']
+                performance_comp = self.create_model(
+                    performance_name, performance_config, individual_tech_config
                 )
-                self.performance_models.append(performance_object)
+                tech_group.add_subsystem(performance_name, performance_comp, promotes=['*'])
+                self.performance_models.append(type(performance_comp))
 
                 # Process the cost models
                 if 'cost_model' in individual_tech_config:
-                    cost_name = individual_tech_config['cost_model']['model']
-                    cost_object = supported_models[cost_name]
-                    tech_group.add_subsystem(
-                        cost_name,
-                        cost_object(
-                            plant_config=self.plant_config,
-                            tech_config=individual_tech_config
-                        ),
-                        promotes=['*']
-                    )
-                    self.cost_models.append(cost_object)
+                    cost_config = individual_tech_config['cost_model']
+                    cost_name = cost_config['model']
+                    cost_comp = self.create_model(cost_name, cost_config, individual_tech_config)
+                    tech_group.add_subsystem(cost_name, cost_comp, promotes=['*'])
+                    self.cost_models.append(type(cost_comp))
 
                 # Process the financial models
                 if 'financial_model' in individual_tech_config:
@@ -194,6 +385,73 @@ class GreenHEARTModel(object):
                         #TODO: Is this currently a bypass until the financial portion is more concrete?
                         pass
 
+                # the group is finite differenced unless all of its models have analytic
+                # partials; surrogates replace the compute, so their partials must be approximated
+                model_configs = [
+                    individual_tech_config[key] for key in ['performance_model', 'cost_model']
+                    if key in individual_tech_config
+                ]
+                if 'financial_model' in individual_tech_config or any(
+                    config['model'] not in analytic_partials_models
+                    or config.get('surrogate', {}).get('flag', False)
+                    for config in model_configs
+                ):
+                    self.approximated_systems.append(tech_group)
+
+    def set_combiner_inputs(self, tech_name, tech_config):
+        """
+        Set the number of inputs of a combiner to the number of transport links into it.
+
+        Args:
+            tech_name (str): Name of the combiner technology.
+            tech_config (dict): Config of the combiner, whose `n_inputs` performance parameter
+                is set. A given `n_inputs` must match the number of links.
+        """
+        n_inputs = sum(
+            1 for connection in self.plant_config.get('technology_interconnections', [])
+            if len(connection) == 4 and connection[1] == tech_name
+        )
+        model_inputs = tech_config.setdefault('model_inputs', {})
+        performance_parameters = model_inputs.setdefault('performance_parameters', {})
+        if performance_parameters.setdefault('n_inputs', n_inputs) != n_inputs:
+            raise ValueError(
+                f"'{tech_name}' has {n_inputs} incoming transport links, but n_inputs is "
+                f"{performance_parameters['n_inputs']}"
+            )
+
+    def create_model(self, model_name, model_config, tech_config):
+        """
+        Instantiate a model from `supported_models` for a technology.
+
+        If the model config has a `surrogate` section with `flag: True`, the model's compute
+        calls are answered by a surrogate trained on the model; see
+        `new_greenheart.core.surrogate`. If it has a `memoize` section with `flag: True`,
+        compute calls with inputs that were computed recently are skipped; see
+        `new_greenheart.core.memoize`.
+
+        Args:
+            model_name (str): Name of the model in `supported_models`.
+            model_config (dict): The `performance_model` or `cost_model` config of the technology.
+            tech_config (dict): Config of the technology.
+
+        Returns:
+            om.ExplicitComponent: The model component.
+        """
+        model_object = supported_models[model_name]
+        options = {'plant_config': self.plant_config, 'tech_config': tech_config}
+
+        surrogate_config = model_config.get('surrogate', {})
+        if surrogate_config.get('flag', False):
+            model_object = surrogate_model(model_object)
+            options['surrogate_config'] = surrogate_config
+
+        memoize_config = model_config.get('memoize', {})
+        if memoize_config.get('flag', False):
+            model_object = memoized_model(model_object)
+            options['memoize_config'] = memoize_config
+
+        return model_object(**options)
+
     def create_financial_model(self):
         """
         Creates and configures the financial model for the plant.
@@ -205,6 +463,9 @@ class GreenHEARTModel(object):
         if 'finance_parameters' not in self.plant_config:
             return
 
+        # Imported here so that runs without financials do not pay the ProFAST import cost
+        from new_greenheart.core.finances import AdjustedCapexOpexComp, ProFastComp
+
         # Create a dictionary to hold financial groups
         financial_groups = {}
 
@@ -255,13 +516,39 @@ class GreenHEARTModel(object):
 
             self.plant.add_subsystem(f'financials_group_{group_id}', financial_group)
 
+            # e.g. the LCOE declares no partials, so its group must be finite differenced
+            if commodity_type not in ProFastComp.analytic_partials_commodities:
+                self.approximated_systems.append(financial_group)
+
         self.financial_groups = financial_groups
 
     def connect_technologies(self):
+        """
+        Connect the technologies as listed in the `technology_interconnections` plant config.
+
+        Each transport link (source, destination, commodity, transport type) adds a transport
+        component between the technologies. With `eliminate_lossless_transport` in the plant
+        config, links of a lossless type are wired from the source output directly to the
+        destination input instead, which saves the component, its copies of the time series,
+        and a node of the model graph. Every link is listed in `transport_links` either way,
+        and `get_transport_val` returns the flow over a link.
+        """
         technology_interconnections = self.plant_config.get('technology_interconnections', [])
+        eliminate_lossless = self.plant_config['plant'].get('eliminate_lossless_transport', False)
 
+        # the logical transport links, keyed by their connection name
+        self.transport_links = {}
         combiner_counts = {}
 
+        # the time series of the source technologies are reduced to the representative periods
+        representative_period_sources = {}
+        if get_representative_periods(self.plant_config) is not None:
+            representative_period_sources = {
+                (source, item): f'{source}_{item}_representative_periods'
+                for source, item in self.get_time_series_sources()
+            }
+        added_reductions = set()
+
         # loop through each linkage and instantiate an OpenMDAO object (assume it exists) for
         # the connection type (e.g. cable, pipeline, etc)
         for connection in technology_interconnections:
@@ -271,17 +558,20 @@ class GreenHEARTModel(object):
                 # make the connection_name based on source, dest, item, type
                 connection_name = f'{source_tech}_to_{dest_tech}_{transport_type}'
 
-                # Create the transport object
-                connection_component = supported_models[transport_type]()
-
-                # Add the connection component to the model
-                self.plant.add_subsystem(connection_name, connection_component)
-
-                # Connect the source technology to the connection component
-                self.plant.connect(
-                    f'{source_tech}.{transport_item}',
-                    f'{connection_name}.{transport_item}_input'
-                )
+                # The source output, reduced to the representative periods if requested
+                source_name = f'{source_tech}.{transport_item}'
+                reduction_name = representative_period_sources.get((source_tech, transport_item))
+                if reduction_name is not None:
+                    if reduction_name not in added_reductions:
+                        added_reductions.add(reduction_name)
+                        self.plant.add_subsystem(
+                            reduction_name,
+                            RepresentativePeriodComp(
+                                plant_config=self.plant_config, commodity=transport_item
+                            ),
+                        )
+                        self.plant.connect(source_name, f'{reduction_name}.{transport_item}_input')
+                    source_name = f'{reduction_name}.{transport_item}_output'
 
                 # Check if the transport type is a combiner
                 if 'combiner' in dest_tech:
@@ -290,19 +580,33 @@ class GreenHEARTModel(object):
                         combiner_counts[dest_tech] = 1
                     else:
                         combiner_counts[dest_tech] += 1
-
-                    # Connect the connection component to the destination technology
-                    self.plant.connect(
-                        f'{connection_name}.{transport_item}_output',
-                        f'{dest_tech}.electricity_input{combiner_counts[dest_tech]}'
-                    )
-                    
+                    dest_name = f'{dest_tech}.electricity_input{combiner_counts[dest_tech]}'
                 else:
-                    # Connect the connection component to the destination technology
-                    self.plant.connect(
-                        f'{connection_name}.{transport_item}_output',
-                        f'{dest_tech}.{transport_item}'
-                    )
+                    dest_name = f'{dest_tech}.{transport_item}'
+
+                eliminated = eliminate_lossless and transport_type in lossless_transport_models
+                self.transport_links[connection_name] = {
+                    'source': source_tech,
+                    'destination': dest_tech,
+                    'commodity': transport_item,
+                    'transport_type': transport_type,
+                    'eliminated': eliminated,
+                    'output': source_name if eliminated else f'{connection_name}.{transport_item}_output',
+                }
+
+                if eliminated:
+                    self.plant.connect(source_name, dest_name)
+                    continue
+
+                # Create the transport object and add it to the model
+                connection_component = supported_models[transport_type]()
+                self.plant.add_subsystem(connection_name, connection_component)
+                if transport_type not in analytic_partials_models:
+                    self.approximated_systems.append(connection_component)
+
+                # Connect the transport component between the technologies
+                self.plant.connect(source_name, f'{connection_name}.{transport_item}_input')
+                self.plant.connect(f'{connection_name}.{transport_item}_output', dest_name)
 
             elif len(connection) == 3:
                 # connect directly from source to dest
@@ -358,23 +662,286 @@ class GreenHEARTModel(object):
         if 'driver' in self.driver_config:
             myopt = PoseOptimization(self.driver_config)
             myopt.set_driver(self.prob)
+            if isinstance(self.prob.driver, ProcessPoolDOEDriver):
+                self.prob.driver.model_args = (self.config_file, self.get_worker_overrides())
+            myopt.approximate_partials(self.approximated_systems)
             myopt.set_objective(self.prob)
             myopt.set_design_variables(self.prob)
             myopt.set_constraints(self.prob)
 
-    def run(self):
+    def add_recorder(self):
+        """
+        Add a recorder to the model if one is specified in the driver config.
+
+        The recorder is an `om.SqliteRecorder` unless `format` is 'columns', which records to
+        a directory of per-variable columns that can be read with `ColumnCaseReader`. The
+        recorded variables can be selected with `includes` and `excludes` patterns.
+
+        The recorder is only attached once, so calling this method repeatedly is safe.
+        """
+        if self.recorder is not None or 'recorder' not in self.driver_config:
+            return
+
+        recorder_config = self.driver_config['recorder']
+        if recorder_config.get('format', 'sqlite') == 'columns':
+            self.recorder = ColumnRecorder(
+                recorder_config['file'],
+                dtypes=recorder_config.get('dtypes'),
+                summary_only=recorder_config.get('summary_only', False),
+                chunk_size=recorder_config.get('chunk_size', 256),
+            )
+        else:
+            self.recorder = om.SqliteRecorder(recorder_config['file'])
+        self.model.add_recorder(self.recorder)
+
+        if 'includes' in recorder_config:
+            self.model.recording_options['includes'] = recorder_config['includes']
+        if 'excludes' in recorder_config:
+            self.model.recording_options['excludes'] = recorder_config['excludes']
+
+    def setup(self):
+        """
+        Set up the OpenMDAO problem, if it has not been set up already.
+
+        The technology models and their connections are built once in `__init__`, and the
+        problem is set up once here; later calls are no-ops. This allows a single
+        GreenHEARTModel to be evaluated many times in one process through `set_val`,
+        `run`, and `get_val`.
+        """
+        if self.is_setup:
+            return
+
         # do model setup based on the driver config
         # might add a recorder, driver, set solver tolerances, etc
-
-        # Add a recorder if specified in the driver config
-        if 'recorder' in self.driver_config:
-            recorder_config = self.driver_config['recorder']
-            recorder = om.SqliteRecorder(recorder_config['file'])
-            self.model.add_recorder(recorder)
+        self.add_recorder()
 
         self.prob.setup()
+        self.is_setup = True
+
+        self.add_profiler()
+        self.add_parallel_fd()
+        self.add_checkpoint()
+
+    def add_profiler(self):
+        """
+        Wrap every technology, transport, and financial component with a profiler if profiling
+        is enabled in the driver config.
+
+        The profiler is only attached once, after the problem has been set up. Each run writes
+        the profile to its JSON file, placed like the checkpoint file, and prints the summary
+        table if `print_table` is enabled.
+        """
+        profile_config = self.driver_config.get('profile', {})
+        if self.profiler is not None or not profile_config.get('flag', False):
+            return
+
+        self.profiler = ComponentProfiler(track_memory=profile_config.get('track_memory', False))
+        self.profiler.wrap_model(self.plant)
+
+    def get_worker_overrides(self):
+        """
+        Return the overrides with which process pool workers build their copies of this model.
+
+        Representative periods that have been selected are passed on so that the workers do
+        not select them again.
+        """
+        overrides = dict(self.overrides or {})
+        if get_representative_periods(self.plant_config) is not None:
+            overrides['plant_config.plant.representative_periods'] = (
+                self.plant_config['plant']['representative_periods']
+            )
+        return overrides
+
+    def add_parallel_fd(self):
+        """
+        Finite difference the driver's total derivatives across a local process pool if
+        `parallel_fd` is enabled in the optimization section of the driver config.
+
+        Each worker process builds and sets up its own copy of the model from the same config
+        file and overrides.
+        """
+        opt_options = self.driver_config.get('driver', {}).get('optimization', {})
+        parallel_config = opt_options.get('parallel_fd', {})
+        if (
+            self.parallel_fd is not None
+            or not opt_options.get('flag', False)
+            or not parallel_config.get('flag', False)
+        ):
+            return
+
+        self.parallel_fd = ParallelFiniteDifference(
+            self.config_file,
+            self.get_worker_overrides(),
+            n_workers=parallel_config.get('n_workers'),
+            **PoseOptimization(self.driver_config)._get_fd_options(),
+        )
+        self.parallel_fd.attach(self.prob.driver)
+
+    def add_checkpoint(self):
+        """
+        Checkpoint the model evaluations of the driver if `checkpoint` is enabled in the
+        driver section of the driver config.
+
+        A run restarted with the same checkpoint file and configs replays the evaluations
+        stored in it instead of recomputing them, so a killed DOE or optimization resumes where
+        it stopped. A bare checkpoint file name is placed in the `folder_output` directory of the
+        driver config, relative to the directory of the top-level config file.
+        """
+        checkpoint_config = self.driver_config.get('driver', {}).get('checkpoint', {})
+        if self.checkpoint is not None or not checkpoint_config.get('flag', False):
+            return
+
+        self.checkpoint = RunCheckpoint(
+            self.get_output_file(checkpoint_config.get('file', 'checkpoint.json')),
+            interval=checkpoint_config.get('interval', 10),
+            fingerprint=self.config_fingerprint(),
+        )
+        self.checkpoint.attach(self.prob.driver)
+
+    def get_output_file(self, file_name):
+        """
+        Return the path of an output file of the run.
+
+        A bare file name is placed in the `folder_output` directory of the driver config,
+        relative to the directory of the top-level config file, which is created if needed.
+        Paths with a directory are returned unchanged.
+        """
+        if os.path.dirname(file_name):
+            return file_name
+
+        folder_output = os.path.join(
+            os.path.dirname(os.path.abspath(self.config_file)),
+            self.driver_config.get('general', {}).get('folder_output', 'output'),
+        )
+        os.makedirs(folder_output, exist_ok=True)
+        return os.path.join(folder_output, file_name)
+
+    def config_fingerprint(self):
+        """
+        Return a hash of the loaded configs that determine the results of the model.
+
+        Settings that only affect how a run is executed or recorded, e.g. the recorder, the
+        checkpoint itself, or the number of worker processes, are left out.
+        """
+        driver_config = copy.deepcopy(self.driver_config)
+        for key in ['general', 'recorder', 'profile']:
+            driver_config.pop(key, None)
+        driver = driver_config.get('driver', {})
+        driver.pop('checkpoint', None)
+        driver.get('optimization', {}).pop('parallel_fd', None)
+        driver.get('design_of_experiments', {}).pop('process_pool', None)
+
+        return canonical_key({
+            'driver_config': driver_config,
+            'technology_config': self.technology_config,
+            'plant_config': self.plant_config,
+        })
+
+    def set_val(self, name, val, units=None, indices=None):
+        """
+        Set the value of a model input or design variable by its promoted name.
+
+        Args:
+            name (str): Promoted name of the variable, e.g. 'electrolyzer.cluster_size'.
+            val (float or np.ndarray): Value to set.
+            units (str, optional): Units of `val`. Defaults to the variable's units.
+            indices (int or slice, optional): Indices of the variable to set. Defaults to None.
+        """
+        self.setup()
+        self.prob.set_val(name, val, units=units, indices=indices)
+
+    def get_val(self, name, units=None, indices=None):
+        """
+        Get a copy of the value of a model variable by its promoted name.
+
+        Args:
+            name (str): Promoted name of the variable, e.g. 'financials_group_1.LCOH'.
+            units (str, optional): Units to return the value in. Defaults to the variable's units.
+            indices (int or slice, optional): Indices of the variable to get. Defaults to None.
+
+        Returns:
+            np.ndarray: Copy of the variable's value.
+        """
+        self.setup()
+        return np.copy(self.prob.get_val(name, units=units, indices=indices))
+
+    def get_transport_val(self, connection_name, units=None):
+        """
+        Get a copy of the flow over a transport link, whether or not its component was eliminated.
+
+        Args:
+            connection_name (str): Name of the link, '<source>_to_<destination>_<transport type>'.
+            units (str, optional): Units to return the value in. Defaults to the units of the
+                transport output, or of the source output if the link was eliminated.
+
+        Returns:
+            np.ndarray: Copy of the flow.
+        """
+        if connection_name not in self.transport_links:
+            raise KeyError(
+                f"'{connection_name}' is not a transport link; the links are {list(self.transport_links)}"
+            )
+        return self.get_val(self.transport_links[connection_name]['output'], units=units)
+
+    def get_simulation_caches(self):
+        """
+        Return the simulation caches of the technology models, keyed by component path.
+
+        The statistics of each cache accumulate over repeated runs of the same model.
+        """
+        return {
+            system.pathname: system.cache
+            for system in self.prob.model.system_iter(recurse=True)
+            if isinstance(getattr(system, 'cache', None), SimulationCache)
+        }
+
+    def run(self):
+        """
+        Run the driver, setting up the problem first if needed.
+
+        Repeated calls reuse the existing problem, so only the first call pays the setup cost.
+        The hit and miss counts of the simulation caches used by the run, e.g. the HOPP cache,
+        are printed at the end. With representative periods, the reduction error at the final
+        design is only reported if `report_error` is True in the representative periods config,
+        as it reruns both the reduced and the full-year model; otherwise call `reduction_error`
+        explicitly.
+        """
+        self.setup()
+
+        try:
+            if self.profiler is None:
+                self.prob.run_driver()
+            else:
+                self.profiler.start()
+                try:
+                    self.prob.run_driver()
+                finally:
+                    self.profiler.stop()
+        finally:
+            # The column recorder buffers cases until a chunk is full, and the checkpoint
+            # holds the evaluations since its last interval
+            if isinstance(self.recorder, ColumnRecorder):
+                self.recorder.flush()
+            if self.checkpoint is not None:
+                self.checkpoint.save()
+
+        if self.profiler is not None:
+            # Statistics accumulate over repeated runs of the same model
+            profile_config = self.driver_config['profile']
+            if profile_config.get('print_table', False):
+                print(self.profiler.summary_table())
+            self.profiler.write_json(
+                self.get_output_file(profile_config.get('file', 'profile.json'))
+            )
+
+        for cache in self.get_simulation_caches().values():
+            # Lookups made in process-pool DOE workers are counted in the workers
+            if cache.stats['hits'] + cache.stats['misses'] > 0:
+                print(cache.summary())
 
-        self.prob.run_driver()
+        representative_periods = get_representative_periods(self.plant_config)
+        if representative_periods is not None and representative_periods.get('report_error', False):
+            self.reduction_error()
 
     def post_process(self):
         self.prob.model.list_inputs(units=True)
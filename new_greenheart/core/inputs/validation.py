@@ -3,12 +3,14 @@ Code adapted from NREL's WISDEM tool.
 """
 
 import os
+import re
 import copy
+import hashlib
 import numpy as np
 import jsonschema as json
 import yaml
 import ruamel.yaml as ry
-from functools import reduce
+from functools import lru_cache, reduce
 import operator
 from hopp.utilities import load_yaml
 
@@ -51,8 +53,9 @@ def nested_get(indict, keylist):
 
 def nested_set(indict, keylist, val):
     rv = indict
-    for i, k in enumerate(keylist):
-        rv = rv[k] if i != len(keylist) - 1 else val
+    for k in keylist[:-1]:
+        rv = rv[k]
+    rv[keylist[-1]] = val
 
 
 def integrate_defaults(instance : dict, defaults : dict, yaml_schema : dict) -> dict:
@@ -135,36 +138,101 @@ def extend_with_default(validator_class):
 
 DefaultValidatingDraft7Validator = extend_with_default(json.Draft7Validator)
 
-def _validate(finput, fschema, defaults=True):
+
+@lru_cache(maxsize=None)
+def _load_schema(fschema):
+    # Cached per process; the schema files do not change while a process runs
+    return load_yaml(fschema)
+
+
+@lru_cache(maxsize=None)
+def _get_validator(fschema, defaults):
+    validator = DefaultValidatingDraft7Validator if defaults else json.Draft7Validator
+    return validator(_load_schema(fschema))
+
+
+# Validated configs keyed by the schema and the content of the config file and its includes
+_config_cache = {}
+
+_include_pattern = re.compile(r"!include\s+[\"']?([^\s\"'#]+)")
+
+
+def _content_hash(filename, digest=None):
+    """
+    Hash the content of a YAML file and of every file it `!include`s, recursively.
+    """
+    digest = digest or hashlib.sha256()
+    with open(filename, 'rb') as f:
+        content = f.read()
+    digest.update(content)
+    root = os.path.dirname(filename)
+    for include in _include_pattern.findall(content.decode('utf-8', errors='ignore')):
+        _content_hash(os.path.join(root, include), digest)
+    return digest
+
+
+def _validate(finput, fschema, defaults=True, validate=True, cache=True):
     """
     Validates a dictionary against a schema and returns the validated dictionary.
 
+    Schema files are loaded and their validators compiled once per process. Validated YAML
+    files are cached per process, keyed by the content of the file and the files it includes,
+    so loading an unchanged file again returns a copy of the cached config without parsing or
+    validating it.
+
     Args:
         finput (dict or str): Dictionary or path to the YAML file to be validated.
         fschema (dict or str): Dictionary or path to the schema file to validate against.
         defaults (bool): Flag to indicate if default values should be integrated.
+        validate (bool): Flag to indicate if the input should be validated. Without
+            validation, the defaults of the schema are not integrated either. Defaults to True.
+        cache (bool): Flag to indicate if validated YAML files should be cached. Defaults to True.
 
     Returns:
         dict: Validated dictionary.
     """
-    schema_dict = fschema if isinstance(fschema, dict) else load_yaml(fschema)
+    if not validate:
+        return finput if isinstance(finput, dict) else load_yaml(finput)
+
+    key = None
+    if cache and not isinstance(finput, dict) and not isinstance(fschema, dict):
+        try:
+            key = (fschema, defaults, _content_hash(finput).hexdigest())
+        except OSError:
+            # Missing files are reported by load_yaml below
+            key = None
+        if key in _config_cache:
+            return copy.deepcopy(_config_cache[key])
+
+    if isinstance(fschema, dict):
+        validator = DefaultValidatingDraft7Validator if defaults else json.Draft7Validator
+        validator = validator(fschema)
+    else:
+        validator = _get_validator(fschema, defaults)
     input_dict = finput if isinstance(finput, dict) else load_yaml(finput)
-    validator = DefaultValidatingDraft7Validator if defaults else json.Draft7Validator
-    validator(schema_dict).validate(input_dict)
+    validator.validate(input_dict)
+
+    if key is not None:
+        _config_cache[key] = copy.deepcopy(input_dict)
     return input_dict
 
 
+def clear_config_cache():
+    """Forget the validated configs cached by this process."""
+    _config_cache.clear()
+
+
 # ---------------------
-def load_tech_yaml(finput):
-    return _validate(finput, fschema_tech)
+def load_tech_yaml(finput, validate=True):
+    return _validate(finput, fschema_tech, validate=validate)
 
 
-def load_plant_yaml(finput):
-    return _validate(finput, fschema_plant)
+def load_plant_yaml(finput, validate=True):
+    return _validate(finput, fschema_plant, validate=validate)
 
 
-def load_driver_yaml(finput):
-    return _validate(finput, fschema_driver)
+def load_driver_yaml(finput, validate=True):
+    return _validate(finput, fschema_driver, validate=validate)
 
 
 def tech_yaml(instance : dict, foutput : str) -> None:
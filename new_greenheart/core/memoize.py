@@ -0,0 +1,99 @@
+"""
+Memoization of the compute calls of technology models.
+
+OpenMDAO computes every component each time the model runs, even when the inputs of the
+component have not changed, e.g. for all the models that do not depend on the design
+variable that is being perturbed during finite differencing. Any model in `supported_models`
+can skip those computes by adding a `memoize` section to its `performance_model` or
+`cost_model` config. The outputs are then stored for the last few distinct input vectors and
+copied back into place when the same inputs are computed again.
+
+Memoization assumes that the outputs of a model depend only on its inputs and its options,
+so it must not be enabled for models whose outputs depend on state kept between computes.
+"""
+
+import collections
+import functools
+import hashlib
+
+import numpy as np
+
+from new_greenheart.core.cache import canonical_key
+
+
+class MemoizeMixin(object):
+    """
+    Skips compute calls of an OpenMDAO component whose inputs have been computed before.
+
+    Mixed into a technology model by `memoized_model`. The inputs are identified by a hash of
+    the bytes of the component's input vector, and the discrete inputs if there are any. The
+    outputs of the `max_entries` most recently used input vectors are kept, so models that
+    alternate between a few points, e.g. the base and perturbed points of finite
+    differencing, hit on each of them. The `memoize_config` option holds the settings:
+
+    - `max_entries`: number of input vectors whose outputs are kept. Defaults to 1, i.e. only
+      a repeat of the previous compute is skipped.
+    """
+    def initialize(self):
+        super().initialize()
+        self.options.declare('memoize_config', types=dict, default={})
+
+    def setup(self):
+        super().setup()
+        self.memo_max_entries = int(self.options['memoize_config'].get('max_entries', 1))
+        if self.memo_max_entries < 1:
+            raise ValueError(
+                f"max_entries of '{self.pathname}' must be at least 1, but "
+                f"{self.memo_max_entries} was given"
+            )
+        self.memo = collections.OrderedDict()
+        self.memo_stats = {'hits': 0, 'misses': 0}
+
+    def _memo_key(self, inputs, discrete_inputs):
+        digest = hashlib.blake2b(inputs.asarray().tobytes(), digest_size=16)
+        if discrete_inputs:
+            digest.update(canonical_key(dict(discrete_inputs)).encode('utf-8'))
+        return digest.digest()
+
+    def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        discrete = discrete_inputs is not None or discrete_outputs is not None
+        args = (discrete_inputs, discrete_outputs) if discrete else ()
+
+        key = self._memo_key(inputs, discrete_inputs)
+        entry = self.memo.get(key)
+        if entry is not None:
+            self.memo.move_to_end(key)
+            self.memo_stats['hits'] += 1
+            values, discrete_values = entry
+            # Copied into the existing output vector, so no arrays are allocated on a hit
+            outputs.set_val(values)
+            if discrete_values:
+                discrete_outputs.update(discrete_values)
+            return
+
+        self.memo_stats['misses'] += 1
+        super().compute(inputs, outputs, *args)
+
+        discrete_values = dict(discrete_outputs) if discrete_outputs else None
+        self.memo[key] = (np.copy(outputs.asarray()), discrete_values)
+        if len(self.memo) > self.memo_max_entries:
+            self.memo.popitem(last=False)
+
+    def clear_memo(self):
+        """Forget the stored outputs, e.g. after changing state that the outputs depend on."""
+        self.memo.clear()
+
+
+@functools.lru_cache(maxsize=None)
+def memoized_model(model_class):
+    """
+    Create a version of `model_class` that skips computes of inputs it has computed before.
+
+    Args:
+        model_class (type): An OpenMDAO component class from `supported_models`, or a
+            surrogate of one.
+
+    Returns:
+        type: A subclass of `model_class` that takes an extra `memoize_config` option.
+    """
+    return type(f'Memoized{model_class.__name__}', (MemoizeMixin, model_class), {})
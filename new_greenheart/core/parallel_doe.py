@@ -0,0 +1,193 @@
+"""
+Design of experiments run across a local process pool, without MPI.
+
+`om.DOEDriver` only runs cases in parallel under MPI. `ProcessPoolDOEDriver` instead sends
+the generated cases to a pool of worker processes, each holding its own set-up copy of the
+GreenHEART model, and records the finished cases in the main process as they come in, in the
+order in which they were generated, so that all cases end up in the recorders of the main
+model.
+"""
+
+import traceback
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import openmdao.api as om
+from openmdao.core.driver import RecordingDebugging
+from openmdao.recorders.recording_iteration_stack import Recording
+
+from new_greenheart.core.process_pool import get_worker_model, iter_isolated, model_worker_pool
+
+
+def _run_doe_case(case):
+    """Run the worker model for a case and return its vectors and success metadata."""
+    prob = get_worker_model().prob
+    model = prob.model
+    for name, value in case:
+        prob.driver.set_design_var(name, np.asarray(value).flatten())
+
+    try:
+        model.run_solve_nonlinear()
+        metadata = {'success': 1, 'msg': ''}
+    except Exception:
+        metadata = {'success': 0, 'msg': traceback.format_exc()}
+
+    return model._outputs.asarray().copy(), model._inputs.asarray().copy(), metadata
+
+
+class ProcessPoolDOEDriver(om.DOEDriver):
+    """
+    A DOEDriver that runs its cases on a local process pool.
+
+    The workers build their models from `model_args`, the config file and overrides of the
+    main model, which `GreenHEARTModel` sets. The model vectors of each finished case are
+    copied into the main model and recorded there, so the driver and model recorders of the
+    main model hold every case in the generated order. A case that finishes before an earlier
+    one waits in a reorder buffer, and its vectors are dropped once it is recorded, so only the
+    cases that are out of order are held in memory. Each worker runs one case at a time, so
+    a worker process that dies only fails the case it was running. That case is rerun on a new
+    worker up to `max_retries` times and is then recorded as failed, with NaN outputs.
+    Derivatives are not recorded.
+
+    With a `RunCheckpoint` attached, cases that are already in the checkpoint are not
+    submitted to the pool but restored from it, and each case is added to it as soon as it
+    finishes, so a run that is killed midway resumes without rerunning its finished cases.
+    """
+    model_args = None
+    checkpoint = None
+    # Function that runs a case in a worker process; must be importable
+    case_runner = staticmethod(_run_doe_case)
+
+    def _declare_options(self):
+        super()._declare_options()
+        self.options.declare(
+            'n_workers', types=int, default=None, allow_none=True, lower=1,
+            desc='Number of worker processes. Defaults to the number of CPUs.',
+        )
+        self.options.declare(
+            'max_retries', types=int, default=1, lower=0,
+            desc='Number of times a case is rerun after its worker process dies.',
+        )
+
+    def run(self):
+        """
+        Generate the cases, run them on the process pool, and record them in order.
+
+        Returns:
+            bool: Failure flag; always False, as for `om.DOEDriver`.
+        """
+        if self.model_args is None:
+            raise RuntimeError(
+                "ProcessPoolDOEDriver needs `model_args`, the config file and overrides that "
+                "its workers build their models from"
+            )
+
+        self.result.reset()
+        self.iter_count = 0
+        self._quantities = list(self.get_objective_values()) + list(self._cons)
+        self._set_name()
+        self._indep_list = list(self._designvars)
+
+        cases = list(self.options['generator'](self._designvars, self._problem().model))
+
+        keys = [None] * len(cases)
+        pending = list(range(len(cases)))
+        if self.checkpoint is not None:
+            for i, case in enumerate(cases):
+                self._set_case(case)
+                keys[i] = self.checkpoint.key()
+            pending = [i for i in pending if keys[i] not in self.checkpoint.entries]
+
+        # Finished cases wait here until all cases generated before them are recorded; cases
+        # in the checkpoint are finished from the start
+        finished = {i: (None, None, None) for i in set(range(len(cases))) - set(pending)}
+        self._record_finished(cases, keys, finished)
+        for i, result in self._run_cases(cases, pending):
+            # Checkpointed as soon as it finishes, as it may wait a while to be recorded
+            outputs, _, metadata = result
+            if self.checkpoint is not None and outputs is not None and metadata['success']:
+                self._problem().model._outputs.set_val(outputs)
+                self.checkpoint.add(keys[i])
+            finished[i] = result
+            self._record_finished(cases, keys, finished)
+
+        return False
+
+    def _record_finished(self, cases, keys, finished):
+        """Record the finished cases that are next in the generated order."""
+        while self.iter_count in finished:
+            i = self.iter_count
+            self._record_case(cases[i], keys[i], *finished.pop(i))
+            self.iter_count += 1
+
+    def _run_cases(self, cases, indices):
+        """
+        Run the cases at `indices`, retrying the cases whose worker process died.
+
+        Yields:
+            tuple: The index and result of each case, in order of completion.
+        """
+        attempts = [0] * len(cases)
+        pending = list(indices)
+
+        def pool_factory():
+            return model_worker_pool(*self.model_args, n_workers=1)
+
+        while pending:
+            crashed = []
+            runs = iter_isolated(
+                pool_factory, self.case_runner, [cases[i] for i in pending], self.options['n_workers']
+            )
+            for index, future in runs:
+                i = pending[index]
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    crashed.append(i)
+                else:
+                    yield i, result
+
+            # Only the case that a dead worker was running is charged an attempt
+            pending = []
+            for i in crashed:
+                attempts[i] += 1
+                if attempts[i] > self.options['max_retries']:
+                    yield i, (None, None, {
+                        'success': 0,
+                        'msg': f"Worker process terminated abruptly in {attempts[i]} attempts",
+                    })
+                else:
+                    pending.append(i)
+
+    def _get_recorder_metadata(self, case_name):
+        # Record whether each case succeeded, which om.DOEDriver leaves at the default
+        metadata = super()._get_recorder_metadata(case_name)
+        metadata.update(getattr(self, '_metadata', None) or {})
+        return metadata
+
+    def _set_case(self, case):
+        for name, value in case:
+            self.set_design_var(name, np.asarray(value).flatten())
+
+    def _record_case(self, case, key, outputs, inputs, metadata):
+        """Load the vectors of a finished case into the main model and record it."""
+        model = self._problem().model
+        self._set_case(case)
+        if metadata is None:
+            # Not run, as it is in the checkpoint
+            self.checkpoint.restore(key)
+            metadata = {'success': 1, 'msg': ''}
+        elif outputs is not None:
+            model._outputs.set_val(outputs)
+            model._inputs.set_val(inputs)
+        else:
+            # The worker died, so only the design variables of the case are known; the model
+            # still holds the values of the previous case otherwise
+            model._outputs.set_val(np.nan)
+            self._set_case(case)
+            model._transfer('nonlinear', 'fwd')
+
+        with RecordingDebugging(self._get_name(), self.iter_count, self):
+            with Recording('root._solve_nonlinear', model.iter_count, model):
+                pass
+            self._metadata = metadata
@@ -0,0 +1,176 @@
+"""
+Finite differencing of the driver's total derivatives across a local process pool.
+
+OpenMDAO finite differences the totals by evaluating the model once per perturbed design
+variable element, one after another. `ParallelFiniteDifference` instead sends the perturbed
+design points to a pool of worker processes, each holding its own set-up copy of the
+GreenHEART model, so the wall time of a gradient scales with the number of workers rather
+than the number of design variables. No MPI is needed.
+"""
+
+import os
+
+import numpy as np
+
+from new_greenheart.core.process_pool import get_worker_model, model_worker_pool
+
+
+def _evaluate_point(design_point):
+    """Run the worker model at a design point and return the unscaled responses."""
+    prob = get_worker_model().prob
+    for name, (value, units) in design_point.items():
+        prob.set_val(name, value, units=units)
+    prob.run_model()
+
+    driver = prob.driver
+    return {
+        **driver.get_objective_values(driver_scaling=False),
+        **driver.get_constraint_values(driver_scaling=False),
+    }
+
+
+class ParallelFiniteDifference(object):
+    """
+    Replace the total derivative computation of a driver with finite differences evaluated
+    across a local process pool.
+
+    The workers build their models from the same config file and overrides as the main
+    model, so inputs changed with `set_val` outside of the design variables are not seen by
+    the workers. The responses at the current design point are taken from the main model,
+    which the driver has just run.
+
+    Args:
+        config_file (str): Path to the top-level GreenHEART yaml file.
+        overrides (dict, optional): Overrides of the loaded configs. Defaults to None.
+        n_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        step (float, optional): Finite difference step size. Defaults to 1e-6.
+        form (str, optional): 'forward', 'backward', or 'central'. Defaults to 'forward'.
+        step_calc (str, optional): 'abs' for absolute steps, or any of OpenMDAO's relative
+            step calculations, e.g. 'rel', for steps relative to each design variable element.
+            Defaults to 'abs'.
+    """
+    def __init__(
+        self, config_file, overrides=None, n_workers=None, step=1e-6, form=None, step_calc=None
+    ):
+        self.config_file = os.path.abspath(config_file)
+        self.overrides = overrides
+        self.n_workers = n_workers or os.cpu_count()
+        self.step = step
+        self.form = form or 'forward'
+        self.step_calc = step_calc or 'abs'
+        if self.form not in ('forward', 'backward', 'central'):
+            raise ValueError(
+                f"Finite difference form must be 'forward', 'backward', or 'central', "
+                f"but '{self.form}' was given"
+            )
+
+        self.executor = None
+        self.n_evaluations = 0
+
+    def attach(self, driver):
+        """Compute the total derivatives of a driver with this object."""
+        self.driver = driver
+        driver._compute_totals = self.compute_totals
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def _get_executor(self):
+        # Workers are started on the first gradient, so models that are only run do not pay
+        # for them
+        if self.executor is None:
+            self.executor = model_worker_pool(self.config_file, self.overrides, self.n_workers)
+        return self.executor
+
+    def _steps(self, x):
+        if self.step_calc == 'abs':
+            return np.full(x.shape, float(self.step))
+        # The relative step of an element at zero falls back to the absolute step
+        return np.where(x != 0, self.step * np.abs(x), self.step)
+
+    def compute_totals(self, of=None, wrt=None, return_format='flat_dict', driver_scaling=True):
+        """
+        Compute the total derivatives of the driver's responses with respect to its design
+        variables, with the same arguments and return formats as `Driver._compute_totals`.
+        """
+        driver = self.driver
+        designvars = driver._designvars
+        responses = driver._responses
+        of = list(responses) if of is None else list(of)
+        wrt = list(designvars) if wrt is None else list(wrt)
+
+        x0 = driver.get_design_var_values(driver_scaling=False)
+        f0 = {
+            **driver.get_objective_values(driver_scaling=False),
+            **driver.get_constraint_values(driver_scaling=False),
+        }
+        x0 = {name: np.atleast_1d(np.asarray(x0[name], dtype=float)) for name in wrt}
+        f0 = {name: np.atleast_1d(np.asarray(f0[name], dtype=float)) for name in of}
+
+        if self.form == 'central':
+            directions = [1., -1.]
+        elif self.form == 'backward':
+            directions = [-1.]
+        else:
+            directions = [1.]
+
+        # One design point per perturbed element and direction, in a fixed order
+        points = []
+        columns = []
+        for name in wrt:
+            steps = self._steps(x0[name])
+            for i, step in enumerate(steps):
+                columns.append((name, i, step))
+                for direction in directions:
+                    design_point = {
+                        dv: (np.copy(x0[dv]), designvars[dv]['units']) for dv in wrt
+                    }
+                    design_point[name][0][i] += direction * step
+                    points.append(design_point)
+
+        results = list(self._get_executor().map(_evaluate_point, points))
+        self.n_evaluations += len(points)
+
+        of_sizes = [f0[name].size for name in of]
+        jac = np.zeros((sum(of_sizes), len(columns)))
+        for column, (_, _, step) in enumerate(columns):
+            evaluated = results[column * len(directions):(column + 1) * len(directions)]
+            values = [np.concatenate([np.ravel(result[name]) for name in of]) for result in evaluated]
+            if self.form == 'central':
+                jac[:, column] = (values[0] - values[1]) / (2 * step)
+            elif self.form == 'backward':
+                jac[:, column] = (np.concatenate([f0[name] for name in of]) - values[0]) / step
+            else:
+                jac[:, column] = (values[0] - np.concatenate([f0[name] for name in of])) / step
+
+        if driver_scaling:
+            of_scaler = np.concatenate([
+                _scaler(responses[name], size) for name, size in zip(of, of_sizes)
+            ])
+            wrt_scaler = np.concatenate([_scaler(designvars[name], x0[name].size) for name in wrt])
+            jac = of_scaler[:, np.newaxis] * jac / wrt_scaler[np.newaxis, :]
+
+        if return_format == 'array':
+            return jac
+
+        totals = {}
+        of_offsets = np.cumsum([0] + of_sizes)
+        wrt_offsets = np.cumsum([0] + [x0[name].size for name in wrt])
+        for i, of_name in enumerate(of):
+            for j, wrt_name in enumerate(wrt):
+                block = jac[of_offsets[i]:of_offsets[i + 1], wrt_offsets[j]:wrt_offsets[j + 1]]
+                if return_format == 'dict':
+                    totals.setdefault(of_name, {})[wrt_name] = block
+                else:
+                    totals[of_name, wrt_name] = block
+        return totals
+
+
+def _scaler(meta, size):
+    scaler = meta.get('total_scaler')
+    if scaler is None:
+        return np.ones(size)
+    return np.broadcast_to(np.asarray(scaler, dtype=float), (size,))
@@ -11,6 +11,8 @@ from typing import Optional, Union
 
 import openmdao.api as om
 
+from new_greenheart.core.parallel_doe import ProcessPoolDOEDriver
+
 class PoseOptimization(object):
     """This class contains a collection of methods for setting up an openmdao optimization problem for a greenheart simulation.
 
@@ -43,18 +45,13 @@ class PoseOptimization(object):
         """
         # Determine the number of design variables
         n_DV = 0
-        
-        if self.config['design_variables']["electrolyzer_rating_kw"]["flag"]:
-            n_DV += 1
-        if self.config['design_variables']["pv_capacity_kw"]["flag"]:
-            n_DV += 1
-        if self.config['design_variables']["wave_capacity_kw"]["flag"]:
-            n_DV += 1
-        if self.config['design_variables']["battery_capacity_kw"]["flag"]:
-            n_DV += 1
-        if self.config['design_variables']["battery_capacity_kwh"]["flag"]:
-            n_DV += 1
-        
+
+        # Design variables are grouped by technology, e.g. hopp.pv_capacity_kw, as in set_design_variables
+        for technology, variables in self.config['design_variables'].items():
+            for key, value in variables.items():
+                if value["flag"]:
+                    n_DV += 1
+
         # Wrap-up at end with multiplier for finite differencing
         if "form" in self.config["driver"]["optimization"].keys():
             if self.config["driver"]["optimization"]["form"] == "central": # TODO this should probably be handled at the MPI point to avoid confusion with n_DV being double what would be expected
@@ -78,6 +75,53 @@ class PoseOptimization(object):
 
         return  step_size
 
+    def _get_fd_options(self):
+        """Collect the finite difference step size, form, and step calculation from the driver config.
+
+        Returns:
+            dict: keyword arguments for the OpenMDAO finite difference approximation
+        """
+        opt_options = self.config["driver"]["optimization"]
+
+        if "step_calc" in opt_options.keys():
+            if opt_options["step_calc"] == "None":
+                step_calc = None
+            else:
+                step_calc = opt_options["step_calc"]
+        else:
+            step_calc = None
+
+        if "form" in opt_options.keys():
+            if opt_options["form"] == "None":
+                form = None
+            else:
+                form = opt_options["form"]
+        else:
+            form = None
+
+        return {"step": self._get_step_size(), "form": form, "step_calc": step_calc}
+
+    def approximate_partials(self, systems):
+        """Finite difference the systems that do not provide analytic partials.
+
+        Only used when the driver's `derivatives` option is 'partials'; otherwise the totals of the
+        whole model are finite differenced in set_driver and this method does nothing.
+
+        Args:
+            systems (list): OpenMDAO groups and components to finite difference. Must be called
+                before the problem is set up.
+        """
+        opt_options = self.config.get("driver", {}).get("optimization", {})
+        if not opt_options.get("flag") or opt_options.get("derivatives", "fd") != "partials":
+            return
+
+        fd_options = self._get_fd_options()
+        for system in systems:
+            if isinstance(system, om.Group):
+                system.approx_totals(method="fd", **fd_options)
+            else:
+                system.declare_partials("*", "*", method="fd", **fd_options)
+
     def _set_optimizer_properties(self, opt_prob, options_keys=[], opt_settings_keys=[], mapped_keys={}):
         """Set the optimizer properties, both the `driver.options` and
         `driver.opt_settings`. See OpenMDAO documentation on drivers
@@ -137,25 +181,16 @@ class PoseOptimization(object):
 
         if self.config["driver"]["optimization"]["flag"]:
             opt_options = self.config["driver"]["optimization"]
-            step_size = self._get_step_size()
 
-            if "step_calc" in opt_options.keys():
-                if opt_options["step_calc"] == "None":
-                    step_calc = None
-                else:
-                    step_calc = opt_options["step_calc"]
-            else:
-                step_calc = None
-
-            if "form" in opt_options.keys():
-                if opt_options["form"] == "None":
-                    form = None
-                else:
-                    form = opt_options["form"]
-            else:
-                form = None
-
-            opt_prob.model.approx_totals(method="fd", step=step_size, form=form, step_calc=step_calc)
+            # With 'partials', components with analytic partials provide them and only the
+            # systems passed to approximate_partials are finite differenced. With 'parallel_fd',
+            # the totals are finite differenced across a process pool instead, see
+            # ParallelFiniteDifference
+            parallel_fd = opt_options.get("parallel_fd", {}).get("flag", False)
+            if parallel_fd and opt_options.get("derivatives", "fd") != "fd":
+                raise ValueError("parallel_fd finite differences the totals, so it requires derivatives to be 'fd'")
+            if opt_options.get("derivatives", "fd") == "fd" and not parallel_fd:
+                opt_prob.model.approx_totals(method="fd", **self._get_fd_options())
 
             # Set optimization solver and options. First, Scipy's SLSQP and COBYLA
             if opt_options["solver"] in self.scipy_methods:
@@ -273,8 +308,16 @@ class PoseOptimization(object):
                 else:
                     raise Exception("The generator type {} is unsupported.".format(doe_options["generator"]))
 
-                # Initialize driver
-                opt_prob.driver = om.DOEDriver(generator)
+                # Initialize driver; a process pool runs the cases in parallel without MPI
+                process_pool = doe_options.get("process_pool", {})
+                if process_pool.get("flag", False):
+                    opt_prob.driver = ProcessPoolDOEDriver(
+                        generator,
+                        n_workers=process_pool.get("n_workers"),
+                        max_retries=process_pool.get("max_retries", 1),
+                    )
+                else:
+                    opt_prob.driver = om.DOEDriver(generator)
 
                 if doe_options["debug_print"]:
                     opt_prob.driver.options["debug_print"] = ["desvars", "ln_cons", "nl_cons", "objs"]
@@ -0,0 +1,106 @@
+"""
+Local process pools whose workers each hold a set-up copy of a GreenHEART model.
+
+Used to evaluate the finite-difference perturbations of a gradient and the cases of a design
+of experiments concurrently without MPI. Each worker builds its model once, from the same
+config file and overrides as the model of the main process, and then evaluates many points.
+"""
+
+import collections
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+
+# The GreenHEART model of a worker process, built once by its initializer
+_worker_model = None
+
+
+def _init_worker(config_file, overrides):
+    # Imported here to avoid a circular import with greenheart_model
+    from new_greenheart.core.greenheart_model import GreenHEARTModel
+
+    global _worker_model
+    _worker_model = GreenHEARTModel(config_file, overrides)
+
+    # The workers only evaluate points for the driver of the main process, which records them
+    _worker_model.driver_config.pop('recorder', None)
+    _worker_model.driver_config.pop('profile', None)
+    _worker_model.driver_config.get('driver', {}).pop('checkpoint', None)
+    _worker_model.driver_config.get('driver', {}).get('optimization', {}).pop('parallel_fd', None)
+    _worker_model.setup()
+    _worker_model.prob.final_setup()
+
+
+def get_worker_model():
+    """Return the GreenHEART model of the current worker process."""
+    if _worker_model is None:
+        raise RuntimeError("get_worker_model can only be called in a model worker process")
+    return _worker_model
+
+
+def model_worker_pool(config_file, overrides=None, n_workers=None):
+    """
+    Start a process pool whose workers each build and set up a GreenHEART model.
+
+    Workers are spawned rather than forked so that no state of the main process leaks into
+    them, so the functions submitted to the pool must be importable.
+
+    Args:
+        config_file (str): Path to the top-level GreenHEART yaml file.
+        overrides (dict, optional): Overrides of the loaded configs. Defaults to None.
+        n_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        ProcessPoolExecutor: The pool; call `get_worker_model` in the submitted functions.
+    """
+    return ProcessPoolExecutor(
+        max_workers=n_workers or os.cpu_count(),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(os.path.abspath(config_file), overrides),
+    )
+
+
+def iter_isolated(pool_factory, function, items, n_workers=None):
+    """
+    Run `function` on each item in parallel, isolating the items from worker crashes.
+
+    A worker process that dies, e.g. from a segfault in a compiled model, breaks its whole
+    pool and fails every item still in it. The items are therefore run on `n_workers`
+    single-worker pools that each run one item at a time, so a dead worker only fails the item
+    it was running with `BrokenProcessPool`. Its pool is then replaced by a new one. Pools are
+    reused for the next item otherwise, so a worker that builds a model builds it once.
+
+    Args:
+        pool_factory (callable): Returns a new `ProcessPoolExecutor` with one worker.
+        function (callable): Function submitted to the pools for each item.
+        items (list): Items to run.
+        n_workers (int, optional): Number of pools. Defaults to the number of CPUs.
+
+    Yields:
+        tuple: The index of each finished item and its future, in order of completion.
+    """
+    pending = collections.deque(enumerate(items))
+    n_workers = min(n_workers or os.cpu_count(), len(pending))
+    running = {}
+    idle = []
+    try:
+        while pending or running:
+            while pending and len(running) < n_workers:
+                pool = idle.pop() if idle else pool_factory()
+                index, item = pending.popleft()
+                running[pool.submit(function, item)] = (index, pool)
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, pool = running.pop(future)
+                if isinstance(future.exception(), BrokenProcessPool):
+                    pool.shutdown(wait=True)
+                else:
+                    idle.append(pool)
+                yield index, future
+    finally:
+        for pool in idle + [pool for _, pool in running.values()]:
+            pool.shutdown(wait=True, cancel_futures=True)
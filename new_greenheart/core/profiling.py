@@ -0,0 +1,172 @@
+"""
+Opt-in compute profiling for the components of a GreenHEART model.
+
+The profiler wraps the `compute` method of each component and records the wall time, the
+number of calls, the number of calls that actually changed the component's outputs, and
+optionally the peak memory allocated during a call. It is enabled through the `profile`
+section of the driver config and reports at the end of `GreenHEARTModel.run()`.
+"""
+
+import json
+import time
+import tracemalloc
+
+import numpy as np
+import openmdao.api as om
+
+
+class ComponentStats(object):
+    """Timing and call statistics for a single component."""
+    def __init__(self, pathname, class_name):
+        self.pathname = pathname
+        self.class_name = class_name
+        self.calls = 0
+        self.output_changes = 0
+        self.wall_time = 0.0
+        self.peak_memory = 0
+        self.last_outputs = None
+
+    def as_dict(self):
+        return {
+            'component': self.pathname,
+            'class': self.class_name,
+            'calls': self.calls,
+            'output_changes': self.output_changes,
+            'wall_time_s': self.wall_time,
+            'mean_time_s': self.wall_time / self.calls if self.calls else 0.0,
+            'peak_memory_bytes': self.peak_memory,
+        }
+
+
+class ComponentProfiler(object):
+    """
+    Collects compute statistics for the components of an OpenMDAO model.
+
+    Args:
+        track_memory (bool, optional): Record the peak memory allocated during each compute
+            call with `tracemalloc`. This slows down the run, so it is off by default.
+    """
+    def __init__(self, track_memory=False):
+        self.track_memory = track_memory
+        self.stats = {}
+        self.run_time = 0.0
+
+    def wrap_model(self, group):
+        """
+        Wrap every explicit component under `group`, skipping independent variable components.
+
+        Must be called after the problem has been set up.
+
+        Args:
+            group (om.Group): Group containing the components to profile.
+        """
+        for component in group.system_iter(recurse=True, typ=om.ExplicitComponent):
+            if isinstance(component, om.IndepVarComp):
+                continue
+            self.wrap(component)
+
+    def wrap(self, component):
+        """
+        Wrap the compute method of a single component.
+
+        Args:
+            component (om.ExplicitComponent): Component to profile.
+        """
+        if component.pathname in self.stats:
+            return
+
+        stats = self.stats[component.pathname] = ComponentStats(
+            component.pathname, type(component).__name__
+        )
+        compute = component.compute
+
+        def profiled_compute(inputs, outputs, *args):
+            if self.track_memory:
+                memory_before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+
+            start = time.perf_counter()
+            compute(inputs, outputs, *args)
+            stats.wall_time += time.perf_counter() - start
+            stats.calls += 1
+
+            if self.track_memory:
+                peak = tracemalloc.get_traced_memory()[1] - memory_before
+                stats.peak_memory = max(stats.peak_memory, peak)
+
+            new_outputs = outputs.asarray()
+            if stats.last_outputs is None or not np.array_equal(new_outputs, stats.last_outputs):
+                stats.output_changes += 1
+                stats.last_outputs = new_outputs.copy()
+
+        component.compute = profiled_compute
+
+    def start(self):
+        """Start timing a run."""
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._start_time = time.perf_counter()
+
+    def stop(self):
+        """Stop timing a run."""
+        self.run_time += time.perf_counter() - self._start_time
+        if self.track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def sorted_stats(self):
+        """Return the component statistics sorted by total wall time, largest first."""
+        return sorted(self.stats.values(), key=lambda s: s.wall_time, reverse=True)
+
+    def summary_table(self):
+        """
+        Build a text table of the component statistics.
+
+        The time not spent in any component compute, e.g. OpenMDAO framework and
+        finite-difference bookkeeping, is reported as overhead.
+
+        Returns:
+            str: The summary table.
+        """
+        total_component_time = sum(s.wall_time for s in self.stats.values())
+        header = (
+            f"{'component':<60} {'calls':>7} {'changed':>8} {'total [s]':>10} "
+            f"{'mean [ms]':>10} {'% run':>6}"
+        )
+        if self.track_memory:
+            header += f" {'peak [MiB]':>11}"
+        lines = ["Component compute profile", header, '-' * len(header)]
+
+        for stats in self.sorted_stats():
+            if stats.calls == 0:
+                continue
+            line = (
+                f"{stats.pathname:<60} {stats.calls:>7d} {stats.output_changes:>8d} "
+                f"{stats.wall_time:>10.3f} {1.e3 * stats.wall_time / stats.calls:>10.3f} "
+                f"{100. * stats.wall_time / max(self.run_time, 1.e-12):>6.1f}"
+            )
+            if self.track_memory:
+                line += f" {stats.peak_memory / 2**20:>11.2f}"
+            lines.append(line)
+
+        lines.append('-' * len(header))
+        lines.append(f"Total component compute time: {total_component_time:.3f} s")
+        lines.append(f"Overhead outside component compute: {self.run_time - total_component_time:.3f} s")
+        lines.append(f"Total run time: {self.run_time:.3f} s")
+        return '\n'.join(lines)
+
+    def as_dict(self):
+        return {
+            'run_time_s': self.run_time,
+            'track_memory': self.track_memory,
+            'components': [stats.as_dict() for stats in self.sorted_stats()],
+        }
+
+    def write_json(self, filename):
+        """
+        Write the component statistics to a JSON file.
+
+        Args:
+            filename (str): Path to the output file.
+        """
+        with open(filename, 'w') as f:
+            json.dump(self.as_dict(), f, indent=4)
@@ -0,0 +1,322 @@
+"""
+A column-oriented case recorder for long sweeps and the reader for its output.
+
+`om.SqliteRecorder` serializes every recorded variable of every case into one database row,
+so a sweep of thousands of cases over full time series produces a very large file that has
+to be scanned to extract a single variable. `ColumnRecorder` instead writes a directory
+with one column per variable and recording source. Each column is stored in chunks of
+`chunk_size` cases, one `.npy` file per chunk, so `ColumnCaseReader` can memory-map a single
+column across all cases without reading any other variable.
+
+Columns can be downcast per variable, e.g. time series to float32, and arrays can be
+reduced to summary statistics instead of being stored in full. The variables that are
+recorded are selected with the usual OpenMDAO recording options of the requester.
+
+Layout of the output directory::
+
+    meta.json                   columns, dtypes, shapes, and case counts of each source
+    <source id>/<column id>/000000.npy, 000001.npy, ...
+"""
+
+import fnmatch
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+from openmdao.core.driver import Driver
+from openmdao.core.problem import Problem
+from openmdao.core.system import System
+from openmdao.recorders.case_recorder import CaseRecorder
+from openmdao.solvers.solver import Solver
+
+
+# Increment when the layout of the output directory changes
+COLUMN_FORMAT_VERSION = 1
+
+SUMMARY_STATISTICS = {
+    'min': np.min,
+    'max': np.max,
+    'mean': np.mean,
+    'sum': np.sum,
+}
+
+
+def _requester_system(recording_requester):
+    if isinstance(recording_requester, Driver):
+        return recording_requester._problem().model
+    if isinstance(recording_requester, Problem):
+        return recording_requester.model
+    if isinstance(recording_requester, Solver):
+        return recording_requester._system()
+    return recording_requester
+
+
+def _source_name(recording_requester):
+    if isinstance(recording_requester, Driver):
+        return 'driver'
+    if isinstance(recording_requester, Problem):
+        return 'problem'
+    if isinstance(recording_requester, System):
+        return recording_requester.pathname or 'root'
+    if isinstance(recording_requester, Solver):
+        return recording_requester._system().pathname + '.' + recording_requester.SOLVER
+    raise ValueError(f"Cannot record cases of {recording_requester}")
+
+
+class ColumnRecorder(CaseRecorder):
+    """
+    Record cases column by column, in chunks of `.npy` files.
+
+    Every recorded input and output becomes a column holding its value in each case of a
+    recording source (the driver, a system, a solver, or the problem). The success flag of
+    each case is stored in the `_success` column and its iteration coordinate in `meta.json`.
+
+    Args:
+        path (str): Output directory. A bare directory name is placed in the outputs
+            directory of the problem, as for `om.SqliteRecorder`.
+        dtypes (dict, optional): Dtypes that variables are stored with, keyed by a glob
+            pattern of the variable name, e.g. {'*electricity*': 'float32'}. The first
+            matching pattern applies. Unmatched variables keep their dtype. Defaults to None.
+        summary_only (bool, optional): Store only the min, max, mean, and sum of array
+            variables, in the columns '<name>:min' etc. Scalars are stored in full.
+            Defaults to False.
+        chunk_size (int, optional): Number of cases per chunk file. Defaults to 256.
+    """
+    def __init__(self, path, dtypes=None, summary_only=False, chunk_size=256):
+        super().__init__(record_viewer_data=False)
+        self.path = str(path)
+        self.dtypes = dict(dtypes or {})
+        self.summary_only = summary_only
+        self.chunk_size = int(chunk_size)
+        if self.chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, but {chunk_size} was given")
+
+        self._use_outputs_dir = not (os.path.sep in self.path or '/' in self.path)
+        self._initialized = False
+        self._sources = {}
+
+    def startup(self, recording_requester, comm=None):
+        """Prepare the output directory the first time any requester starts a run."""
+        super().startup(recording_requester, comm)
+        if self._initialized:
+            return
+
+        if self._use_outputs_dir:
+            system = _requester_system(recording_requester)
+            self.path = str(system.get_outputs_dir(mkdir=True) / self.path)
+
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path)
+        os.makedirs(self.path)
+        self._initialized = True
+
+    def _dtype(self, name, value):
+        for pattern, dtype in self.dtypes.items():
+            if fnmatch.fnmatchcase(name, pattern):
+                return np.dtype(dtype)
+        return value.dtype
+
+    def _columns(self, data):
+        """Yield the column names and values of the recorded variables of a case."""
+        for io in ('output', 'input'):
+            for name, value in (data.get(io) or {}).items():
+                if value is None:
+                    continue
+                value = np.asarray(value)
+                dtype = self._dtype(name, value)
+                if self.summary_only and value.size > 1:
+                    for statistic, func in SUMMARY_STATISTICS.items():
+                        yield f'{name}:{statistic}', func(value).astype(dtype)
+                else:
+                    yield name, value.astype(dtype, copy=True)
+
+    def _record(self, recording_requester, data, metadata):
+        name = _source_name(recording_requester)
+        source = self._sources.get(name)
+        if source is None:
+            source = self._sources[name] = {
+                'directory': f's{len(self._sources):03d}',
+                'n_cases': 0,
+                'n_chunks': 0,
+                'columns': {},
+                'iteration_coordinates': [],
+                'buffer': {},
+            }
+
+        row = dict(self._columns(data))
+        row['_success'] = np.int8((metadata or {}).get('success', 1))
+
+        columns = source['columns']
+        if source['n_cases'] == 0:
+            for column, value in row.items():
+                columns[column] = {
+                    'id': f'c{len(columns):05d}',
+                    'dtype': value.dtype.str,
+                    'shape': list(value.shape),
+                }
+        elif row.keys() != columns.keys():
+            raise ValueError(
+                f"Case {source['n_cases']} of '{name}' records different variables than its "
+                "earlier cases. Every case of a source must record the same variables."
+            )
+
+        buffer = source['buffer']
+        for column, value in row.items():
+            buffer.setdefault(column, []).append(value)
+
+        source['iteration_coordinates'].append(self._iteration_coordinate)
+        source['n_cases'] += 1
+        if len(buffer['_success']) >= self.chunk_size:
+            self._flush(source)
+
+    def _flush(self, source):
+        """Write the buffered cases of a source as the next chunk of each column."""
+        buffer = source['buffer']
+        if not buffer.get('_success'):
+            return
+
+        for column, meta in source['columns'].items():
+            directory = os.path.join(self.path, source['directory'], meta['id'])
+            os.makedirs(directory, exist_ok=True)
+            values = np.asarray(buffer[column], dtype=np.dtype(meta['dtype']))
+            np.save(os.path.join(directory, f"{source['n_chunks']:06d}.npy"), values)
+
+        source['n_chunks'] += 1
+        source['buffer'] = {}
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {
+            'version': COLUMN_FORMAT_VERSION,
+            'sources': {
+                name: {
+                    key: value for key, value in source.items() if key != 'buffer'
+                }
+                for name, source in self._sources.items()
+            },
+        }
+        # Written atomically so that a reader of a running sweep never sees a partial file
+        tmp_file = os.path.join(self.path, 'meta.json.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_file, os.path.join(self.path, 'meta.json'))
+
+    def record_iteration_driver(self, recording_requester, data, metadata):
+        """Record the variables of a driver iteration."""
+        self._record(recording_requester, data, metadata)
+
+    def record_iteration_system(self, recording_requester, data, metadata):
+        """Record the variables of a system iteration."""
+        self._record(recording_requester, data, metadata)
+
+    def record_iteration_solver(self, recording_requester, data, metadata):
+        """Record the variables of a solver iteration."""
+        self._record(recording_requester, data, metadata)
+
+    def record_iteration_problem(self, recording_requester, data, metadata):
+        """Record the variables of a problem case."""
+        self._record(recording_requester, data, metadata)
+
+    def record_metadata_system(self, system, run_number=None):
+        """System metadata is not recorded."""
+        pass
+
+    def record_metadata_solver(self, solver, run_number=None):
+        """Solver metadata is not recorded."""
+        pass
+
+    def record_derivatives_driver(self, recording_requester, data, metadata):
+        """Derivatives are not recorded."""
+        pass
+
+    def record_viewer_data(self, model_viewer_data):
+        """Viewer data is not recorded."""
+        pass
+
+    def flush(self):
+        """Write the buffered cases of every source, so that they can be read."""
+        for source in self._sources.values():
+            self._flush(source)
+
+    def shutdown(self):
+        """Write the remaining buffered cases."""
+        self.flush()
+
+
+class ColumnCaseReader(object):
+    """
+    Read the columns written by a `ColumnRecorder`.
+
+    Args:
+        path (str): Output directory of the recorder.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / 'meta.json') as f:
+            meta = json.load(f)
+        if meta['version'] != COLUMN_FORMAT_VERSION:
+            raise ValueError(
+                f"{path} was written in column format version {meta['version']}, but version "
+                f"{COLUMN_FORMAT_VERSION} is supported"
+            )
+        self.sources = meta['sources']
+
+    def _source(self, source):
+        if source is None:
+            if len(self.sources) != 1:
+                raise ValueError(
+                    f"The recording has the sources {sorted(self.sources)}, so one must be given"
+                )
+            source = next(iter(self.sources))
+        if source not in self.sources:
+            raise KeyError(f"No cases were recorded by '{source}'")
+        return self.sources[source]
+
+    def list_sources(self):
+        """Return the names of the recorded sources."""
+        return list(self.sources)
+
+    def list_columns(self, source=None):
+        """Return the column names of a source."""
+        return list(self._source(source)['columns'])
+
+    def num_cases(self, source=None):
+        """Return the number of cases recorded by a source."""
+        return self._source(source)['n_cases']
+
+    def iteration_coordinates(self, source=None):
+        """Return the iteration coordinate of each case of a source."""
+        return list(self._source(source)['iteration_coordinates'])
+
+    def get_column(self, name, source=None, mmap=True):
+        """
+        Read a column across all cases of a source.
+
+        Args:
+            name (str): Column name, i.e. the variable name, or '<name>:<statistic>' for
+                summary columns.
+            source (str, optional): Recording source, e.g. 'driver' or 'root'. May be
+                omitted if there is only one. Defaults to None.
+            mmap (bool, optional): Memory-map the chunks instead of reading them. A column
+                of a single chunk is then returned as a read-only memory map. Defaults to True.
+
+        Returns:
+            np.ndarray: The values, with the case index as the first axis.
+        """
+        source = self._source(source)
+        if name not in source['columns']:
+            raise KeyError(f"'{name}' is not a recorded column")
+        meta = source['columns'][name]
+
+        directory = self.path / source['directory'] / meta['id']
+        chunks = [
+            np.load(directory / f'{i:06d}.npy', mmap_mode='r' if mmap else None)
+            for i in range(source['n_chunks'])
+        ]
+        if not chunks:
+            return np.empty([0] + meta['shape'], dtype=np.dtype(meta['dtype']))
+        if len(chunks) == 1:
+            return chunks[0]
+        return np.concatenate(chunks)
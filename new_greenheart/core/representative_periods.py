@@ -0,0 +1,171 @@
+"""
+Representative-period reduction of the time series passed between technologies.
+
+The annual profiles produced by the source technologies, e.g. wind, HOPP, or the feedstocks,
+are split into periods of a fixed length, e.g. days or weeks, which are clustered with k-means.
+The period closest to the center of each cluster represents the whole cluster, weighted by the
+number of periods in it. The downstream technologies then simulate only the representative
+periods, in chronological order, and annual totals are reconstructed from the weights with
+`annual_sum` and `annual_mean`.
+"""
+
+import numpy as np
+import openmdao.api as om
+from scipy.cluster.vq import kmeans2
+
+from new_greenheart.core.utilities import (
+    HOURS_PER_YEAR,
+    get_dt_hours,
+    get_n_scenarios,
+    get_n_timesteps,
+)
+
+
+def select_representative_periods(profiles, n_periods, period_hours, seed=0):
+    """
+    Cluster the periods of one or more annual profiles and select one period per cluster.
+
+    Args:
+        profiles (list of np.ndarray): Time series, each with time as its last axis. Each is
+            scaled by its largest magnitude so that all profiles weigh equally.
+        n_periods (int): Number of representative periods.
+        period_hours (int): Number of time steps in a period.
+        seed (int, optional): Seed of the k-means initialization. Defaults to 0.
+
+    Returns:
+        tuple: The indices of the representative periods in chronological order, and the
+            number of periods of the full series each of them represents. Time steps after the
+            last full period are represented proportionally.
+    """
+    n_timesteps = np.shape(profiles[0])[-1]
+    n_full_periods = n_timesteps // period_hours
+    if not 0 < n_periods <= n_full_periods:
+        raise ValueError(
+            f"The number of representative periods must be between 1 and {n_full_periods}, "
+            f"but {n_periods} was given"
+        )
+
+    features = []
+    for profile in profiles:
+        profile = np.asarray(profile, dtype=float)
+        scale = np.max(np.abs(profile))
+        periods = profile[..., :n_full_periods * period_hours] / (scale if scale > 0 else 1.)
+        # Each scenario of a batched profile is a separate set of features of each period
+        periods = periods.reshape(-1, n_full_periods, period_hours)
+        features.append(np.concatenate(periods, axis=1))
+    features = np.concatenate(features, axis=1)
+
+    centroids, labels = kmeans2(features, n_periods, seed=seed, minit='++')
+
+    representatives = []
+    counts = []
+    for cluster, centroid in enumerate(centroids):
+        members = np.flatnonzero(labels == cluster)
+        if len(members) == 0:
+            continue
+        distance = np.sum((features[members] - centroid) ** 2, axis=1)
+        representatives.append(members[np.argmin(distance)])
+        counts.append(len(members))
+
+    order = np.argsort(representatives)
+    weights = np.array(counts, dtype=float)[order] * n_timesteps / (n_full_periods * period_hours)
+    return np.array(representatives)[order], weights
+
+
+def get_representative_periods(plant_config):
+    """
+    Return the representative periods config of a plant if the reduction is enabled and the
+    periods have been selected, else None.
+    """
+    config = plant_config.get('plant', {}).get('representative_periods', {})
+    if not config.get('flag', False) or 'periods' not in config:
+        return None
+    return config
+
+
+def get_timestep_weights(plant_config):
+    """
+    Number of time steps of the full year that each simulated time step represents, or None
+    when the full year is simulated.
+    """
+    config = get_representative_periods(plant_config)
+    if config is None:
+        return None
+    return np.repeat(config['weights'], config['period_hours'])
+
+
+def annual_sum(values, plant_config):
+    """
+    Total over a year of a time series of hourly rates, e.g. kg/h to kg/year, with time as its
+    last axis. The simulated horizon of `n_timesteps` time steps is scaled to a year.
+    """
+    weights = get_timestep_weights(plant_config)
+    if weights is not None:
+        values = values * weights
+    return np.sum(values, axis=-1) * HOURS_PER_YEAR / get_n_timesteps(plant_config)
+
+
+def annual_mean(values, plant_config):
+    """Average a time series, with time as its last axis, over the year."""
+    weights = get_timestep_weights(plant_config)
+    if weights is None:
+        return np.mean(values, axis=-1)
+    return np.average(values, axis=-1, weights=weights)
+
+
+def annualization_factor(values, plant_config):
+    """
+    Ratio of the annual total of a time series of hourly rates, with time as its last axis, to
+    its total over the simulated time steps. Series that sum to zero use the ratio of a year to
+    the simulated horizon.
+    """
+    dt_hours = get_dt_hours(plant_config)
+    simulated = np.sum(values, axis=-1) * dt_hours
+    return np.divide(
+        annual_sum(values, plant_config),
+        simulated,
+        out=np.full(np.shape(simulated), HOURS_PER_YEAR / (get_n_timesteps(plant_config) * dt_hours)),
+        where=simulated != 0,
+    )
+
+
+class RepresentativePeriodComp(om.ExplicitComponent):
+    """
+    Select the time steps of the representative periods from a full-year time series.
+
+    Placed between a source technology and the transport component that carries its time
+    series, so that every technology downstream simulates the representative periods only.
+    """
+    def initialize(self):
+        self.options.declare('plant_config', types=dict)
+        self.options.declare('commodity', types=str)
+
+    def setup(self):
+        config = get_representative_periods(self.options['plant_config'])
+        period_hours = config['period_hours']
+        self.timesteps = (
+            np.asarray(config['periods'])[:, np.newaxis] * period_hours + np.arange(period_hours)
+        ).ravel()
+
+        commodity = self.options['commodity']
+        self.add_input(f'{commodity}_input', val=0.0, shape_by_conn=True, units_by_conn=True)
+        self.add_output(
+            f'{commodity}_output',
+            val=0.0,
+            compute_shape=lambda shapes: (*shapes[f'{commodity}_input'][:-1], len(self.timesteps)),
+            copy_units=f'{commodity}_input',
+        )
+
+    def setup_partials(self):
+        commodity = self.options['commodity']
+        n_rows = get_n_scenarios(self.options['plant_config'])
+        n_full = self._var_rel2meta[f'{commodity}_input']['size'] // n_rows
+        rows = np.arange(n_rows * len(self.timesteps))
+        cols = (np.arange(n_rows)[:, np.newaxis] * n_full + self.timesteps).ravel()
+        self.declare_partials(
+            f'{commodity}_output', f'{commodity}_input', rows=rows, cols=cols, val=1.0
+        )
+
+    def compute(self, inputs, outputs):
+        commodity = self.options['commodity']
+        outputs[f'{commodity}_output'] = inputs[f'{commodity}_input'][..., self.timesteps]
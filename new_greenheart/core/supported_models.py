@@ -1,63 +1,120 @@
-from new_greenheart.converters.wind.dummy_wind_turbine import DummyPlantPerformance, DummyPlantCost
-from new_greenheart.converters.hydrogen.dummy_electrolyzer import DummyElectrolyzerPerformanceModel, DummyElectrolyzerCostModel
-from new_greenheart.transporters.cable import CablePerformanceModel
-from new_greenheart.transporters.pipe import PipePerformanceModel
-from new_greenheart.transporters.power_combiner import CombinerPerformanceModel
-from new_greenheart.converters.wind.wind_plant import WindPlantPerformanceModel, WindPlantCostModel
-from new_greenheart.converters.hydrogen.pem_electrolyzer import ElectrolyzerPerformanceModel, ElectrolyzerCostModel, ElectrolyzerFinanceModel
-from new_greenheart.converters.hydrogen.eco_tools_pem_electrolyzer import ECOElectrolyzerPerformanceModel, ECOElectrolyzerCostModel
-from new_greenheart.converters.hopp.hopp_wrapper import HOPPComponent
-from new_greenheart.converters.desalination.desalination import ReverseOsmosisPerformanceModel, ReverseOsmosisCostModel
-from new_greenheart.converters.ammonia.ammonia_baseclass import AmmoniaPerformanceModel, AmmoniaCostModel
-from new_greenheart.converters.steel.steel import SteelPerformanceModel, SteelCostAndFinancialModel
-from new_greenheart.storage.hydrogen.tank_baseclass import HydrogenTankPerformanceModel, HydrogenTankCostModel
-from new_greenheart.storage.hydrogen.eco_storage import H2Storage
-from new_greenheart.converters.wind.wind_plant_pysam import PYSAMWindPlantPerformanceModel
-from new_greenheart.converters.solar.solar_pysam import PYSAMSolarPlantPerformanceModel
-
-
-supported_models = {
+import importlib
+from collections.abc import MutableMapping
+
+
+class ModelRegistry(MutableMapping):
+    """
+    A lazy mapping from model names to OpenMDAO component classes.
+
+    Each model is registered with an import path of the form 'package.module:ClassName' and
+    its module is only imported the first time the model is looked up. This keeps heavy
+    dependencies such as HOPP, FLORIS, PySAM, ORBIT, and ProFAST out of the import path of a
+    run whose `tech_config` does not reference them.
+
+    Third-party models are registered the same way, either with an import path or with the
+    class itself:
+
+        supported_models['my_wind_performance'] = 'my_package.wind:MyWindPerformanceModel'
+        supported_models.register('my_wind_cost', MyWindCostModel)
+    """
+    def __init__(self, model_paths=None):
+        self._model_paths = {}
+        self._models = {}
+        for name, model in (model_paths or {}).items():
+            self.register(name, model)
+
+    def register(self, name, model):
+        """
+        Register a model under the given name.
+
+        Args:
+            name (str): Name used to reference the model in the tech_config.
+            model (str or type): Import path of the form 'package.module:ClassName', or the
+                model class itself.
+        """
+        if isinstance(model, str):
+            if ':' not in model:
+                raise ValueError(
+                    f"Model path '{model}' for '{name}' must be of the form 'package.module:ClassName'"
+                )
+            self._model_paths[name] = model
+            self._models.pop(name, None)
+        else:
+            self._model_paths[name] = f'{model.__module__}:{model.__qualname__}'
+            self._models[name] = model
+
+    def model_path(self, name):
+        """Return the import path of a registered model without importing it."""
+        return self._model_paths[name]
+
+    def __getitem__(self, name):
+        if name not in self._models:
+            module_name, class_name = self._model_paths[name].split(':')
+            module = importlib.import_module(module_name)
+            self._models[name] = getattr(module, class_name)
+        return self._models[name]
+
+    def __setitem__(self, name, model):
+        self.register(name, model)
+
+    def __delitem__(self, name):
+        del self._model_paths[name]
+        self._models.pop(name, None)
+
+    def __iter__(self):
+        return iter(self._model_paths)
+
+    def __len__(self):
+        return len(self._model_paths)
+
+    def __contains__(self, name):
+        return name in self._model_paths
+
+
+supported_models = ModelRegistry({
     # Converters
-    'dummy_wind_turbine_performance': DummyPlantPerformance,
-    'dummy_wind_turbine_cost': DummyPlantCost,    
+    'dummy_wind_turbine_performance': 'new_greenheart.converters.wind.dummy_wind_turbine:DummyPlantPerformance',
+    'dummy_wind_turbine_cost': 'new_greenheart.converters.wind.dummy_wind_turbine:DummyPlantCost',
 
-    'dummy_electrolyzer_performance': DummyElectrolyzerPerformanceModel,
-    'dummy_electrolyzer_cost': DummyElectrolyzerCostModel,
+    'dummy_electrolyzer_performance': 'new_greenheart.converters.hydrogen.dummy_electrolyzer:DummyElectrolyzerPerformanceModel',
+    'dummy_electrolyzer_cost': 'new_greenheart.converters.hydrogen.dummy_electrolyzer:DummyElectrolyzerCostModel',
 
-    'wind_plant_performance': WindPlantPerformanceModel,
-    'wind_plant_cost': WindPlantCostModel,
+    'wind_plant_performance': 'new_greenheart.converters.wind.wind_plant:WindPlantPerformanceModel',
+    'wind_plant_cost': 'new_greenheart.converters.wind.wind_plant:WindPlantCostModel',
 
-    'pysam_wind_plant_performance' : PYSAMWindPlantPerformanceModel,
+    'pysam_wind_plant_performance': 'new_greenheart.converters.wind.wind_plant_pysam:PYSAMWindPlantPerformanceModel',
 
-    'pysam_solar_plant_performance' : PYSAMSolarPlantPerformanceModel,
+    'pysam_solar_plant_performance': 'new_greenheart.converters.solar.solar_pysam:PYSAMSolarPlantPerformanceModel',
 
-    'pem_electrolyzer_performance': ElectrolyzerPerformanceModel,
-    'pem_electrolyzer_cost': ElectrolyzerCostModel,
-    'pem_electrolyzer_financial': ElectrolyzerFinanceModel,
+    'pem_electrolyzer_performance': 'new_greenheart.converters.hydrogen.pem_electrolyzer:ElectrolyzerPerformanceModel',
+    'vectorized_pem_electrolyzer_performance': 'new_greenheart.converters.hydrogen.vectorized_pem_electrolyzer:VectorizedElectrolyzerPerformanceModel',
+    'pem_electrolyzer_cost': 'new_greenheart.converters.hydrogen.pem_electrolyzer:ElectrolyzerCostModel',
+    'pem_electrolyzer_financial': 'new_greenheart.converters.hydrogen.pem_electrolyzer:ElectrolyzerFinanceModel',
 
-    'eco_pem_electrolyzer_performance': ECOElectrolyzerPerformanceModel,
-    'eco_pem_electrolyzer_cost': ECOElectrolyzerCostModel,
+    'eco_pem_electrolyzer_performance': 'new_greenheart.converters.hydrogen.eco_tools_pem_electrolyzer:ECOElectrolyzerPerformanceModel',
+    'vectorized_eco_pem_electrolyzer_performance': 'new_greenheart.converters.hydrogen.vectorized_pem_electrolyzer:VectorizedECOElectrolyzerPerformanceModel',
+    'eco_pem_electrolyzer_cost': 'new_greenheart.converters.hydrogen.eco_tools_pem_electrolyzer:ECOElectrolyzerCostModel',
 
-    'h2_storage': H2Storage,
+    'h2_storage': 'new_greenheart.storage.hydrogen.eco_storage:H2Storage',
 
-    'hopp': HOPPComponent,
+    'hopp': 'new_greenheart.converters.hopp.hopp_wrapper:HOPPComponent',
 
-    'reverse_osmosis_desalination_performance': ReverseOsmosisPerformanceModel,
-    'reverse_osmosis_desalination_cost': ReverseOsmosisCostModel,
+    'reverse_osmosis_desalination_performance': 'new_greenheart.converters.desalination.desalination:ReverseOsmosisPerformanceModel',
+    'reverse_osmosis_desalination_cost': 'new_greenheart.converters.desalination.desalination:ReverseOsmosisCostModel',
 
-    'ammonia_performance': AmmoniaPerformanceModel,
-    'ammonia_cost': AmmoniaCostModel,
+    'ammonia_performance': 'new_greenheart.converters.ammonia.ammonia_baseclass:AmmoniaPerformanceModel',
+    'ammonia_cost': 'new_greenheart.converters.ammonia.ammonia_baseclass:AmmoniaCostModel',
 
-    'steel_performance': SteelPerformanceModel,
-    'steel_cost': SteelCostAndFinancialModel,
+    'steel_performance': 'new_greenheart.converters.steel.steel:SteelPerformanceModel',
+    'steel_cost': 'new_greenheart.converters.steel.steel:SteelCostAndFinancialModel',
 
     # Transport
-    'cable': CablePerformanceModel,
-    'pipe': PipePerformanceModel,
-    'combiner_performance': CombinerPerformanceModel,
+    'cable': 'new_greenheart.transporters.cable:CablePerformanceModel',
+    'pipe': 'new_greenheart.transporters.pipe:PipePerformanceModel',
+    'combiner_performance': 'new_greenheart.transporters.power_combiner:CombinerPerformanceModel',
 
     # Storage
-    'hydrogen_tank_performance': HydrogenTankPerformanceModel,
-    'hydrogen_tank_cost': HydrogenTankCostModel,
+    'hydrogen_tank_performance': 'new_greenheart.storage.hydrogen.tank_baseclass:HydrogenTankPerformanceModel',
+    'hydrogen_tank_cost': 'new_greenheart.storage.hydrogen.tank_baseclass:HydrogenTankCostModel',
 
-}
\ No newline at end of file
+})
@@ -0,0 +1,286 @@
+"""
+Surrogates that stand in for expensive technology models.
+
+Any model in `supported_models` can be replaced by a quadratic response surface of its outputs
+in a few declared inputs by adding a `surrogate` section to its `performance_model` or
+`cost_model` config. The surrogate is trained from a Latin hypercube design of experiments
+over the declared input bounds the first time the model is computed, using the current values
+of all other inputs, and is then saved to disk together with its validation error on a
+separate set of samples. Later runs with the same configuration load the saved surrogate
+instead of training it again.
+
+A compute call is answered by the surrogate when every declared input is within its bounds and
+every other input still has the value the surrogate was trained with; otherwise the real model
+is computed.
+"""
+
+import functools
+import os
+
+import numpy as np
+from scipy.stats import qmc
+
+from new_greenheart.core.cache import canonical_key
+from new_greenheart.core.utilities import get_n_scenarios
+
+
+class QuadraticResponseSurface(object):
+    """
+    A full quadratic polynomial of the inputs, fitted by least squares to any number of outputs.
+
+    The inputs are scaled to [-1, 1] over their bounds before the polynomial is evaluated.
+
+    Args:
+        lower (array_like): Lower bound of each input.
+        upper (array_like): Upper bound of each input.
+    """
+    def __init__(self, lower, upper):
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        self.coefficients = None
+
+        n_inputs = len(self.lower)
+        self.pairs = np.array(
+            [(i, j) for i in range(n_inputs) for j in range(i, n_inputs)], dtype=int
+        ).reshape(-1, 2)
+
+    @property
+    def n_terms(self):
+        return 1 + len(self.lower) + len(self.pairs)
+
+    def features(self, x):
+        """Polynomial terms of the inputs `x`, shaped (samples, inputs)."""
+        x = np.atleast_2d(x)
+        scaled = 2. * (x - self.lower) / (self.upper - self.lower) - 1.
+        return np.hstack([
+            np.ones((len(x), 1)),
+            scaled,
+            scaled[:, self.pairs[:, 0]] * scaled[:, self.pairs[:, 1]],
+        ])
+
+    def fit(self, x, y):
+        """
+        Fit the coefficients to the samples `x`, shaped (samples, inputs), and the responses
+        `y`, shaped (samples, outputs).
+        """
+        self.coefficients, *_ = np.linalg.lstsq(self.features(x), y, rcond=None)
+        return self
+
+    def predict(self, x):
+        return self.features(x) @ self.coefficients
+
+
+def latin_hypercube(lower, upper, n_samples, seed=None):
+    sampler = qmc.LatinHypercube(d=len(lower), seed=seed)
+    return qmc.scale(sampler.random(n_samples), lower, upper)
+
+
+class SurrogateMixin(object):
+    """
+    Answers compute calls of an OpenMDAO component with a quadratic response surface.
+
+    Mixed into a technology model by `surrogate_model`, so the surrogate has exactly the inputs
+    and outputs of the model it replaces. The `surrogate_config` option holds the settings:
+
+    - `inputs`: dict of the declared inputs with their `lower` and `upper` bounds.
+    - `outputs`: list of the outputs to fit. Defaults to every output; the others keep the
+      value from the last real compute.
+    - `file`: path of the saved surrogate. Defaults to None, i.e. the surrogate is not saved.
+    - `n_samples`: size of the training design. Defaults to twice the number of polynomial
+      terms.
+    - `n_validation`: number of validation samples. Defaults to 10.
+    - `seed`: seed of the Latin hypercube designs. Defaults to 0.
+    - `verbose`: print the validation error when the surrogate is trained or loaded. Defaults
+      to False; the error is also available from `surrogate_summary`.
+    """
+    def initialize(self):
+        super().initialize()
+        self.options.declare('surrogate_config', types=dict)
+
+    def setup(self):
+        super().setup()
+        config = self.options['surrogate_config']
+        self.surrogate_inputs = list(config['inputs'])
+        self.surrogate_lower = np.array([config['inputs'][name]['lower'] for name in self.surrogate_inputs], dtype=float)
+        self.surrogate_upper = np.array([config['inputs'][name]['upper'] for name in self.surrogate_inputs], dtype=float)
+        self.surrogate = None
+        self.surrogate_stats = {'surrogate': 0, 'model': 0}
+
+    def _surrogate_key(self, inputs):
+        # The surrogate is only valid for the configuration and the fixed inputs it was trained with
+        fixed_inputs = {
+            name: np.asarray(value) for name, value in inputs.items()
+            if name not in self.surrogate_inputs
+        }
+        return canonical_key({
+            'model': f'{self.model_class.__module__}:{self.model_class.__qualname__}',
+            'tech_config': self.options['tech_config'],
+            'plant_config': self.options['plant_config'],
+            'surrogate_config': {
+                key: value for key, value in self.options['surrogate_config'].items()
+                if key != 'verbose'
+            },
+            'fixed_inputs': fixed_inputs,
+        })
+
+    def _scenario_inputs(self, inputs):
+        """Values of the declared inputs, shaped (scenarios, declared inputs)."""
+        n_scenarios = get_n_scenarios(self.options['plant_config'])
+        values = []
+        for name in self.surrogate_inputs:
+            value = np.ravel(inputs[name])
+            if value.size not in (1, n_scenarios):
+                raise ValueError(
+                    f"Surrogate input '{name}' must be a scalar or have one value per scenario"
+                )
+            values.append(np.broadcast_to(value, n_scenarios))
+        return np.stack(values, axis=1)
+
+    def _evaluate_model(self, inputs, outputs, x):
+        """Compute the real model with every scenario at the declared inputs `x`."""
+        sample_inputs = {name: np.array(value) for name, value in inputs.items()}
+        for name, value in zip(self.surrogate_inputs, x):
+            sample_inputs[name] = np.full_like(sample_inputs[name], value)
+        sample_outputs = {name: np.array(value) for name, value in outputs.items()}
+        super().compute(sample_inputs, sample_outputs)
+        return np.concatenate([
+            np.reshape(sample_outputs[name], (self.n_surrogate_scenarios, -1))
+            for name in self.surrogate_outputs
+        ], axis=1)
+
+    def train_surrogate(self, inputs, outputs):
+        """
+        Fit the surrogate to the real model and compute its validation error.
+
+        Returns:
+            dict: The fitted coefficients and the description of the surrogate.
+        """
+        config = self.options['surrogate_config']
+        response_surface = QuadraticResponseSurface(self.surrogate_lower, self.surrogate_upper)
+        n_samples = config.get('n_samples') or 2 * response_surface.n_terms
+        n_validation = config.get('n_validation', 10)
+        seed = config.get('seed', 0)
+
+        x_train = latin_hypercube(self.surrogate_lower, self.surrogate_upper, n_samples, seed)
+        y_train = np.stack([self._evaluate_model(inputs, outputs, x) for x in x_train])
+        response_surface.fit(x_train, y_train.reshape(n_samples, -1))
+
+        # The error is scaled by the range of each output over the training samples
+        output_range = np.ptp(y_train, axis=0).ravel()
+        scale = np.where(output_range > 0, output_range, 1.)
+        validation_error = {'rms': 0., 'max': 0.}
+        if n_validation > 0:
+            x_valid = latin_hypercube(
+                self.surrogate_lower, self.surrogate_upper, n_validation, seed + 1
+            )
+            y_valid = np.stack([self._evaluate_model(inputs, outputs, x) for x in x_valid])
+            error = (response_surface.predict(x_valid) - y_valid.reshape(n_validation, -1)) / scale
+            validation_error = {
+                'rms': float(np.sqrt(np.mean(error**2))),
+                'max': float(np.max(np.abs(error))),
+            }
+
+        return {
+            'coefficients': response_surface.coefficients,
+            'validation_error': validation_error,
+            'n_samples': n_samples,
+        }
+
+    def load_surrogate(self, inputs, outputs):
+        """Load the saved surrogate if it matches the current configuration, else train it."""
+        config = self.options['surrogate_config']
+        file = config.get('file')
+        key = self._surrogate_key(inputs)
+
+        self.surrogate_outputs = config.get('outputs') or list(outputs.keys())
+        self.surrogate_output_shapes = [np.shape(outputs[name]) for name in self.surrogate_outputs]
+        self.n_surrogate_scenarios = get_n_scenarios(self.options['plant_config'])
+
+        surrogate = None
+        if file is not None and os.path.exists(file):
+            with np.load(file) as saved:
+                if str(saved['key']) == key:
+                    surrogate = {
+                        'coefficients': saved['coefficients'],
+                        'validation_error': {
+                            'rms': float(saved['rms_error']),
+                            'max': float(saved['max_error']),
+                        },
+                        'n_samples': int(saved['n_samples']),
+                    }
+
+        if surrogate is None:
+            surrogate = self.train_surrogate(inputs, outputs)
+            if file is not None:
+                os.makedirs(os.path.dirname(os.path.abspath(file)), exist_ok=True)
+                np.savez(
+                    file,
+                    key=key,
+                    coefficients=surrogate['coefficients'],
+                    rms_error=surrogate['validation_error']['rms'],
+                    max_error=surrogate['validation_error']['max'],
+                    n_samples=surrogate['n_samples'],
+                )
+
+        self.surrogate = QuadraticResponseSurface(self.surrogate_lower, self.surrogate_upper)
+        self.surrogate.coefficients = surrogate['coefficients']
+        self.surrogate_fixed_inputs = {
+            name: np.array(value) for name, value in inputs.items()
+            if name not in self.surrogate_inputs
+        }
+        self.validation_error = surrogate['validation_error']
+        if self.options['surrogate_config'].get('verbose', False):
+            print(self.surrogate_summary())
+
+    def surrogate_summary(self):
+        return (
+            f"Surrogate of '{self.pathname}' in {self.surrogate_inputs}: validation error "
+            f"{100 * self.validation_error['rms']:.3g}% rms, "
+            f"{100 * self.validation_error['max']:.3g}% max of the output range"
+        )
+
+    def in_surrogate_domain(self, inputs, x):
+        if np.any(x < self.surrogate_lower) or np.any(x > self.surrogate_upper):
+            return False
+        return all(
+            np.array_equal(inputs[name], value) for name, value in self.surrogate_fixed_inputs.items()
+        )
+
+    def compute(self, inputs, outputs):
+        x = self._scenario_inputs(inputs)
+        if self.surrogate is None:
+            self.load_surrogate(inputs, outputs)
+
+        if not self.in_surrogate_domain(inputs, x):
+            self.surrogate_stats['model'] += 1
+            super().compute(inputs, outputs)
+            return
+
+        self.surrogate_stats['surrogate'] += 1
+        features = self.surrogate.features(x)
+        coefficients = self.surrogate.coefficients.reshape(
+            self.surrogate.n_terms, self.n_surrogate_scenarios, -1
+        )
+        prediction = np.einsum('st,tso->so', features, coefficients)
+
+        start = 0
+        for name, shape in zip(self.surrogate_outputs, self.surrogate_output_shapes):
+            size = int(np.prod(shape)) // self.n_surrogate_scenarios
+            outputs[name] = prediction[:, start:start + size].reshape(shape)
+            start += size
+
+
+@functools.lru_cache(maxsize=None)
+def surrogate_model(model_class):
+    """
+    Create a version of `model_class` whose compute calls are answered by a surrogate.
+
+    Args:
+        model_class (type): An OpenMDAO component class from `supported_models`.
+
+    Returns:
+        type: A subclass of `model_class` that takes an extra `surrogate_config` option.
+    """
+    return type(
+        f'Surrogate{model_class.__name__}', (SurrogateMixin, model_class), {'model_class': model_class}
+    )
@@ -0,0 +1,296 @@
+"""
+Run many GreenHEART cases in parallel on a local process pool.
+
+A sweep is defined either by a list (or glob) of top-level config files, or by one base
+config file plus a table of overrides, with one row per case. Each case is run in its own
+worker process and the objective and key outputs of every finished case are collected into
+one results table. A failure in one case is recorded in its row and does not stop the sweep.
+"""
+
+import argparse
+import functools
+import glob
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+from new_greenheart.core.process_pool import iter_isolated
+
+
+def build_cases(config_files=None, base_config=None, overrides=None):
+    """
+    Build the list of sweep cases.
+
+    Args:
+        config_files (str or list, optional): A glob pattern or a list of paths to top-level
+            GreenHEART config files. Each file is one case.
+        base_config (str, optional): Path to a top-level config file that is shared by all cases
+            built from `overrides`.
+        overrides (list or pd.DataFrame, optional): One dict of overrides per case, or a
+            DataFrame with one row per case and one dotted config path per column. See
+            `GreenHEARTModel.load_config` for the override format.
+
+    Returns:
+        list: Cases as dicts with `case_id`, `config_file`, and `overrides` keys.
+    """
+    if (config_files is None) == (base_config is None):
+        raise ValueError("Specify exactly one of `config_files` or `base_config` for a sweep.")
+
+    cases = []
+    if config_files is not None:
+        if isinstance(config_files, str):
+            config_files = sorted(glob.glob(config_files))
+        for config_file in config_files:
+            cases.append({
+                'case_id': len(cases),
+                'config_file': os.path.abspath(config_file),
+                'overrides': {},
+            })
+    else:
+        if overrides is None:
+            overrides = [{}]
+        elif isinstance(overrides, pd.DataFrame):
+            overrides = overrides.to_dict('records')
+        for case_overrides in overrides:
+            cases.append({
+                'case_id': len(cases),
+                'config_file': os.path.abspath(base_config),
+                'overrides': dict(case_overrides),
+            })
+
+    if not cases:
+        raise ValueError("No cases were found for the sweep.")
+
+    return cases
+
+
+def _to_result(value):
+    value = np.asarray(value)
+    if value.size == 1:
+        return float(value.item())
+    return value.tolist()
+
+
+def collect_results(gh, outputs=None):
+    """
+    Collect the objective and key outputs from a GreenHEARTModel that has been run.
+
+    The LCOH of each financial group, the CapEx and OpEx of each technology and their totals,
+    and the total hydrogen produced by each electrolyzer are collected, along with any
+    additional promoted output names given in `outputs`.
+
+    Args:
+        gh (GreenHEARTModel): The model to read results from.
+        outputs (list, optional): Additional promoted output names to collect. Defaults to None.
+
+    Returns:
+        dict: Result values keyed by promoted output name.
+    """
+    names = []
+    objective = gh.driver_config.get('objective', {}).get('name')
+    if objective is not None:
+        names.append(objective)
+
+    for group_id in getattr(gh, 'financial_groups', {}):
+        names.append(f'financials_group_{group_id}.LCOH')
+
+    for tech_name in gh.technology_config['technologies']:
+        names.extend([f'{tech_name}.CapEx', f'{tech_name}.OpEx'])
+        if 'electrolyzer' in tech_name:
+            names.append(f'{tech_name}.total_hydrogen_produced')
+
+    names.extend(outputs or [])
+
+    # Report costs in common units so that they can be summed across technologies
+    cost_units = {'.CapEx': 'USD', '.OpEx': 'USD/year'}
+
+    results = {}
+    for name in dict.fromkeys(names):
+        units = next((u for suffix, u in cost_units.items() if name.endswith(suffix)), None)
+        try:
+            try:
+                value = gh.get_val(name, units=units)
+            except (TypeError, ValueError):
+                # Units that cannot be converted are reported as they are
+                value = gh.get_val(name)
+        except KeyError:
+            # Not every technology provides every output, e.g. performance-only models
+            continue
+        results[name] = _to_result(value)
+
+    if objective is not None and objective in results:
+        results['objective'] = results[objective]
+
+    capex = [v for k, v in results.items() if k.endswith('.CapEx')]
+    opex = [v for k, v in results.items() if k.endswith('.OpEx')]
+    if capex:
+        results['total_CapEx'] = _to_result(np.sum(capex, axis=0))
+    if opex:
+        results['total_OpEx'] = _to_result(np.sum(opex, axis=0))
+
+    return results
+
+
+def run_case(case, outputs=None, validate=True):
+    """
+    Build, run, and collect results for a single sweep case.
+
+    Relative paths in the configs resolve against the directory of the case's config file, as
+    for a standalone run from that directory, without changing the working directory of the
+    process. Any exception is caught and recorded in the returned row.
+
+    Args:
+        case (dict): A case from `build_cases`.
+        outputs (list, optional): Additional promoted output names to collect. Defaults to None.
+        validate (bool, optional): Validate the configs of the case against their schemas.
+            Defaults to True.
+
+    Returns:
+        dict: The result row for the case.
+    """
+    # Deferred so that worker processes only pay the model import cost once they run a case
+    from new_greenheart.core.greenheart_model import GreenHEARTModel
+
+    row = {
+        'case_id': case['case_id'],
+        'config_file': case['config_file'],
+        **case['overrides'],
+    }
+
+    try:
+        gh = GreenHEARTModel(case['config_file'], overrides=case['overrides'], validate=validate)
+
+        # Give each case its own recorder file so that concurrent cases do not share one database
+        if 'recorder' in gh.driver_config:
+            root, ext = os.path.splitext(gh.driver_config['recorder']['file'])
+            gh.driver_config['recorder']['file'] = f"{root}_case_{case['case_id']}{ext}"
+
+        gh.run()
+        row.update(collect_results(gh, outputs))
+        row['status'] = 'success'
+        row['error'] = None
+    except Exception:
+        row['status'] = 'failed'
+        row['error'] = traceback.format_exc()
+
+    return row
+
+
+def iter_sweep(cases, n_workers=None, outputs=None, validate=True):
+    """
+    Run sweep cases on a local process pool and yield each result row as soon as it finishes.
+
+    Each worker process runs one case at a time, so a worker that dies only fails the case it
+    was running; see `iter_isolated`.
+
+    Args:
+        cases (list): Cases from `build_cases`.
+        n_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+            With a single worker, cases are run serially in the current process.
+        outputs (list, optional): Additional promoted output names to collect. Defaults to None.
+        validate (bool, optional): Validate the configs of each case against their schemas.
+            Defaults to True.
+
+    Yields:
+        dict: The result row for each finished case, in order of completion.
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count()
+
+    if n_workers == 1:
+        for case in cases:
+            yield run_case(case, outputs, validate)
+        return
+
+    def pool_factory():
+        return ProcessPoolExecutor(max_workers=1)
+
+    run = functools.partial(run_case, outputs=outputs, validate=validate)
+    for index, future in iter_isolated(pool_factory, run, cases, n_workers):
+        case = cases[index]
+        try:
+            yield future.result()
+        except BrokenProcessPool:
+            # The worker running this case died, e.g. from a segfault in a compiled model
+            yield {
+                'case_id': case['case_id'],
+                'config_file': case['config_file'],
+                **case['overrides'],
+                'status': 'failed',
+                'error': 'Worker process terminated abruptly',
+            }
+
+
+def run_sweep(
+    config_files=None,
+    base_config=None,
+    overrides=None,
+    n_workers=None,
+    outputs=None,
+    results_file=None,
+    verbose=True,
+    validate=True,
+):
+    """
+    Run a sweep of GreenHEART cases in parallel and aggregate the results into one table.
+
+    Args:
+        config_files (str or list, optional): A glob pattern or a list of top-level config files.
+        base_config (str, optional): Top-level config file shared by all cases in `overrides`.
+        overrides (list or pd.DataFrame, optional): One set of config overrides per case.
+        n_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        outputs (list, optional): Additional promoted output names to collect. Defaults to None.
+        results_file (str, optional): If given, the results table is written to this csv file.
+        verbose (bool, optional): Print a line as each case finishes. Defaults to True.
+        validate (bool, optional): Validate the configs of each case against their schemas.
+            Configs are validated once per worker process and file content, so only skip
+            this for configs that are known to be valid and complete. Defaults to True.
+
+    Returns:
+        pd.DataFrame: One row per case, ordered by case id, with a `status` and `error` column.
+    """
+    cases = build_cases(config_files, base_config, overrides)
+
+    rows = []
+    for row in iter_sweep(cases, n_workers, outputs, validate):
+        rows.append(row)
+        if verbose:
+            print(
+                f"Case {row['case_id']} {row['status']} "
+                f"({len(rows)}/{len(cases)} finished): {row['config_file']}"
+            )
+
+    results = pd.DataFrame(rows).sort_values('case_id').set_index('case_id')
+
+    if results_file is not None:
+        results.to_csv(results_file)
+
+    return results
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Run a sweep of GreenHEART config files in parallel.")
+    parser.add_argument("config_files", nargs="+", help="Top-level GreenHEART config files to run")
+    parser.add_argument("-n", "--n-workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("-o", "--output", default="sweep_results.csv", help="Results csv file")
+    parser.add_argument(
+        "--no-validate",
+        action="store_true",
+        help="Skip schema validation of trusted configs that are valid and complete",
+    )
+    args = parser.parse_args(args)
+
+    run_sweep(
+        config_files=args.config_files,
+        n_workers=args.n_workers,
+        results_file=args.output,
+        validate=not args.no_validate,
+    )
+
+
+if __name__ == "__main__":
+    main()
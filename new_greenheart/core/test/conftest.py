@@ -0,0 +1,63 @@
+from pytest import fixture
+import yaml
+
+
+@fixture
+def config_file(tmp_path, monkeypatch):
+    driver_config = {
+        "name": "driver_config",
+        "description": "Analysis run with no driver",
+        "general": {"folder_output": "output"},
+        "recorder": {"file": "cases.sql"},
+    }
+    tech_config = {
+        "name": "technology_config",
+        "description": "Feedstock electricity into a simple electrolyzer",
+        "technologies": {
+            "feedstocks": {
+                "electricity": {
+                    "rated_capacity": 100.,
+                    "capacity_units": "kW",
+                    "price": 0.05,
+                },
+            },
+            "electrolyzer": {
+                "performance_model": {"model": "dummy_electrolyzer_performance"},
+                "cost_model": {"model": "dummy_electrolyzer_cost"},
+            },
+        },
+    }
+    plant_config = {
+        "name": "plant_config",
+        "description": "Simple test plant",
+        "site": {
+            "latitude": 40.,
+            "longitude": -105.,
+            "elevation_m": 1600.,
+            "time_zone": -7,
+            "boundaries": [],
+        },
+        "plant": {"plant_life": 30},
+        "technology_interconnections": [
+            ["feedstocks", "electrolyzer", "electricity", "cable"],
+        ],
+    }
+    config = {
+        "name": "GreenHEART_config",
+        "system_summary": "Test plant",
+        "driver_config": "driver_config.yaml",
+        "technology_config": "tech_config.yaml",
+        "plant_config": "plant_config.yaml",
+    }
+
+    for filename, contents in [
+        ("driver_config.yaml", driver_config),
+        ("tech_config.yaml", tech_config),
+        ("plant_config.yaml", plant_config),
+        ("greenheart_config.yaml", config),
+    ]:
+        with open(tmp_path / filename, "w") as f:
+            yaml.safe_dump(contents, f)
+
+    monkeypatch.chdir(tmp_path)
+    return "greenheart_config.yaml"
@@ -0,0 +1,100 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from pytest import approx, raises
+
+from new_greenheart.core.cache import SimulationCache, canonical_key
+
+
+def test_canonical_key(subtests):
+    with subtests.test("dict ordering"):
+        assert canonical_key({"a": 1, "b": {"c": 2, "d": 3}}) == canonical_key({"b": {"d": 3, "c": 2}, "a": 1})
+
+    with subtests.test("numpy values"):
+        assert canonical_key({"a": np.array([1., 2.]), "b": np.float64(3.)}) == canonical_key({"a": [1., 2.], "b": 3.})
+
+    with subtests.test("different inputs"):
+        assert canonical_key({"rating": None}) != canonical_key({"rating": 100.})
+
+    with subtests.test("unsupported type"):
+        with raises(TypeError, match="object"):
+            canonical_key({"model": object()})
+
+
+def test_get_put(tmp_path, subtests):
+    cache = SimulationCache(tmp_path / "cache")
+    key = canonical_key({"a": 1})
+
+    with subtests.test("miss"):
+        assert cache.get(key) is None
+
+    cache.put(key, {"electricity": (1., 2., 3.), "capex": 10., "label": "hybrid"})
+    value = cache.get(key)
+
+    with subtests.test("hit"):
+        assert value["electricity"] == approx([1., 2., 3.])
+        assert value["capex"] == 10.
+        assert value["label"] == "hybrid"
+
+    with subtests.test("memory mapped arrays"):
+        assert isinstance(value["electricity"], np.memmap)
+        assert not value["electricity"].flags.writeable
+
+    with subtests.test("stats"):
+        assert cache.stats == {"hits": 1, "misses": 1, "writes": 1, "evictions": 0}
+
+    with subtests.test("no temporary files left"):
+        assert [f for f in os.listdir(cache.cache_dir) if f.endswith(".tmp")] == []
+
+    with subtests.test("existing entry kept"):
+        cache.put(key, {"electricity": (4., 5., 6.)})
+        assert cache.get(key)["electricity"] == approx([1., 2., 3.])
+
+
+def test_lru_eviction(tmp_path):
+    cache = SimulationCache(tmp_path, max_size_mb=2.5)
+    value = {"electricity": np.zeros(2**20 // 8)}  # 1 MiB
+    keys = [canonical_key(i) for i in range(3)]
+
+    cache.put(keys[0], value)
+    cache.put(keys[1], value)
+    # Mark the first entry as the most recently used one
+    ten_seconds_ago = time.time() - 10
+    os.utime(os.path.join(cache.path(keys[1]), "meta.json"), (ten_seconds_ago, ten_seconds_ago))
+    cache.get(keys[0])
+    cache.put(keys[2], value)
+
+    assert os.path.exists(cache.path(keys[0]))
+    assert not os.path.exists(cache.path(keys[1]))
+    assert os.path.exists(cache.path(keys[2]))
+    assert cache.stats["evictions"] == 1
+
+
+def test_age_eviction(tmp_path):
+    cache = SimulationCache(tmp_path, max_age_days=1.)
+    old_key, new_key = canonical_key("old"), canonical_key("new")
+
+    cache.put(old_key, {"capex": 1.})
+    two_days_ago = time.time() - 2 * 86400.
+    os.utime(os.path.join(cache.path(old_key), "meta.json"), (two_days_ago, two_days_ago))
+    cache.put(new_key, {"capex": 2.})
+
+    assert cache.get(old_key) is None
+    assert cache.get(new_key) == {"capex": 2.}
+
+
+def _write_and_read(cache_dir, i):
+    cache = SimulationCache(cache_dir, max_size_mb=1.)
+    key = canonical_key(i % 4)
+    cache.put(key, {"electricity": np.full(10000, i % 4)})
+    value = cache.get(key)
+    return value is None or bool(np.all(value["electricity"] == i % 4))
+
+
+def test_shared_between_processes(tmp_path):
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(_write_and_read, [str(tmp_path)] * 32, range(32)))
+
+    assert all(results)
@@ -0,0 +1,181 @@
+from pathlib import Path
+
+from pytest import approx, raises
+import numpy as np
+import openmdao.api as om
+import ProFAST
+
+from new_greenheart.core.cash_flow import CashFlowModel, depreciation_schedule
+from new_greenheart.core.finances import ProFastComp
+from new_greenheart.core.inputs.validation import load_plant_yaml, load_tech_yaml
+
+
+EXAMPLE_DIR = Path(__file__).parents[3] / "examples" / "08_onshore_steel_mn"
+
+
+def get_configs(depreciation_method, installation_time, n_scenarios):
+    plant_config = {
+        "finance_parameters": {
+            "profast_general_inflation": 0.02,
+            "costing_general_inflation": 0.0,
+            "sales_tax_rate": 0.07375,
+            "property_tax": 0.01,
+            "property_insurance": 0.005,
+            "administrative_expense_percent_of_sales": 0.03,
+            "total_income_tax_rate": 0.2574,
+            "capital_gains_tax_rate": 0.15,
+            "discount_rate": 0.0948,
+            "debt_equity_split": False,
+            "debt_equity_ratio": 2.62,
+            "debt_type": "Revolving debt",
+            "loan_period": 0,
+            "debt_interest_rate": 0.046,
+            "cash_onhand_months": 1,
+            "depreciation_method": depreciation_method,
+            "depreciation_period": 7,
+            "depreciation_period_electrolyzer": 5,
+        },
+        "plant": {
+            "atb_year": 2022,
+            "plant_life": 30,
+            "installation_time": installation_time,
+            "cost_year": 2022,
+            "n_scenarios": n_scenarios,
+        },
+    }
+    tech_config = {
+        "wind": {},
+        "electrolyzer": {
+            "model_inputs": {"financial_parameters": {"replacement_cost_percent": 0.15}}
+        },
+    }
+    return plant_config, tech_config
+
+
+def run_lcoh(cash_flow_model, depreciation_method, installation_time):
+    plant_config, tech_config = get_configs(depreciation_method, installation_time, 3)
+    plant_config["finance_parameters"]["cash_flow_model"] = cash_flow_model
+
+    prob = om.Problem(reports=False)
+    comp = ProFastComp(plant_config=plant_config, tech_config=tech_config)
+    prob.model.add_subsystem("comp", comp, promotes=["*"])
+    prob.setup()
+
+    prob.set_val('capex_adjusted_wind', [1.e8, 2.e8, 3.e8], units='USD')
+    prob.set_val('opex_adjusted_wind', [1.e6, 2.e6, 3.e6], units='USD/year')
+    prob.set_val('capex_adjusted_electrolyzer', [5.e7, 4.e7, 3.e7], units='USD')
+    prob.set_val('opex_adjusted_electrolyzer', [1.e5, 3.e5, 2.e5], units='USD/year')
+    prob.set_val('total_hydrogen_produced', [1.e7, 2.e7, 2.5e7], units='kg/year')
+    prob.set_val('time_until_replacement', [4.e4, 8.e4, 1.e5], units='h')
+
+    prob.run_model()
+    return prob.get_val('LCOH')
+
+
+def test_native_matches_profast_macrs():
+    lcoh_profast = run_lcoh('profast', 'MACRS', 36)
+    lcoh_native = run_lcoh('native', 'MACRS', 36)
+
+    assert lcoh_native == approx(lcoh_profast, rel=1.e-10)
+
+
+def test_native_matches_profast_straight_line():
+    lcoh_profast = run_lcoh('profast', 'Straight line', 6)
+    lcoh_native = run_lcoh('native', 'Straight line', 6)
+
+    assert lcoh_native == approx(lcoh_profast, rel=1.e-10)
+
+
+def test_native_matches_profast_example_plant():
+    # The finance parameters and hydrogen financial group of the onshore steel example, with
+    # costs of the order of its gigawatt-scale plant
+    plant_config = load_plant_yaml(str(EXAMPLE_DIR / "plant_config.yaml"))
+    technologies = load_tech_yaml(str(EXAMPLE_DIR / "tech_config.yaml"))["technologies"]
+    tech_config = {
+        tech: technologies[tech] for tech in technologies
+        if technologies[tech].get("financial_model", {}).get("group") == 1
+    }
+    inputs = {
+        'capex_adjusted_hopp': (2.4e9, 'USD'),
+        'opex_adjusted_hopp': (4.5e7, 'USD/year'),
+        'capex_adjusted_electrolyzer': (2.1e9, 'USD'),
+        'opex_adjusted_electrolyzer': (3.8e7, 'USD/year'),
+        'capex_adjusted_h2_storage': (3.2e8, 'USD'),
+        'opex_adjusted_h2_storage': (6.e6, 'USD/year'),
+        'total_hydrogen_produced': (1.3e8, 'kg/year'),
+        'time_until_replacement': (7.e4, 'h'),
+    }
+
+    lcoh = {}
+    for cash_flow_model in ['profast', 'native']:
+        plant_config["finance_parameters"]["cash_flow_model"] = cash_flow_model
+        prob = om.Problem(reports=False)
+        prob.model.add_subsystem(
+            "comp", ProFastComp(plant_config=plant_config, tech_config=tech_config), promotes=["*"]
+        )
+        prob.setup()
+        for name, (val, units) in inputs.items():
+            prob.set_val(name, val, units=units)
+        prob.run_model()
+        lcoh[cash_flow_model] = prob.get_val('LCOH')
+
+    assert lcoh['native'] == approx(lcoh['profast'], rel=1.e-10)
+
+
+def test_npv_matches_profast():
+    def setup(model):
+        model.set_params('commodity', {"name": 'Hydrogen', "unit": "kg", "initial price": 100,
+                                       "escalation": 0.02})
+        model.set_params('capacity', 2.e4)
+        model.set_params('maintenance', {"value": 0, "escalation": 0.02})
+        model.set_params('analysis start year', 2024)
+        model.set_params('operating life', 25)
+        model.set_params('installation months', 18)
+        model.set_params('leverage after tax nominal discount rate', 0.08)
+        model.set_params('debt equity ratio of initial financing', 1.5)
+        model.set_params('general inflation rate', 0.02)
+        model.add_capital_item(name="plant", cost=1.e8, depr_type="MACRS", depr_period=5,
+                               refurb=[0.] * 7 + [0.2])
+        model.add_fixed_cost(name="plant O&M", usage=1.0, unit='$/year', cost=2.e6,
+                             escalation=0.02)
+
+    pf = ProFAST.ProFAST()
+    setup(pf)
+    model = CashFlowModel()
+    setup(model)
+
+    for price in [1., 3.5, 10.]:
+        assert model.npv(price)[0] == approx(pf.cash_flow(price), rel=1.e-10)
+
+
+def test_unsupported_features():
+    model = CashFlowModel()
+    model.set_params('debt type', 'One time loan')
+    with raises(NotImplementedError):
+        model.check_supported()
+
+    model = CashFlowModel()
+    model.set_params('one time cap inct', {"value": 1.e6, "depr type": "MACRS",
+                                           "depr period": 7, "depreciable": True})
+    with raises(NotImplementedError):
+        model.check_supported()
+
+    with raises(ValueError):
+        CashFlowModel().set_params('not a parameter', 1.)
+
+
+def test_depreciation_schedule():
+    fraction_of_year_operated = np.concatenate([[0., 0.5], np.ones(30)])
+
+    macrs = depreciation_schedule('MACRS', 5, 6, fraction_of_year_operated)
+    assert np.sum(macrs) == approx(1.)
+    # Placed in service in the third quarter of the first year
+    assert macrs[0] == approx(0.15)
+
+    straight_line = depreciation_schedule('Straight line', 10, 6, fraction_of_year_operated)
+    assert np.sum(straight_line) == approx(1.)
+    assert straight_line[0] == approx(0.05)
+    assert straight_line[1] == approx(0.1)
+
+    with raises(ValueError):
+        depreciation_schedule('MACRS', 8, 6, fraction_of_year_operated)
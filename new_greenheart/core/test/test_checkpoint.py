@@ -0,0 +1,159 @@
+import json
+import os
+import time
+
+import numpy as np
+import pytest
+from pytest import approx
+
+from new_greenheart.core.greenheart_model import GreenHEARTModel
+from new_greenheart.core.parallel_doe import _run_doe_case
+
+
+DESIGN_VARIABLES = {
+    "feedstocks": {
+        "electricity_rated_capacity": {"flag": True, "lower": 50., "upper": 300., "units": "kW"},
+        "electricity_price": {"flag": True, "lower": 0.01, "upper": 0.1, "units": None},
+    },
+}
+
+
+def checkpoint_overrides(driver):
+    return {
+        "driver_config.driver": {**driver, "checkpoint": {"flag": True, "interval": 2}},
+        "driver_config.design_variables": DESIGN_VARIABLES,
+        "driver_config.objective": {"name": "feedstocks.OpEx", "ref": 1.e4},
+    }
+
+
+DOE = {
+    "optimization": {"flag": False},
+    "design_of_experiments": {
+        "flag": True, "generator": "fullfact", "levels": 3, "run_parallel": False,
+        "debug_print": False,
+    },
+}
+
+
+def test_resume_doe(config_file, subtests):
+    overrides = checkpoint_overrides(DOE)
+    gh = GreenHEARTModel(config_file, overrides)
+    gh.run()
+    assert gh.checkpoint.n_new == 9
+
+    with subtests.test("default file in the output folder"):
+        assert gh.checkpoint.file == os.path.abspath(os.path.join("output", "checkpoint.json"))
+
+    # Keep only the first four cases, as if the run had been killed
+    with open(gh.checkpoint.file) as f:
+        checkpoint = json.load(f)
+    checkpoint["entries"] = dict(list(checkpoint["entries"].items())[:4])
+    with open(gh.checkpoint.file, "w") as f:
+        json.dump(checkpoint, f)
+
+    resumed = GreenHEARTModel(config_file, overrides)
+    resumed.run()
+
+    with subtests.test("finished cases skipped"):
+        assert resumed.checkpoint.n_replayed == 4
+        assert resumed.checkpoint.n_new == 5
+
+    with subtests.test("same results"):
+        assert resumed.checkpoint.entries == gh.checkpoint.entries
+
+
+def slow_first_case(case):
+    """Delay the first generated case, so that the later cases finish before it."""
+    values = {name: np.asarray(value).item() for name, value in case}
+    if values["feedstocks.electricity_rated_capacity"] == 50. and values["feedstocks.electricity_price"] == 0.01:
+        time.sleep(5.)
+    return _run_doe_case(case)
+
+
+def test_resume_process_pool_doe(config_file, subtests):
+    overrides = checkpoint_overrides({
+        **DOE,
+        "design_of_experiments": {
+            **DOE["design_of_experiments"], "process_pool": {"flag": True, "n_workers": 2},
+        },
+    })
+    gh = GreenHEARTModel(config_file, overrides)
+    gh.prob.driver.case_runner = slow_first_case
+    gh.setup()
+
+    # Stop the run when the first case is about to be recorded, after the later cases have
+    # finished, and keep the checkpoint file as it was then, as if the run had been killed
+    driver = gh.prob.driver
+    record_case = driver._record_case
+    on_disk = {}
+
+    def stop_midway(*args):
+        if driver.iter_count == 0:
+            with open(gh.checkpoint.file) as f:
+                on_disk.update(json.load(f))
+            raise KeyboardInterrupt
+        record_case(*args)
+
+    driver._record_case = stop_midway
+    with pytest.raises(KeyboardInterrupt):
+        gh.run()
+    with open(gh.checkpoint.file, "w") as f:
+        json.dump(on_disk, f)
+
+    with subtests.test("finished cases saved before they are recorded"):
+        assert len(on_disk["entries"]) >= 2
+
+    resumed = GreenHEARTModel(config_file, overrides)
+    resumed.run()
+
+    with subtests.test("finished cases skipped"):
+        assert resumed.checkpoint.n_replayed == len(on_disk["entries"])
+        assert resumed.checkpoint.n_new == 9 - len(on_disk["entries"])
+
+
+def test_replay_optimization(config_file, subtests):
+    overrides = checkpoint_overrides({
+        "optimization": {
+            "flag": True, "solver": "SLSQP", "tol": 1.e-8, "max_iter": 20, "step_size": 1.e-3,
+            "form": "forward", "debug_print": False,
+        },
+    })
+    gh = GreenHEARTModel(config_file, overrides)
+    gh.setup()
+    gh.prob.run_model()
+    gh.run()
+
+    restarted = GreenHEARTModel(config_file, overrides)
+    restarted.setup()
+    restarted.prob.run_model()
+    restarted.run()
+
+    with subtests.test("function values replayed"):
+        assert restarted.checkpoint.n_new == 0
+        assert restarted.checkpoint.n_replayed == gh.checkpoint.n_new + gh.checkpoint.n_replayed
+
+    with subtests.test("same optimum"):
+        assert restarted.get_val("feedstocks.electricity_rated_capacity", units="kW") == approx(50.)
+        assert restarted.get_val("feedstocks.OpEx") == approx(gh.get_val("feedstocks.OpEx"))
+
+
+def test_changed_configs_not_resumed(config_file):
+    overrides = checkpoint_overrides(DOE)
+    GreenHEARTModel(config_file, overrides).run()
+
+    changed = {**overrides, "plant_config.plant.plant_life": 20}
+    with pytest.raises(ValueError, match="different configs"):
+        GreenHEARTModel(config_file, changed).setup()
+
+
+def test_changed_inputs_not_replayed(config_file):
+    overrides = checkpoint_overrides(DOE)
+    GreenHEARTModel(config_file, overrides).run()
+
+    # The latitude is not a design variable
+    gh = GreenHEARTModel(config_file, overrides)
+    gh.set_val("latitude", 30.)
+    gh.run()
+
+    assert gh.checkpoint.n_replayed == 0
+    assert gh.checkpoint.n_new == 9
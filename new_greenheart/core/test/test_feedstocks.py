@@ -0,0 +1,142 @@
+import pytest
+from pytest import approx
+import numpy as np
+import pandas as pd
+import openmdao.api as om
+
+from new_greenheart.core.feedstocks import FeedstockComponent
+from new_greenheart.resources import store
+
+
+feedstocks_config = {
+    "electricity": {
+        "rated_capacity": 50000.,
+        "capacity_units": "kW",
+        "price": 0.09,
+        "price_units": "kWh",
+    },
+}
+
+
+def test_feedstock_single_scenario(subtests):
+    prob = om.Problem()
+    comp = FeedstockComponent(feedstocks_config=feedstocks_config)
+    prob.model.add_subsystem("comp", comp, promotes=["*"])
+
+    prob.setup()
+    prob.run_model()
+
+    with subtests.test("profile"):
+        assert prob['electricity'] == approx(np.full(8760, 50000.))
+    with subtests.test("opex"):
+        assert prob['OpEx'] == approx(50000. * 8760 * 0.09)
+
+
+def test_feedstock_batched_scenarios(subtests):
+    plant_config = {"plant": {"n_scenarios": 3}}
+
+    prob = om.Problem()
+    comp = FeedstockComponent(feedstocks_config=feedstocks_config, plant_config=plant_config)
+    prob.model.add_subsystem("comp", comp, promotes=["*"])
+
+    prob.setup()
+
+    rated_capacity = np.array([10000., 20000., 30000.])
+    price = np.array([0.05, 0.09, 0.1])
+    prob.set_val('electricity_rated_capacity', rated_capacity, units='kW')
+    prob.set_val('electricity_price', price)
+    prob.run_model()
+
+    with subtests.test("profile shape"):
+        assert prob['electricity'].shape == (3, 8760)
+    with subtests.test("profile"):
+        assert prob['electricity'][:, 0] == approx(rated_capacity)
+    with subtests.test("opex"):
+        assert prob['OpEx'] == approx(rated_capacity * 8760 * price)
+
+
+def test_feedstock_profiles(tmp_path, monkeypatch, subtests):
+    monkeypatch.setattr(store, "_resources", {})
+    availability = np.tile([1.0, 0.5], 4380)
+    price = np.linspace(0.01, 0.1, 8760)
+    np.save(tmp_path / "availability.npy", availability)
+    pd.DataFrame({"price": price}).to_csv(tmp_path / "price.csv", index=False)
+
+    config = {
+        "electricity": {
+            **feedstocks_config["electricity"],
+            "availability_profile": str(tmp_path / "availability.npy"),
+            "price_profile": str(tmp_path / "price.csv"),
+        },
+    }
+    prob = om.Problem()
+    prob.model.add_subsystem("comp", FeedstockComponent(feedstocks_config=config), promotes=["*"])
+
+    prob.setup()
+    prob.run_model()
+
+    with subtests.test("profile"):
+        assert prob['electricity'] == approx(50000. * availability)
+    with subtests.test("price input"):
+        assert prob['electricity_price'] == approx(price)
+    with subtests.test("opex"):
+        assert prob['OpEx'] == approx(np.sum(50000. * availability * price))
+
+    with subtests.test("csv converted to a memory-mapped copy"):
+        monkeypatch.setattr(store, "_resources", {})
+        assert isinstance(store.get_profile(str(tmp_path / "price.csv")), np.memmap)
+
+
+def test_feedstock_availability_with_flat_price(tmp_path):
+    plant_config = {"plant": {"n_scenarios": 2}}
+    availability = np.tile([1.0, 0.5], 4380)
+    np.save(tmp_path / "availability.npy", availability)
+    config = {
+        "electricity": {
+            **feedstocks_config["electricity"],
+            "availability_profile": str(tmp_path / "availability.npy"),
+        },
+    }
+    prob = om.Problem()
+    comp = FeedstockComponent(feedstocks_config=config, plant_config=plant_config)
+    prob.model.add_subsystem("comp", comp, promotes=["*"])
+
+    prob.setup()
+    prob.set_val('electricity_rated_capacity', np.array([10000., 20000.]), units='kW')
+    prob.run_model()
+
+    assert prob['electricity'] == approx(np.array([[10000.], [20000.]]) * availability)
+    assert prob['OpEx'] == approx(np.array([10000., 20000.]) * 0.75 * 8760 * 0.09)
+
+
+def test_feedstock_profile_shape(tmp_path):
+    np.save(tmp_path / "availability.npy", np.ones(24))
+    config = {
+        "electricity": {
+            **feedstocks_config["electricity"],
+            "availability_profile": str(tmp_path / "availability.npy"),
+        },
+    }
+    prob = om.Problem()
+    prob.model.add_subsystem("comp", FeedstockComponent(feedstocks_config=config))
+
+    with pytest.raises(ValueError, match="has the shape"):
+        prob.setup()
+
+
+def test_feedstock_shared_price_profile_batched(tmp_path):
+    plant_config = {"plant": {"n_scenarios": 3, "n_timesteps": 24}}
+    price = np.linspace(0.01, 0.1, 24)
+    np.save(tmp_path / "price.npy", price)
+    config = {"electricity": {**feedstocks_config["electricity"], "price_profile": str(tmp_path / "price.npy")}}
+    prob = om.Problem()
+    comp = FeedstockComponent(feedstocks_config=config, plant_config=plant_config)
+    prob.model.add_subsystem("comp", comp, promotes=["*"])
+
+    prob.setup()
+    rated_capacity = np.array([10000., 20000., 30000.])
+    prob.set_val('electricity_rated_capacity', rated_capacity, units='kW')
+    prob.run_model()
+
+    assert prob['electricity_price'].shape == (3, 24)
+    assert prob['OpEx'] == approx(rated_capacity * np.sum(price) * 8760 / 24)
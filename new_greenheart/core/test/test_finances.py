@@ -1,7 +1,9 @@
-from pytest import approx, fixture
+from pytest import approx, fixture, mark
+import numpy as np
 import openmdao.api as om
+from openmdao.utils.assert_utils import assert_check_partials
 
-from new_greenheart.core.finances import ProFastComp
+from new_greenheart.core.finances import AdjustedCapexOpexComp, ProFastComp
 
 
 def test_electrolyzer_refurb_results():
@@ -66,4 +68,101 @@ def test_electrolyzer_refurb_results():
 
     prob.run_model()
 
-    assert prob['LCOH'] == approx(4.27529137)
\ No newline at end of file
+    assert prob['LCOH'] == approx(4.27529137)
+
+def test_batched_adjusted_capex_opex():
+    plant_config = {
+        "finance_parameters": {
+            "costing_general_inflation": 0.025,
+            "discount_years": {"wind": 2020, "electrolyzer": 2021},
+        },
+        "plant": {
+            "cost_year": 2022,
+            "n_scenarios": 3,
+        },
+    }
+    tech_config = {"wind": {}, "electrolyzer": {}}
+
+    prob = om.Problem()
+    comp = AdjustedCapexOpexComp(plant_config=plant_config, tech_config=tech_config)
+    prob.model.add_subsystem("comp", comp, promotes=["*"])
+
+    prob.setup()
+
+    prob.set_val('capex_wind', [1.e6, 2.e6, 3.e6], units='USD')
+    prob.set_val('opex_wind', [1.e4, 2.e4, 3.e4], units='USD/year')
+    prob.set_val('capex_electrolyzer', [4.e6, 5.e6, 6.e6], units='USD')
+
+    prob.run_model()
+
+    assert prob['capex_adjusted_wind'] == approx(np.array([1.e6, 2.e6, 3.e6]) * 1.025**2)
+    assert prob['opex_adjusted_wind'] == approx(np.array([1.e4, 2.e4, 3.e4]) * 1.025**2)
+    assert prob['total_capex_adjusted'] == approx(
+        np.array([1.e6, 2.e6, 3.e6]) * 1.025**2 + np.array([4.e6, 5.e6, 6.e6]) * 1.025
+    )
+
+    # The adjustment is linear, so a large step is exact and avoids round-off
+    data = prob.check_partials(method='fd', form='central', step=1., out_stream=None)
+    assert_check_partials(data, atol=1.e-6, rtol=1.e-6)
+
+
+@mark.parametrize("cash_flow_model", ["native", "profast"])
+def test_lcoh_partials(cash_flow_model):
+    plant_config = {
+        "finance_parameters": {
+            "profast_general_inflation": 0.02,
+            "costing_general_inflation": 0.0,
+            "sales_tax_rate": 0.07,
+            "property_tax": 0.01,
+            "property_insurance": 0.005,
+            "administrative_expense_percent_of_sales": 0.03,
+            "total_income_tax_rate": 0.21,
+            "capital_gains_tax_rate": 0.15,
+            "discount_rate": 0.08,
+            "debt_equity_split": 70,
+            "debt_equity_ratio": None,
+            "debt_type": "Revolving debt",
+            "loan_period": 10,
+            "debt_interest_rate": 0.05,
+            "cash_onhand_months": 6,
+            "depreciation_method": "MACRS",
+            "depreciation_period": 7,
+            "depreciation_period_electrolyzer": 5,
+            "cash_flow_model": cash_flow_model,
+        },
+        "plant": {
+            "atb_year": 2022,
+            "plant_life": 30,
+            "installation_time": 24,
+            "cost_year": 2022,
+        },
+    }
+    tech_config = {
+        "wind": {},
+        "electrolyzer": {
+            "model_inputs": {"financial_parameters": {"replacement_cost_percent": 0.1}}
+        },
+    }
+
+    prob = om.Problem()
+    comp = ProFastComp(plant_config=plant_config, tech_config=tech_config)
+    prob.model.add_subsystem("comp", comp, promotes=["*"])
+
+    prob.setup()
+
+    prob.set_val('capex_adjusted_wind', 2.e8, units='USD')
+    prob.set_val('opex_adjusted_wind', 3.e6, units='USD/year')
+    prob.set_val('capex_adjusted_electrolyzer', 1.e8, units='USD')
+    prob.set_val('opex_adjusted_electrolyzer', 1.e6, units='USD/year')
+    prob.set_val('total_hydrogen_produced', 2.e7, units='kg/year')
+    prob.set_val('time_until_replacement', 6.e4, units='h')
+
+    prob.run_model()
+
+    # The price solve converges to 1e-4 $/kg, so the reference uses a large step
+    data = prob.check_partials(
+        method='fd', form='central', step=1.e-2, step_calc='rel', out_stream=None
+    )
+    for (of, wrt), errors in data['comp'].items():
+        if wrt in comp.partials_wrt:
+            assert errors['J_fwd'] == approx(errors['J_fd'], rel=1.e-3)
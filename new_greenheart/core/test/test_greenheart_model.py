@@ -0,0 +1,150 @@
+from pytest import approx
+import numpy as np
+
+from new_greenheart.core.cache import SimulationCache
+from new_greenheart.core.greenheart_model import GreenHEARTModel
+
+
+def test_setup_once_run_many(config_file, subtests):
+    gh = GreenHEARTModel(config_file)
+
+    gh.setup()
+    prob = gh.prob
+    recorder = gh.recorder
+
+    for rated_capacity in [100., 200., 300.]:
+        gh.set_val("feedstocks.electricity_rated_capacity", rated_capacity, units="kW")
+        gh.run()
+        with subtests.test("hydrogen", rated_capacity=rated_capacity):
+            assert gh.get_val("electrolyzer.hydrogen") == approx(np.full(8760, 0.1 * rated_capacity))
+
+    with subtests.test("problem reused"):
+        assert gh.prob is prob
+        assert gh.is_setup
+
+    with subtests.test("recorder attached once"):
+        gh.setup()
+        assert gh.recorder is recorder
+        assert gh.model._rec_mgr._recorders.count(recorder) == 1
+
+
+def test_cache_summary(config_file, tmp_path, capsys, subtests):
+    gh = GreenHEARTModel(config_file)
+    gh.setup()
+
+    # Technology models with a simulation cache, like the HOPP component, keep it as `cache`
+    cache = SimulationCache(tmp_path / "cache")
+    gh.model.plant.feedstocks.cache = cache
+
+    with subtests.test("unused cache not reported"):
+        gh.run()
+        assert "Cache" not in capsys.readouterr().out
+
+    with subtests.test("reported after the run"):
+        cache.get("missing")
+        gh.run()
+        assert gh.get_simulation_caches() == {"plant.feedstocks": cache}
+        assert cache.summary() in capsys.readouterr().out
+
+
+def test_simulation_horizon(config_file):
+    gh = GreenHEARTModel(
+        config_file,
+        {'plant_config.plant.n_timesteps': 96, 'plant_config.plant.dt_hours': 0.25},
+    )
+    gh.run()
+
+    assert gh.get_val("electrolyzer.hydrogen") == approx(np.full(96, 10.))
+    # The feedstock cost is for a year of operation, whatever the simulated horizon
+    assert gh.get_val("feedstocks.electricity_OpEx") == approx(100. * 8760 * 0.05)
+
+
+def test_eliminate_lossless_transport(config_file, subtests):
+    link = "feedstocks_to_electrolyzer_cable"
+    hydrogen = {}
+    for eliminate in [False, True]:
+        gh = GreenHEARTModel(config_file, {'plant_config.plant.eliminate_lossless_transport': eliminate})
+        gh.run()
+        hydrogen[eliminate] = gh.get_val("electrolyzer.hydrogen")
+
+        with subtests.test("transport component", eliminate=eliminate):
+            assert (link in gh.plant._subsystems_allprocs) != eliminate
+        with subtests.test("logical link", eliminate=eliminate):
+            assert gh.transport_links[link]["eliminated"] == eliminate
+            assert gh.transport_links[link]["commodity"] == "electricity"
+            assert gh.get_transport_val(link, units="kW") == approx(np.full(8760, 100.))
+
+    with subtests.test("same results"):
+        assert hydrogen[True] == approx(hydrogen[False])
+
+
+def test_electricity_financials_approximated(config_file, subtests):
+    finance_parameters = {
+        "profast_general_inflation": 0.02,
+        "costing_general_inflation": 0.0,
+        "sales_tax_rate": 0.07,
+        "property_tax": 0.01,
+        "property_insurance": 0.005,
+        "administrative_expense_percent_of_sales": 0.03,
+        "total_income_tax_rate": 0.21,
+        "capital_gains_tax_rate": 0.15,
+        "discount_rate": 0.08,
+        "debt_equity_split": 70,
+        "debt_equity_ratio": None,
+        "debt_type": "Revolving debt",
+        "loan_period": 10,
+        "debt_interest_rate": 0.05,
+        "cash_onhand_months": 6,
+        "depreciation_method": "MACRS",
+        "depreciation_period": 7,
+        "depreciation_period_electrolyzer": 5,
+        "discount_years": {"feedstocks": 2022},
+    }
+    overrides = {
+        "technology_config.technologies": {
+            "feedstocks": {
+                "electricity": {"rated_capacity": 100., "capacity_units": "kW", "price": 0.05},
+            },
+        },
+        "plant_config.technology_interconnections": [],
+        "plant_config.finance_parameters": finance_parameters,
+        "plant_config.plant": {
+            "plant_life": 30, "atb_year": 2022, "installation_time": 24, "cost_year": 2022,
+        },
+        "driver_config.driver": {
+            "optimization": {
+                "flag": True,
+                "solver": "SLSQP",
+                "tol": 1.e-6,
+                "max_iter": 10,
+                "step_size": 1.e-3,
+                "form": "forward",
+                "debug_print": False,
+                "derivatives": "partials",
+            }
+        },
+        "driver_config.design_variables": {
+            "feedstocks": {
+                "electricity_rated_capacity": {
+                    "flag": True, "lower": 50., "upper": 300., "units": "kW",
+                },
+            },
+        },
+        "driver_config.objective": {"name": "financials_group_1.LCOE", "ref": 1.},
+    }
+    gh = GreenHEARTModel(config_file, overrides)
+    gh.setup()
+    gh.prob.run_model()
+
+    with subtests.test("financial group approximated"):
+        assert gh.plant.financials_group_1 in gh.approximated_systems
+
+    with subtests.test("check totals"):
+        data = gh.prob.check_totals(
+            of=["financials_group_1.LCOE", "financials_group_1.total_opex_adjusted"],
+            wrt=["feedstocks.electricity_rated_capacity"],
+            method="fd",
+            out_stream=None,
+        )
+        for key, errors in data.items():
+            assert errors["J_fwd"] == approx(errors["J_fd"], rel=1.e-5, abs=1.e-8), key
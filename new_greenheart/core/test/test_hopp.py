@@ -0,0 +1,117 @@
+from pathlib import Path
+
+from pytest import approx
+import openmdao.api as om
+from hopp.utilities import load_yaml
+
+from new_greenheart.converters.hopp.hopp_wrapper import HOPPComponent
+
+
+EXAMPLE_DIR = Path(__file__).parents[3] / "examples" / "06_hopp_h2"
+
+
+def hopp_tech_config(
+    battery_capacity_kwh=100000., battery_capacity_kw=50000., pv_capacity_kw=100000.
+):
+    """PV and battery from the 06_hopp_h2 example, without the slow wind farm."""
+    fin_model = load_yaml(str(EXAMPLE_DIR / "tech_inputs" / "default_fin_config.yaml"))
+    boundary = [[0.0, 0.0], [0.0, 20000.0], [20000.0, 20000.0], [20000.0, 0.0]]
+    hopp_config = {
+        "site": {
+            "data": {
+                "lat": 47.5233,
+                "lon": -92.5366,
+                "elev": 1099,
+                "year": 2013,
+                "tz": -6,
+                "site_boundaries": {"verts": boundary, "verts_simple": boundary},
+            },
+            "solar_resource_file": str(
+                EXAMPLE_DIR / "weather" / "solar" / "47.5233_-92.5366_psmv3_60_2013.csv"
+            ),
+            "wind_resource_file": "",
+            "wave_resource_file": "",
+            "grid_resource_file": "",
+            "hub_height": 115.0,
+            "capacity_hours": [],
+            "solar": True,
+            "wind": False,
+            "wave": False,
+        },
+        "technologies": {
+            "pv": {"system_capacity_kw": pv_capacity_kw, "fin_model": fin_model},
+            "battery": {
+                "system_capacity_kwh": battery_capacity_kwh,
+                "system_capacity_kw": battery_capacity_kw,
+                "minimum_SOC": 20.0,
+                "maximum_SOC": 100.0,
+                "initial_SOC": 90.0,
+                "fin_model": fin_model,
+            },
+            "grid": {"interconnect_kw": 2000000, "fin_model": fin_model},
+        },
+        "config": {
+            "dispatch_options": {
+                "battery_dispatch": "load_following_heuristic",
+                "solver": "cbc",
+                "n_look_ahead_periods": 48,
+                "grid_charging": False,
+                "pv_charging_only": False,
+                "include_lifecycle_count": False,
+            },
+            "cost_info": {
+                "solar_installed_cost_mw": 991000,
+                "storage_installed_cost_mwh": 158000,
+                "storage_installed_cost_mw": 212000,
+                "pv_om_per_kw": 17.2,
+                "battery_om_per_kw": 9.25,
+            },
+        },
+    }
+    return {
+        "performance_model": {"model": "hopp", "config": hopp_config, "cache": {"flag": False}},
+        "electrolyzer_rating": 60000.,
+    }
+
+
+def run_hopp_component(prob, capacities):
+    for name, capacity in capacities.items():
+        prob.set_val(name, capacity)
+    prob.run_model()
+    return {name: prob.get_val(name).copy() for name in ["electricity", "CapEx", "OpEx"]}
+
+
+def test_incremental_resimulation(tmp_path, monkeypatch, subtests):
+    # HOPP writes its logs to the working directory
+    monkeypatch.chdir(tmp_path)
+    resized = {
+        "battery_capacity_kwh": 200000., "battery_capacity_kw": 80000., "pv_capacity_kw": 150000.
+    }
+
+    problems = {}
+    tech_configs = {"incremental": hopp_tech_config(), "fresh": hopp_tech_config(**resized)}
+    for name, tech_config in tech_configs.items():
+        problems[name] = om.Problem(reports=False)
+        problems[name].model.add_subsystem(
+            "hopp",
+            HOPPComponent(tech_config=tech_config, plant_config={"plant": {"plant_life": 30}}),
+            promotes=["*"],
+        )
+        problems[name].setup()
+
+    # The incremental problem first simulates the initial system, then resizes the same
+    # interface; the fresh problem builds its interface with the resized capacities
+    initial = run_hopp_component(problems["incremental"], {})
+    interface = problems["incremental"].model.hopp.hybrid_interface
+    incremental = run_hopp_component(problems["incremental"], resized)
+    fresh = run_hopp_component(problems["fresh"], {})
+
+    with subtests.test("interface reused"):
+        assert problems["incremental"].model.hopp.hybrid_interface is interface
+
+    with subtests.test("resized"):
+        assert incremental["CapEx"] != approx(initial["CapEx"])
+
+    for name in fresh:
+        with subtests.test("same as a fresh interface", output=name):
+            assert incremental[name] == approx(fresh[name], rel=1.e-12, abs=1.e-9)
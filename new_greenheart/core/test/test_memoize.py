@@ -0,0 +1,92 @@
+import numpy as np
+import openmdao.api as om
+from pytest import approx
+
+from new_greenheart.core.greenheart_model import GreenHEARTModel
+from new_greenheart.core.memoize import memoized_model
+
+
+class CountingModel(om.ExplicitComponent):
+    """A model that counts its compute calls."""
+    def initialize(self):
+        self.options.declare('plant_config', types=dict)
+        self.options.declare('tech_config', types=dict)
+
+    def setup(self):
+        self.n_computes = 0
+        self.add_input('x', val=1.0)
+        self.add_input('profile', val=np.ones(4))
+        self.add_output('f', val=np.zeros(4))
+
+    def compute(self, inputs, outputs):
+        self.n_computes += 1
+        outputs['f'] = inputs['profile'] * inputs['x']**2
+
+
+def make_problem(memoize_config):
+    prob = om.Problem(reports=False)
+    prob.model.add_subsystem(
+        'model',
+        memoized_model(CountingModel)(
+            plant_config={'plant': {}}, tech_config={}, memoize_config=memoize_config
+        ),
+        promotes=['*'],
+    )
+    prob.setup()
+    return prob
+
+
+def run_points(prob, points):
+    values = []
+    for x in points:
+        prob.set_val('x', x)
+        prob.run_model()
+        values.append(prob.get_val('f').copy())
+    return values
+
+
+def test_memoize(subtests):
+    prob = make_problem({'flag': True})
+    model = prob.model.model
+
+    with subtests.test("unchanged inputs skip compute"):
+        values = run_points(prob, [2., 2., 2.])
+        assert model.n_computes == 1
+        assert model.memo_stats == {'hits': 2, 'misses': 1}
+        assert values[-1] == approx(np.full(4, 4.))
+
+    with subtests.test("changed inputs compute"):
+        prob.set_val('profile', np.arange(4.))
+        prob.run_model()
+        assert model.n_computes == 2
+        assert prob.get_val('f') == approx(4. * np.arange(4.))
+
+    with subtests.test("one entry"):
+        run_points(prob, [1., 3., 1., 3.])
+        assert model.n_computes == 6
+
+
+def test_memoize_entries():
+    prob = make_problem({'flag': True, 'max_entries': 2})
+    model = prob.model.model
+
+    values = run_points(prob, [1., 3., 1., 3., 1., 2., 1.])
+
+    # 2. evicts 3., the least recently used point, but not 1.
+    assert model.n_computes == 3
+    assert np.array(values)[:, 0] == approx([1., 9., 1., 9., 1., 4., 1.])
+
+
+def test_memoize_config(config_file):
+    gh = GreenHEARTModel(
+        config_file,
+        {'technology_config.technologies.electrolyzer.cost_model.memoize': {'flag': True}},
+    )
+    gh.setup()
+    for price in [0.05, 0.06]:
+        gh.set_val('feedstocks.electricity_price', price)
+        gh.run()
+
+    # The electricity price does not reach the electrolyzer cost model
+    cost_model = gh.prob.model.plant.electrolyzer.dummy_electrolyzer_cost
+    assert cost_model.memo_stats == {'hits': 1, 'misses': 1}
@@ -0,0 +1,100 @@
+import os
+
+from pytest import approx
+import numpy as np
+import openmdao.api as om
+
+from new_greenheart.core.greenheart_model import GreenHEARTModel
+from new_greenheart.core.parallel_doe import ProcessPoolDOEDriver, _run_doe_case
+
+
+def doe_overrides(process_pool, recorder_file):
+    return {
+        "driver_config.driver": {
+            "optimization": {"flag": False},
+            "design_of_experiments": {
+                "flag": True,
+                "generator": "fullfact",
+                "levels": 3,
+                "run_parallel": False,
+                "debug_print": False,
+                "process_pool": {"flag": process_pool, "n_workers": 2},
+            }
+        },
+        "driver_config.recorder": {"file": recorder_file},
+        "driver_config.design_variables": {
+            "feedstocks": {
+                "electricity_rated_capacity": {
+                    "flag": True, "lower": 50., "upper": 150., "units": "kW",
+                },
+                "electricity_price": {"flag": True, "lower": 0.01, "upper": 0.1, "units": None},
+            },
+        },
+    }
+
+
+def recorded_cases(gh):
+    reader = om.CaseReader(gh.prob.get_outputs_dir() / gh.driver_config["recorder"]["file"])
+    return [reader.get_case(case) for case in reader.list_cases("root", recurse=False, out_stream=None)]
+
+
+def test_process_pool_doe(config_file, subtests):
+    serial = GreenHEARTModel(config_file, doe_overrides(False, "serial.sql"))
+    serial.run()
+    serial.prob.cleanup()
+
+    gh = GreenHEARTModel(config_file, doe_overrides(True, "pool.sql"))
+    assert isinstance(gh.prob.driver, ProcessPoolDOEDriver)
+    gh.run()
+    gh.prob.cleanup()
+
+    serial_cases = recorded_cases(serial)
+    pool_cases = recorded_cases(gh)
+
+    with subtests.test("all cases recorded"):
+        assert len(pool_cases) == len(serial_cases) == 9
+        capacities = [case.get_val("feedstocks.electricity_rated_capacity")[0] for case in pool_cases]
+        assert sorted(set(capacities)) == approx([50., 100., 150.])
+
+    with subtests.test("same order and values as serial"):
+        for serial_case, pool_case in zip(serial_cases, pool_cases):
+            for name in ["feedstocks.electricity_rated_capacity", "feedstocks.electricity_price",
+                         "feedstocks.OpEx", "electrolyzer.hydrogen"]:
+                assert pool_case.get_val(name) == approx(serial_case.get_val(name))
+
+
+def crash_on_largest_case(case):
+    """Kill the worker process on the case with the largest capacity and price."""
+    values = {name: np.asarray(value).item() for name, value in case}
+    if values["feedstocks.electricity_rated_capacity"] == 150. and values["feedstocks.electricity_price"] == 0.1:
+        os._exit(1)
+    return _run_doe_case(case)
+
+
+def test_process_pool_doe_worker_crash(config_file, subtests):
+    gh = GreenHEARTModel(config_file, doe_overrides(True, "pool.sql"))
+    gh.prob.driver.case_runner = crash_on_largest_case
+    # The success flag of each case is recorded by the driver
+    gh.setup()
+    gh.prob.driver.add_recorder(om.SqliteRecorder("driver.sql"))
+    gh.prob.driver.recording_options["includes"] = ["*"]
+    gh.run()
+    gh.prob.cleanup()
+
+    reader = om.CaseReader(gh.prob.get_outputs_dir() / "driver.sql")
+    cases = [reader.get_case(case) for case in reader.list_cases("driver", out_stream=None)]
+
+    with subtests.test("all cases recorded"):
+        assert len(cases) == 9
+
+    for case in cases:
+        capacity = case.get_val("feedstocks.electricity_rated_capacity")[0]
+        price = case.get_val("feedstocks.electricity_price")[0]
+        crashed = capacity == 150. and price == approx(0.1)
+        with subtests.test("only the crashing case failed", capacity=capacity, price=price):
+            assert case.success == (not crashed)
+        with subtests.test("outputs", capacity=capacity, price=price):
+            if crashed:
+                assert np.isnan(case.get_val("feedstocks.OpEx")[0])
+            else:
+                assert case.get_val("feedstocks.OpEx")[0] == approx(capacity * 8760 * price)
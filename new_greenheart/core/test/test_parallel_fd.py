@@ -0,0 +1,61 @@
+from pytest import approx
+import numpy as np
+
+from new_greenheart.core.greenheart_model import GreenHEARTModel
+
+
+def optimization_overrides(parallel_fd, form="forward"):
+    return {
+        "driver_config.driver": {
+            "optimization": {
+                "flag": True,
+                "solver": "SLSQP",
+                "tol": 1.e-8,
+                "max_iter": 20,
+                "step_size": 1.e-3,
+                "form": form,
+                "debug_print": False,
+                "parallel_fd": {"flag": parallel_fd, "n_workers": 2},
+            }
+        },
+        "driver_config.design_variables": {
+            "feedstocks": {
+                "electricity_rated_capacity": {
+                    "flag": True, "lower": 50., "upper": 300., "units": "kW",
+                },
+                "electricity_price": {"flag": True, "lower": 0.01, "upper": 0.1, "units": None},
+            },
+        },
+        "driver_config.objective": {"name": "feedstocks.OpEx", "ref": 1.e4},
+    }
+
+
+def test_parallel_fd(config_file, subtests):
+    serial = GreenHEARTModel(config_file, optimization_overrides(False, form="central"))
+    serial.setup()
+    serial.prob.run_model()
+
+    gh = GreenHEARTModel(config_file, optimization_overrides(True, form="central"))
+    gh.setup()
+    gh.prob.run_model()
+
+    try:
+        with subtests.test("same totals as serial"):
+            assert gh.prob.driver._compute_totals(return_format="array") == approx(
+                serial.prob.driver._compute_totals(return_format="array"), rel=1.e-6
+            )
+            # Two design variables, each perturbed in both directions
+            assert gh.parallel_fd.n_evaluations == 4
+
+        with subtests.test("dict"):
+            derivs = gh.prob.driver._compute_totals(return_format="dict")
+            assert derivs["feedstocks.OpEx"]["feedstocks.electricity_price"] == approx(
+                np.array([[100. * 8760 / 1.e4]])
+            )
+
+        with subtests.test("optimization"):
+            gh.run()
+            assert gh.get_val("feedstocks.electricity_rated_capacity", units="kW") == approx(50.)
+            assert gh.get_val("feedstocks.electricity_price") == approx(0.01)
+    finally:
+        gh.parallel_fd.close()
@@ -0,0 +1,169 @@
+import numpy as np
+import openmdao.api as om
+import rainflow
+from pytest import approx, raises
+
+from new_greenheart.converters.hydrogen.eco_tools_pem_electrolyzer import (
+    ECOElectrolyzerPerformanceModel,
+)
+from new_greenheart.converters.hydrogen.pem_clusters import rainflow_range_sums
+from new_greenheart.converters.hydrogen.pem_electrolyzer import ElectrolyzerPerformanceModel
+from new_greenheart.converters.hydrogen.vectorized_pem_electrolyzer import (
+    VectorizedECOElectrolyzerPerformanceModel,
+    VectorizedElectrolyzerPerformanceModel,
+)
+
+
+def electricity_profiles(n_scenarios, peak_kw, seed=0):
+    rng = np.random.default_rng(seed)
+    hours = np.arange(8760)
+    daily = 0.5 + 0.5 * np.sin(2 * np.pi * hours / 24)[None, :]
+    noise = 0.4 * rng.standard_normal((n_scenarios, 8760))
+    return peak_kw * np.clip(daily + noise, 0, 1.2)
+
+
+def run_component(comp, electricity, **inputs):
+    prob = om.Problem(reports=False)
+    source = om.IndepVarComp('electricity', electricity, units='kW')
+    for name, value in inputs.items():
+        source.add_output(name, value, units='MW')
+    prob.model.add_subsystem('source', source, promotes=['*'])
+    prob.model.add_subsystem('electrolyzer', comp, promotes=['*'])
+    prob.setup()
+    prob.run_model()
+    return prob
+
+
+def test_rainflow_range_sums():
+    rng = np.random.default_rng(1)
+    width = 12
+    series = []
+    for _ in range(500):
+        length = rng.integers(0, width + 1)
+        # Rounded values exercise repeated points and ties between ranges
+        series.append(np.round(3 * rng.random(length)))
+    padded = np.zeros((len(series), width))
+    for i, s in enumerate(series):
+        padded[i, :len(s)] = s
+
+    expected = [
+        0.0 if len(s) == 0 or s.max() == s.min()
+        else sum(rng * count for rng, count in rainflow.count_cycles(s, nbins=10))
+        for s in series
+    ]
+    lengths = np.array([len(s) for s in series])
+    assert rainflow_range_sums(padded, lengths) == approx(expected, abs=1e-12)
+
+
+def test_vectorized_pem_electrolyzer(subtests):
+    plant_config = {'plant': {'plant_life': 30, 'n_scenarios': 2}}
+    tech_config = {
+        'model_inputs': {
+            'shared_parameters': {'cluster_size_mw': 40},
+            'performance_parameters': {
+                'plant_life': 30,
+                'eol_eff_percent_loss': 10,
+                'uptime_hours_until_eol': 77600,
+                'include_degradation_penalty': True,
+                'turndown_ratio': 0.1,
+            },
+        }
+    }
+    electricity = electricity_profiles(2, 40000.)
+    cluster_size = np.array([40., 30.])
+
+    probs = [
+        run_component(
+            model(plant_config=plant_config, tech_config=tech_config),
+            electricity,
+            cluster_size=cluster_size,
+        )
+        for model in (ElectrolyzerPerformanceModel, VectorizedElectrolyzerPerformanceModel)
+    ]
+
+    for name in ('hydrogen', 'total_hydrogen_produced'):
+        with subtests.test(name):
+            assert probs[1][name] == approx(probs[0][name], rel=1e-12)
+
+
+def test_vectorized_eco_pem_electrolyzer(subtests):
+    plant_config = {'plant': {'plant_life': 30, 'n_scenarios': 2}}
+    tech_config = {
+        'model_inputs': {
+            'shared_parameters': {
+                'rating': 200,
+                'location': 'onshore',
+                'electrolyzer_capex': 1295,
+            },
+            'performance_parameters': {
+                'sizing': {'resize_for_enduse': False, 'size_for': 'BOL', 'hydrogen_dmd': None},
+                'cluster_rating_MW': 40,
+                'pem_control_type': 'basic',
+                'eol_eff_percent_loss': 13,
+                'uptime_hours_until_eol': 77600,
+                'include_degradation_penalty': True,
+                'turndown_ratio': 0.1,
+            },
+        }
+    }
+    electricity = electricity_profiles(2, 200000.)
+    # Only some of the clusters are run in the second scenario
+    electricity[1] *= 0.3
+
+    probs = [
+        run_component(
+            model(plant_config=plant_config, tech_config=tech_config),
+            electricity,
+            electrolyzer_size_mw=200.,
+        )
+        for model in (ECOElectrolyzerPerformanceModel, VectorizedECOElectrolyzerPerformanceModel)
+    ]
+
+    for name in ('hydrogen', 'total_hydrogen_produced', 'efficiency', 'time_until_replacement'):
+        with subtests.test(name):
+            assert probs[1][name] == approx(probs[0][name], rel=1e-10)
+
+
+def test_time_step_length(subtests):
+    tech_config = {
+        'model_inputs': {
+            'shared_parameters': {'cluster_size_mw': 40},
+            'performance_parameters': {
+                'plant_life': 30,
+                'eol_eff_percent_loss': 10,
+                'uptime_hours_until_eol': 77600,
+                'include_degradation_penalty': True,
+                'turndown_ratio': 0.1,
+            },
+        }
+    }
+
+    def run(model, n_timesteps, dt_hours):
+        plant_config = {
+            'plant': {'plant_life': 30, 'n_timesteps': n_timesteps, 'dt_hours': dt_hours}
+        }
+        return run_component(
+            model(plant_config=plant_config, tech_config=tech_config),
+            np.full(n_timesteps, 30000.),
+            cluster_size=40.,
+        )
+
+    hourly = run(VectorizedElectrolyzerPerformanceModel, 8760, 1.)
+
+    with subtests.test("half-hourly"):
+        half_hourly = run(VectorizedElectrolyzerPerformanceModel, 17520, 0.5)
+        assert half_hourly['hydrogen'][::2] == approx(hourly['hydrogen'], rel=1e-4)
+        assert half_hourly['total_hydrogen_produced'] == approx(
+            hourly['total_hydrogen_produced'], rel=1e-4
+        )
+
+    with subtests.test("shorter horizon"):
+        # A week leaves out most of the degradation within the year
+        week = run(VectorizedElectrolyzerPerformanceModel, 168, 1.)
+        assert week['total_hydrogen_produced'] == approx(
+            hourly['total_hydrogen_produced'], rel=1e-2
+        )
+
+    with subtests.test("hourly model"):
+        with raises(ValueError, match="only simulates hourly time steps"):
+            run(ElectrolyzerPerformanceModel, 17520, 0.5)
@@ -0,0 +1,64 @@
+from pytest import approx
+import numpy as np
+import openmdao.api as om
+
+from new_greenheart.core.pose_optimization import PoseOptimization
+from new_greenheart.transporters.cable import CablePerformanceModel
+
+
+def test_number_design_variables(subtests):
+    config = {
+        "driver": {"optimization": {"flag": True, "form": "forward"}},
+        "design_variables": {
+            "electrolyzer": {
+                "cluster_size": {"flag": True, "lower": 0.5, "upper": 1.5, "units": "MW"},
+            },
+            "hopp": {
+                "pv_capacity_kw": {"flag": True, "lower": 0., "upper": 2.e5, "units": "kW"},
+                "battery_capacity_kw": {"flag": False, "units": "kW"},
+                "battery_capacity_kwh": {"flag": True, "lower": 0., "upper": 4.e5, "units": "kW*h"},
+            },
+        },
+    }
+
+    with subtests.test("forward"):
+        assert PoseOptimization(config).get_number_design_variables() == 3
+
+    with subtests.test("central"):
+        config["driver"]["optimization"]["form"] = "central"
+        assert PoseOptimization(config).get_number_design_variables() == 6
+
+
+def test_approximate_partials():
+    config = {
+        "general": {"folder_output": "output"},
+        "driver": {
+            "optimization": {
+                "flag": True,
+                "solver": "SLSQP",
+                "tol": 1.e-5,
+                "max_iter": 10,
+                "step_size": 1.e-6,
+                "form": "forward",
+                "debug_print": False,
+                "derivatives": "partials",
+            }
+        },
+    }
+
+    prob = om.Problem(reports=False)
+    prob.model.add_subsystem('source', om.IndepVarComp('x', np.array([1., 2.]), units='kW'))
+    cable = prob.model.add_subsystem('cable', CablePerformanceModel())
+    prob.model.add_subsystem('sink', om.ExecComp('y = sum(x**2)', x={'val': np.ones(2), 'units': 'kW'}))
+    prob.model.connect('source.x', 'cable.electricity_input')
+    prob.model.connect('cable.electricity_output', 'sink.x')
+
+    myopt = PoseOptimization(config)
+    myopt.set_driver(prob)
+    myopt.approximate_partials([cable])
+    prob.setup()
+    prob.run_model()
+
+    # The cable declares no partials, so the totals are only nonzero if it is finite differenced
+    totals = prob.compute_totals('sink.y', 'source.x')
+    assert totals['sink.y', 'source.x'] == approx(np.array([[2., 4.]]), rel=1.e-5)
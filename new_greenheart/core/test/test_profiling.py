@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+
+from new_greenheart.core.greenheart_model import GreenHEARTModel
+
+
+def test_profile_run(config_file, subtests, capsys):
+    gh = GreenHEARTModel(config_file, overrides={"driver_config.profile": {"flag": True}})
+
+    gh.run()
+    gh.set_val("feedstocks.electricity_rated_capacity", 200., units="kW")
+    gh.run()
+    gh.run()
+
+    # A bare file name is placed in folder_output next to the config
+    with open(Path(config_file).parent / "output" / "profile.json") as f:
+        profile = json.load(f)
+    components = {c["component"]: c for c in profile["components"]}
+
+    with subtests.test("table not printed"):
+        assert "plant.feedstocks" not in capsys.readouterr().out
+
+    with subtests.test("profiled components"):
+        assert set(components) == {
+            "plant.feedstocks",
+            "plant.feedstocks_to_electrolyzer_cable",
+            "plant.electrolyzer.dummy_electrolyzer_performance",
+            "plant.electrolyzer.dummy_electrolyzer_cost",
+        }
+
+    with subtests.test("call count"):
+        assert components["plant.feedstocks"]["calls"] == 3
+
+    with subtests.test("output changes"):
+        assert components["plant.feedstocks"]["output_changes"] == 2
+
+    with subtests.test("sorted by wall time"):
+        wall_times = [c["wall_time_s"] for c in profile["components"]]
+        assert wall_times == sorted(wall_times, reverse=True)
+
+    with subtests.test("run time"):
+        assert profile["run_time_s"] >= sum(wall_times)
+
+
+def test_profile_memory(config_file, tmp_path, capsys):
+    profile_file = tmp_path / "profiles" / "mem.json"
+    profile_file.parent.mkdir()
+    profile_config = {"flag": True, "track_memory": True, "file": str(profile_file), "print_table": True}
+    gh = GreenHEARTModel(config_file, overrides={"driver_config.profile": profile_config})
+    gh.run()
+
+    with open(profile_file) as f:
+        profile = json.load(f)
+
+    feedstocks = next(c for c in profile["components"] if c["component"] == "plant.feedstocks")
+    assert feedstocks["peak_memory_bytes"] > 0
+    assert "plant.feedstocks" in capsys.readouterr().out
@@ -0,0 +1,57 @@
+from pytest import approx
+import numpy as np
+
+from new_greenheart.core.greenheart_model import GreenHEARTModel
+from new_greenheart.core.recorders import ColumnCaseReader
+
+
+HYDROGEN = "plant.electrolyzer.dummy_electrolyzer_performance.hydrogen"
+ELECTRICITY = "plant.feedstocks.electricity"
+
+
+def run_cases(config_file, recorder_config, rated_capacities=(100., 200., 300.)):
+    gh = GreenHEARTModel(
+        config_file, {"driver_config.recorder": {"file": "cases", "format": "columns", **recorder_config}}
+    )
+    for rated_capacity in rated_capacities:
+        gh.set_val("feedstocks.electricity_rated_capacity", rated_capacity, units="kW")
+        gh.run()
+    return ColumnCaseReader(gh.recorder.path)
+
+
+def test_column_recorder(config_file, subtests):
+    reader = run_cases(
+        config_file,
+        {"chunk_size": 2, "dtypes": {"*electricity*": "float32"}, "excludes": ["*oxygen*"]},
+    )
+
+    with subtests.test("cases"):
+        assert reader.list_sources() == ["root"]
+        assert reader.num_cases() == 3
+        assert reader.get_column("_success") == approx([1, 1, 1])
+
+    with subtests.test("column across chunks"):
+        hydrogen = reader.get_column(HYDROGEN)
+        assert hydrogen.shape == (3, 8760)
+        assert hydrogen.dtype == np.float64
+        assert hydrogen[:, 0] == approx([10., 20., 30.])
+
+    with subtests.test("downcast"):
+        electricity = reader.get_column(ELECTRICITY)
+        assert electricity.dtype == np.float32
+        assert electricity[:, 0] == approx([100., 200., 300.])
+
+    with subtests.test("excludes"):
+        assert not any("oxygen" in column for column in reader.list_columns())
+
+
+def test_column_recorder_summary_only(config_file):
+    reader = run_cases(config_file, {"summary_only": True})
+
+    assert HYDROGEN not in reader.list_columns()
+    assert reader.get_column(f"{HYDROGEN}:sum") == approx([87600., 175200., 262800.])
+    assert reader.get_column(f"{HYDROGEN}:max") == approx([10., 20., 30.])
+    # Scalars are stored in full
+    assert reader.get_column("plant.feedstocks.electricity_rated_capacity")[:, 0] == approx(
+        [100., 200., 300.]
+    )
@@ -0,0 +1,147 @@
+from pytest import approx, raises
+import numpy as np
+import openmdao.api as om
+
+from new_greenheart.core.greenheart_model import GreenHEARTModel
+from new_greenheart.core.representative_periods import (
+    RepresentativePeriodComp,
+    annual_mean,
+    annual_sum,
+    select_representative_periods,
+)
+
+
+def make_profile():
+    """A year of days that each follow one of three daily shapes."""
+    hours = np.arange(24)
+    shapes = np.stack([np.sin(np.pi * hours / 24), np.full(24, 0.2), hours / 24])
+    day_types = np.arange(365) % 7 // 3
+    return shapes[day_types].ravel(), day_types
+
+
+def test_select_representative_periods(subtests):
+    profile, day_types = make_profile()
+    periods, weights = select_representative_periods([profile], 3, 24)
+
+    with subtests.test("one period per day type"):
+        assert np.all(np.diff(periods) > 0)
+        assert sorted(day_types[periods]) == [0, 1, 2]
+
+    with subtests.test("weights"):
+        assert weights == approx(np.bincount(day_types)[day_types[periods]])
+        assert np.sum(weights) == approx(365)
+
+    with subtests.test("annual totals"):
+        plant_config = {
+            'plant': {
+                'representative_periods': {
+                    'flag': True,
+                    'period_hours': 24,
+                    'periods': periods.tolist(),
+                    'weights': weights.tolist(),
+                }
+            }
+        }
+        reduced = profile.reshape(365, 24)[periods].ravel()
+        assert annual_sum(reduced, plant_config) == approx(np.sum(profile))
+        assert annual_mean(reduced, plant_config) == approx(np.mean(profile))
+
+    with subtests.test("too many periods"):
+        with raises(ValueError, match="between 1 and 365"):
+            select_representative_periods([profile], 366, 24)
+
+
+def test_representative_period_comp():
+    plant_config = {
+        'plant': {
+            'n_scenarios': 2,
+            'representative_periods': {
+                'flag': True,
+                'period_hours': 3,
+                'periods': [1, 4],
+                'weights': [2., 3.],
+            },
+        }
+    }
+    prob = om.Problem(reports=False)
+    prob.model.add_subsystem(
+        'ivc', om.IndepVarComp('electricity', val=np.zeros((2, 18)), units='kW'), promotes=['*']
+    )
+    prob.model.add_subsystem(
+        'reduction',
+        RepresentativePeriodComp(plant_config=plant_config, commodity='electricity'),
+    )
+    prob.model.connect('electricity', 'reduction.electricity_input')
+    prob.setup(force_alloc_complex=True)
+    prob.set_val('electricity', np.arange(36.).reshape(2, 18))
+    prob.run_model()
+
+    output = prob.get_val('reduction.electricity_output', units='kW')
+    assert output == approx(np.array([[3., 4., 5., 12., 13., 14.], [21., 22., 23., 30., 31., 32.]]))
+
+    partials = prob.check_partials(method='cs', out_stream=None)
+    for comp_partials in partials.values():
+        for partial in comp_partials.values():
+            assert partial['abs error'].forward == approx(0.)
+
+
+def test_representative_period_model(config_file, subtests):
+    # Daily cycles whose amplitude follows the seasons, with day-to-day noise, so that no
+    # handful of days reproduces the year exactly
+    hours = np.arange(8760)
+    rng = np.random.default_rng(0)
+    season = 0.6 + 0.3 * np.cos(2 * np.pi * hours / 8760)
+    day = 0.5 + 0.5 * np.sin(2 * np.pi * hours / 24)
+    noise = np.repeat(rng.uniform(0.8, 1.2, 365), 24)
+    np.save("availability.npy", season * day * noise)
+
+    gh = GreenHEARTModel(
+        config_file,
+        {
+            'technology_config.technologies.feedstocks.electricity': {
+                'rated_capacity': 40000.,
+                'capacity_units': 'kW',
+                'price': 0.05,
+                'availability_profile': 'availability.npy',
+            },
+            'technology_config.technologies.electrolyzer.performance_model.model':
+                'vectorized_pem_electrolyzer_performance',
+            'technology_config.technologies.electrolyzer.model_inputs': {
+                'shared_parameters': {'cluster_size_mw': 40},
+                'performance_parameters': {
+                    'plant_life': 30,
+                    'eol_eff_percent_loss': 10,
+                    'uptime_hours_until_eol': 77600,
+                    'include_degradation_penalty': True,
+                    'turndown_ratio': 0.1,
+                },
+            },
+            'plant_config.plant.representative_periods': {'flag': True, 'n_periods': 12},
+        },
+    )
+    gh.run()
+
+    config = gh.plant_config['plant']['representative_periods']
+    with subtests.test("periods"):
+        assert len(config['periods']) == 12
+        assert np.sum(config['weights']) == approx(365.)
+        assert gh.get_val("electrolyzer.hydrogen").shape == (12 * 24,)
+        assert gh.baseline.get_val("electrolyzer.hydrogen").shape == (8760,)
+
+    with subtests.test("annual electricity"):
+        assert annual_sum(gh.get_val("electrolyzer.electricity"), gh.plant_config) == approx(
+            np.sum(gh.baseline.get_val("electrolyzer.electricity")), rel=0.005
+        )
+
+    # The degradation of the electrolyzer depends on the sequence of the time series, so the
+    # hydrogen is less accurate than the electricity
+    with subtests.test("annual hydrogen"):
+        assert gh.get_val("electrolyzer.total_hydrogen_produced") == approx(
+            gh.baseline.get_val("electrolyzer.total_hydrogen_produced"), rel=0.03
+        )
+
+    with subtests.test("reduction error"):
+        errors = gh.reduction_error(out_stream=None)
+        assert 0. < errors['electrolyzer.total_hydrogen_produced'][2] < 0.03
+        # The feedstock runs on the full year before the reduction
+        assert 'feedstocks.electricity_OpEx' not in errors
@@ -0,0 +1,33 @@
+import pytest
+import openmdao.api as om
+
+from new_greenheart.core.supported_models import ModelRegistry, supported_models
+
+
+def test_registered_model_paths_resolve():
+    for name in supported_models:
+        assert issubclass(supported_models[name], om.ExplicitComponent), name
+
+
+def test_lazy_registration(subtests):
+    registry = ModelRegistry({'cable': 'new_greenheart.transporters.cable:CablePerformanceModel'})
+
+    with subtests.test("not imported before lookup"):
+        assert 'cable' in registry
+        assert 'cable' not in registry._models
+
+    with subtests.test("imported on lookup"):
+        assert registry['cable'].__name__ == 'CablePerformanceModel'
+
+    with subtests.test("register class"):
+        registry['my_pipe'] = om.ExecComp
+        assert registry['my_pipe'] is om.ExecComp
+        assert registry.model_path('my_pipe') == 'openmdao.components.exec_comp:ExecComp'
+
+    with subtests.test("unknown model"):
+        with pytest.raises(KeyError):
+            registry['not_a_model']
+
+    with subtests.test("invalid path"):
+        with pytest.raises(ValueError):
+            registry.register('bad', 'new_greenheart.transporters.cable')
@@ -0,0 +1,108 @@
+import numpy as np
+import openmdao.api as om
+from pytest import approx
+
+from new_greenheart.core.surrogate import QuadraticResponseSurface, surrogate_model
+
+
+class QuadraticModel(om.ExplicitComponent):
+    """A cheap model that a quadratic response surface fits exactly."""
+    n_computes = 0
+
+    def initialize(self):
+        self.options.declare('plant_config', types=dict)
+        self.options.declare('tech_config', types=dict)
+
+    def setup(self):
+        self.add_input('x', val=1.0)
+        self.add_input('y', val=1.0)
+        self.add_input('profile', val=np.ones(4))
+        self.add_output('f', val=np.zeros(4))
+        self.add_output('g', val=0.0)
+
+    def compute(self, inputs, outputs):
+        QuadraticModel.n_computes += 1
+        x = inputs['x']
+        y = inputs['y']
+        outputs['f'] = inputs['profile'] * (1. + 2. * x - x * y + 0.5 * y**2)
+        outputs['g'] = 3. * x**2 - y
+
+
+def make_problem(surrogate_config):
+    prob = om.Problem(reports=False)
+    prob.model.add_subsystem(
+        'model',
+        surrogate_model(QuadraticModel)(
+            plant_config={'plant': {}}, tech_config={}, surrogate_config=surrogate_config
+        ),
+        promotes=['*'],
+    )
+    prob.setup()
+    return prob
+
+
+def test_response_surface():
+    rng = np.random.default_rng(0)
+    x = rng.uniform([-2., 0.], [3., 5.], size=(20, 2))
+    y = np.stack([x[:, 0] * x[:, 1] + 4., x[:, 0]**2 - 2. * x[:, 1]], axis=1)
+    surface = QuadraticResponseSurface([-2., 0.], [3., 5.]).fit(x, y)
+
+    assert surface.n_terms == 6
+    assert surface.predict([[1., 2.]]) == approx(np.array([[6., -3.]]))
+
+
+def test_surrogate(subtests, tmp_path, capsys):
+    surrogate_config = {
+        'flag': True,
+        'inputs': {'x': {'lower': 0., 'upper': 2.}, 'y': {'lower': -1., 'upper': 1.}},
+        'file': str(tmp_path / 'surrogate.npz'),
+        'n_validation': 5,
+    }
+    prob = make_problem(surrogate_config)
+    model = prob.model.model
+    prob.set_val('profile', np.arange(4.))
+
+    with subtests.test("trained and saved"):
+        QuadraticModel.n_computes = 0
+        prob.run_model()
+        assert QuadraticModel.n_computes == 12 + 5
+        assert (tmp_path / 'surrogate.npz').exists()
+        assert model.validation_error['max'] < 1e-10
+        assert capsys.readouterr().out == ''
+
+    with subtests.test("prediction"):
+        QuadraticModel.n_computes = 0
+        prob.set_val('x', 1.5)
+        prob.set_val('y', -0.5)
+        prob.run_model()
+        assert QuadraticModel.n_computes == 0
+        assert prob.get_val('f') == approx(np.arange(4.) * (1. + 3. + 0.75 + 0.125))
+        assert prob.get_val('g') == approx(7.25)
+
+    with subtests.test("outside the bounds"):
+        prob.set_val('x', 3.)
+        prob.run_model()
+        assert QuadraticModel.n_computes == 1
+        assert prob.get_val('g') == approx(27.5)
+
+    with subtests.test("fixed input changed"):
+        prob.set_val('x', 1.)
+        prob.set_val('profile', np.ones(4))
+        prob.run_model()
+        assert QuadraticModel.n_computes == 2
+        assert model.surrogate_stats == {'surrogate': 2, 'model': 2}
+
+    with subtests.test("loaded from file"):
+        QuadraticModel.n_computes = 0
+        prob = make_problem(surrogate_config)
+        prob.set_val('profile', np.arange(4.))
+        prob.run_model()
+        assert QuadraticModel.n_computes == 0
+        assert prob.get_val('g') == approx(2.)
+
+    with subtests.test("verbose"):
+        prob = make_problem({**surrogate_config, 'verbose': True})
+        prob.set_val('profile', np.arange(4.))
+        prob.run_model()
+        assert QuadraticModel.n_computes == 0
+        assert capsys.readouterr().out == prob.model.model.surrogate_summary() + '\n'
@@ -0,0 +1,58 @@
+import os
+
+from pytest import approx
+
+from new_greenheart.converters.hydrogen.dummy_electrolyzer import DummyElectrolyzerPerformanceModel
+from new_greenheart.core.supported_models import supported_models
+from new_greenheart.core.sweep import run_sweep
+
+
+class CrashingElectrolyzerPerformanceModel(DummyElectrolyzerPerformanceModel):
+    def compute(self, inputs, outputs):
+        os._exit(1)
+
+
+def test_sweep_with_overrides(config_file, subtests):
+    overrides = [
+        {"technology_config.technologies.feedstocks.electricity.rated_capacity": 100.},
+        {"technology_config.technologies.feedstocks.electricity.rated_capacity": 200.},
+        {"technology_config.technologies.not_a_tech.electricity.rated_capacity": 300.},
+    ]
+
+    results = run_sweep(base_config=config_file, overrides=overrides, n_workers=2, verbose=False)
+
+    with subtests.test("case order"):
+        assert list(results.index) == [0, 1, 2]
+    with subtests.test("status"):
+        assert list(results['status']) == ['success', 'success', 'failed']
+    with subtests.test("failed case error"):
+        assert 'KeyError' in results.loc[2, 'error']
+    with subtests.test("opex"):
+        assert results.loc[0, 'feedstocks.OpEx'] == approx(100. * 8760 * 0.05)
+        assert results.loc[1, 'feedstocks.OpEx'] == approx(200. * 8760 * 0.05)
+    with subtests.test("total capex"):
+        assert results.loc[0, 'total_CapEx'] == approx(1.e6)
+
+
+def test_sweep_worker_crash(config_file, monkeypatch):
+    # Registered in this process and inherited by the forked workers
+    monkeypatch.setitem(supported_models, "crashing_electrolyzer", CrashingElectrolyzerPerformanceModel)
+    model = "technology_config.technologies.electrolyzer.performance_model.model"
+    overrides = [{model: "dummy_electrolyzer_performance"} for _ in range(6)]
+    overrides[1] = {model: "crashing_electrolyzer"}
+
+    results = run_sweep(base_config=config_file, overrides=overrides, n_workers=2, verbose=False)
+
+    assert list(results['status']) == ['success', 'failed'] + ['success'] * 4
+    assert results.loc[1, 'error'] == 'Worker process terminated abruptly'
+
+
+def test_sweep_keeps_working_directory(config_file, tmp_path, monkeypatch):
+    config_file = os.path.abspath(config_file)
+    os.makedirs(tmp_path / "elsewhere")
+    monkeypatch.chdir(tmp_path / "elsewhere")
+
+    results = run_sweep(config_files=[config_file], n_workers=1, verbose=False)
+
+    assert list(results['status']) == ['success']
+    assert os.getcwd() == str(tmp_path / "elsewhere")
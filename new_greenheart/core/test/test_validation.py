@@ -0,0 +1,65 @@
+import yaml
+
+from new_greenheart.core.inputs import validation
+from new_greenheart.core.inputs.validation import load_plant_yaml
+
+
+SITE = {
+    "latitude": 40.,
+    "longitude": -105.,
+    "elevation_m": 1600.,
+    "time_zone": -7,
+    "boundaries": [],
+}
+
+
+def write_plant_config(tmp_path, site=SITE):
+    """Write a plant config whose site is included from a separate file."""
+    with open(tmp_path / "site.yaml", "w") as f:
+        yaml.safe_dump(site, f)
+    with open(tmp_path / "plant_config.yaml", "w") as f:
+        f.write(
+            "name: plant_config\n"
+            "description: Simple test plant\n"
+            "site: !include site.yaml\n"
+            "plant:\n"
+            "  plant_life: 30\n"
+        )
+    return str(tmp_path / "plant_config.yaml")
+
+
+def test_cached_validation(tmp_path, subtests):
+    validation.clear_config_cache()
+    plant_config = write_plant_config(tmp_path)
+
+    first = load_plant_yaml(plant_config)
+    second = load_plant_yaml(plant_config)
+
+    with subtests.test("defaults"):
+        assert first["plant"]["n_timesteps"] == 8760
+    with subtests.test("validator compiled once"):
+        assert validation._get_validator(validation.fschema_plant, True) is validation._get_validator(
+            validation.fschema_plant, True
+        )
+    with subtests.test("cached copy"):
+        assert len(validation._config_cache) == 1
+        assert second == first
+        assert second is not first
+
+    with subtests.test("copies are independent"):
+        second["plant"]["plant_life"] = 20
+        assert load_plant_yaml(plant_config)["plant"]["plant_life"] == 30
+
+    with subtests.test("changed include"):
+        write_plant_config(tmp_path, {**SITE, "latitude": 30.})
+        assert load_plant_yaml(plant_config)["site"]["latitude"] == 30.
+        assert len(validation._config_cache) == 2
+
+
+def test_skip_validation(tmp_path):
+    plant_config = write_plant_config(tmp_path)
+
+    config = load_plant_yaml(plant_config, validate=False)
+
+    assert config["site"]["latitude"] == 40.
+    assert "n_timesteps" not in config["plant"]
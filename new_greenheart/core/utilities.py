@@ -1,6 +1,7 @@
 from typing import Any, Iterable, Tuple, Union, Callable
 import attrs
 import json
+import os
 import numpy as np
 from attrs import define, Attribute
 from collections import OrderedDict
@@ -57,6 +58,133 @@ def create_xdsm_from_config(config, output_file='connections_xdsm'):
     print(f"XDSM diagram written to {output_file}.tex")
 
 
+# Config keys whose values are paths to input files
+FILE_PATH_KEY_SUFFIXES = ('_file', 'filepath', '_profile')
+
+
+def resolve_file_paths(config, root):
+    """
+    Make the relative input file paths in a config absolute, in place.
+
+    The values of keys that end in one of `FILE_PATH_KEY_SUFFIXES`, e.g.
+    `wind_resource_filepath`, are resolved against `root` if the file exists there, so a
+    config resolves its files the same way whatever the working directory of the process.
+
+    Parameters
+    ----------
+    config : dict or list
+        Configuration to resolve the paths of, searched recursively.
+    root : str
+        Directory that relative paths are relative to, usually that of the top-level config.
+    """
+    items = config.items() if isinstance(config, dict) else enumerate(config)
+    for key, value in items:
+        if isinstance(value, (dict, list)):
+            resolve_file_paths(value, root)
+        elif (
+            isinstance(key, str)
+            and key.endswith(FILE_PATH_KEY_SUFFIXES)
+            and isinstance(value, str)
+            and value
+            and not os.path.isabs(value)
+            and os.path.exists(os.path.join(root, value))
+        ):
+            config[key] = os.path.abspath(os.path.join(root, value))
+
+
+def get_n_scenarios(plant_config):
+    """
+    Return the number of scenarios evaluated in a single batched model pass.
+
+    Parameters
+    ----------
+    plant_config : dict
+        Plant configuration dictionary. The number of scenarios is read from
+        `plant_config['plant']['n_scenarios']` and defaults to 1.
+
+    Returns
+    -------
+    int
+        Number of scenarios carried along the leading array dimension.
+    """
+    n_scenarios = int(plant_config.get('plant', {}).get('n_scenarios', 1))
+    if n_scenarios < 1:
+        raise ValueError(f"n_scenarios must be at least 1, but {n_scenarios} was given")
+    return n_scenarios
+
+
+HOURS_PER_YEAR = 8760
+
+
+def get_n_timesteps(plant_config):
+    """
+    Return the number of time steps in the simulated time series.
+
+    Parameters
+    ----------
+    plant_config : dict
+        Plant configuration dictionary. The number of time steps is read from
+        `plant_config['plant']['n_timesteps']` and defaults to 8760.
+
+    Returns
+    -------
+    int
+        Number of time steps carried along the last array dimension.
+    """
+    n_timesteps = int(plant_config.get('plant', {}).get('n_timesteps', HOURS_PER_YEAR))
+    if n_timesteps < 1:
+        raise ValueError(f"n_timesteps must be at least 1, but {n_timesteps} was given")
+    return n_timesteps
+
+
+def get_dt_hours(plant_config):
+    """
+    Return the length of a time step in hours.
+
+    Parameters
+    ----------
+    plant_config : dict
+        Plant configuration dictionary. The time step is read from
+        `plant_config['plant']['dt_hours']` and defaults to 1.
+
+    Returns
+    -------
+    float
+        Length of a time step in hours.
+    """
+    dt_hours = float(plant_config.get('plant', {}).get('dt_hours', 1.))
+    if dt_hours <= 0:
+        raise ValueError(f"dt_hours must be greater than 0, but {dt_hours} was given")
+    return dt_hours
+
+
+def get_scenario_shape(plant_config, shape=()):
+    """
+    Prepend the scenario dimension to a variable shape when running in batched mode.
+
+    With a single scenario the shape is returned unchanged so that non-batched
+    models keep their original variable shapes.
+
+    Parameters
+    ----------
+    plant_config : dict
+        Plant configuration dictionary.
+    shape : int or tuple, optional
+        Shape of the variable for a single scenario. Defaults to a scalar.
+
+    Returns
+    -------
+    tuple
+        Shape of the variable including the scenario dimension, if any.
+    """
+    if isinstance(shape, int):
+        shape = (shape,)
+    n_scenarios = get_n_scenarios(plant_config)
+    if n_scenarios == 1:
+        return tuple(shape) if shape else (1,)
+    return (n_scenarios, *shape)
+
+
 def merge_inputs(dict1, dict2):
     """Merges two dictionaries and raises ValueError if duplicate keys exist."""
     common_keys = dict1.keys() & dict2.keys()
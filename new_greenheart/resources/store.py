@@ -0,0 +1,221 @@
+"""
+A process-wide store of parsed weather resources and time series profiles.
+
+The PySAM wind and solar models and the HOPP site each build a HOPP `WindResource` or
+`SolarResource`, which parses the SRW or CSV weather file as text. The store parses each file
+once per process, keyed by the resource type, file, location, year, and hub height, and hands
+the same resource object to every component that asks for it, so the resources must be
+treated as read-only.
+
+The parsed data is also persisted as `.npy` files in a `.resource_cache` directory next to the
+weather file. Other processes, e.g. sweep workers, memory-map that copy instead of parsing
+the text again. The copy is keyed by the size and modification time of the weather file, so
+it is ignored once the file changes. If the directory of the weather file is not writable,
+the copy is skipped.
+
+Time series profiles, e.g. hourly feedstock availability or prices, are read the same way:
+`.npy` files are memory-mapped directly and CSV files are converted to a persisted `.npy`
+copy once, which is memory-mapped from then on.
+"""
+
+import contextlib
+import os
+
+import numpy as np
+import pandas as pd
+from hopp.simulation.technologies.resource import SolarResource, WindResource
+from hopp.simulation.technologies.sites import site_info
+
+from new_greenheart.core.cache import SimulationCache, canonical_key
+
+
+# The resources parsed by this process, keyed by their store keys
+_resources = {}
+
+
+def _resource_key(kind, filepath, **parameters):
+    stat = os.stat(filepath)
+    return canonical_key({
+        'kind': kind,
+        'file': os.path.abspath(filepath),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        **parameters,
+    })
+
+
+def _persistent_cache(filepath):
+    try:
+        return SimulationCache(os.path.join(os.path.dirname(os.path.abspath(filepath)), '.resource_cache'))
+    except OSError:
+        return None
+
+
+def _to_entry(resource):
+    """Split a resource into its data arrays and its other, JSON-serializable attributes."""
+    entry = {'attributes': {name: value for name, value in vars(resource).items() if name != '_data'}}
+    for name, value in resource.data.items():
+        entry[f'data.{name}'] = value
+    return entry
+
+
+def _from_entry(resource_class, entry):
+    """Rebuild a resource from a persisted entry without parsing its weather file."""
+    resource = resource_class.__new__(resource_class)
+    attributes = dict(entry['attributes'])
+    if attributes.get('file_resource_heights'):
+        # JSON turns the integer heights into strings
+        attributes['file_resource_heights'] = {
+            int(height): filename for height, filename in attributes['file_resource_heights'].items()
+        }
+    resource.__dict__.update(attributes)
+
+    # PySAM takes the resource data as lists rather than arrays
+    resource._data = {
+        name[len('data.'):]: value.tolist() if isinstance(value, np.ndarray) else value
+        for name, value in entry.items() if name.startswith('data.')
+    }
+    return resource
+
+
+def _get_resource(resource_class, kind, filepath, parameters, create):
+    key = _resource_key(kind, filepath, **parameters)
+    resource = _resources.get(key)
+    if resource is not None:
+        return resource
+
+    cache = _persistent_cache(filepath)
+    entry = cache.get(key) if cache is not None else None
+    if entry is not None:
+        resource = _from_entry(resource_class, entry)
+    else:
+        resource = create()
+        if cache is not None:
+            with contextlib.suppress(OSError):
+                cache.put(key, _to_entry(resource))
+
+    _resources[key] = resource
+    return resource
+
+
+def get_wind_resource(lat, lon, year, hub_height, filepath="", **kwargs):
+    """
+    Return the shared `WindResource` of a wind resource file.
+
+    Resources without a file are downloaded by HOPP and are not shared.
+
+    Args:
+        lat (float): Latitude of the site.
+        lon (float): Longitude of the site.
+        year (int): Year of the resource.
+        hub_height (float): Turbine hub height in m.
+        filepath (str, optional): Path to the SRW resource file. Defaults to "".
+        kwargs: Other arguments of `WindResource`.
+
+    Returns:
+        WindResource: The resource.
+    """
+    def create():
+        return WindResource(lat, lon, year, wind_turbine_hub_ht=hub_height, filepath=filepath, **kwargs)
+
+    if not filepath or not os.path.isfile(filepath):
+        return create()
+    parameters = {'lat': lat, 'lon': lon, 'year': year, 'hub_height': hub_height, **kwargs}
+    return _get_resource(WindResource, 'wind', filepath, parameters, create)
+
+
+def get_solar_resource(lat, lon, year, filepath="", **kwargs):
+    """
+    Return the shared `SolarResource` of a solar resource file.
+
+    Resources without a file are downloaded by HOPP and are not shared.
+
+    Args:
+        lat (float): Latitude of the site.
+        lon (float): Longitude of the site.
+        year (int): Year of the resource.
+        filepath (str, optional): Path to the CSV resource file. Defaults to "".
+        kwargs: Other arguments of `SolarResource`.
+
+    Returns:
+        SolarResource: The resource.
+    """
+    def create():
+        return SolarResource(lat, lon, year, filepath=filepath, **kwargs)
+
+    if not filepath or not os.path.isfile(filepath):
+        return create()
+    parameters = {'lat': lat, 'lon': lon, 'year': year, **kwargs}
+    return _get_resource(SolarResource, 'solar', filepath, parameters, create)
+
+
+def _read_csv_profile(filepath):
+    # One column per profile, with a header row
+    values = pd.read_csv(filepath).to_numpy(dtype=float).T
+    return values[0] if len(values) == 1 else values
+
+
+def get_profile(filepath):
+    """
+    Return the shared, read-only time series profile of a `.npy` or CSV file.
+
+    A `.npy` file is memory-mapped. A CSV file has a header row and one column per profile,
+    e.g. per scenario; it is parsed once and memory-mapped from its persisted `.npy` copy
+    afterwards.
+
+    Args:
+        filepath (str): Path to the `.npy` or CSV file.
+
+    Returns:
+        np.ndarray: The profile, or an array with one profile per row for a CSV file with
+        several columns.
+    """
+    filepath = str(filepath)
+    if filepath.endswith('.npy'):
+        # Memory-mapping is cheap, and np.load picks up changes to the file
+        return np.load(filepath, mmap_mode='r')
+    if not filepath.endswith('.csv'):
+        raise ValueError(f"Profiles must be .npy or .csv files, but {filepath} was given")
+
+    key = _resource_key('profile', filepath)
+    profile = _resources.get(key)
+    if profile is not None:
+        return profile
+
+    cache = _persistent_cache(filepath)
+    entry = cache.get(key) if cache is not None else None
+    if entry is not None:
+        profile = entry['profile']
+    else:
+        profile = _read_csv_profile(filepath)
+        profile.flags.writeable = False
+        if cache is not None:
+            with contextlib.suppress(OSError):
+                cache.put(key, {'profile': profile})
+                # Memory-mapped from the persisted copy, like in other processes
+                entry = cache.get(key)
+                if entry is not None:
+                    profile = entry['profile']
+
+    _resources[key] = profile
+    return profile
+
+
+@contextlib.contextmanager
+def shared_site_resources():
+    """
+    Make HOPP `SiteInfo` objects created within the context take their wind and solar
+    resources from the store.
+    """
+    def wind_resource(lat, lon, year, wind_turbine_hub_ht, filepath="", **kwargs):
+        return get_wind_resource(lat, lon, year, wind_turbine_hub_ht, filepath=str(filepath), **kwargs)
+
+    def solar_resource(lat, lon, year, filepath="", **kwargs):
+        return get_solar_resource(lat, lon, year, filepath=str(filepath), **kwargs)
+
+    original = site_info.WindResource, site_info.SolarResource
+    site_info.WindResource, site_info.SolarResource = wind_resource, solar_resource
+    try:
+        yield
+    finally:
+        site_info.WindResource, site_info.SolarResource = original
@@ -0,0 +1,66 @@
+import shutil
+from pathlib import Path
+
+from hopp.simulation.technologies.sites import SiteInfo
+
+from new_greenheart.resources import store
+
+
+WEATHER_DIR = Path(__file__).parents[3] / "examples" / "06_hopp_h2" / "weather"
+WIND_FILE = "47.5233_-92.5366_windtoolkit_2013_60min_100m_120m.srw"
+SOLAR_FILE = "47.5233_-92.5366_psmv3_60_2013.csv"
+LAT, LON, YEAR = 47.5233, -92.5366, 2013
+
+
+def copy_weather(tmp_path):
+    shutil.copy(WEATHER_DIR / "wind" / WIND_FILE, tmp_path / WIND_FILE)
+    shutil.copy(WEATHER_DIR / "solar" / SOLAR_FILE, tmp_path / SOLAR_FILE)
+    return str(tmp_path / WIND_FILE), str(tmp_path / SOLAR_FILE)
+
+
+def test_resource_store(tmp_path, monkeypatch, subtests):
+    monkeypatch.setattr(store, "_resources", {})
+    wind_file, solar_file = copy_weather(tmp_path)
+
+    wind = store.get_wind_resource(LAT, LON, YEAR, 115., filepath=wind_file)
+    solar = store.get_solar_resource(LAT, LON, YEAR, filepath=solar_file)
+
+    with subtests.test("shared within the process"):
+        assert store.get_wind_resource(LAT, LON, YEAR, 115., filepath=wind_file) is wind
+        assert store.get_solar_resource(LAT, LON, YEAR, filepath=solar_file) is solar
+        assert store.get_wind_resource(LAT, LON, YEAR, 100., filepath=wind_file) is not wind
+
+    with subtests.test("persisted copy"):
+        assert (tmp_path / ".resource_cache").is_dir()
+        # A new process starts with an empty store and loads the persisted copy
+        monkeypatch.setattr(store, "_resources", {})
+        loaded_wind = store.get_wind_resource(LAT, LON, YEAR, 115., filepath=wind_file)
+        loaded_solar = store.get_solar_resource(LAT, LON, YEAR, filepath=solar_file)
+        assert loaded_wind is not wind
+        assert loaded_wind.data == wind.data
+        assert loaded_wind.hub_height_meters == wind.hub_height_meters
+        assert loaded_solar.data == solar.data
+        assert loaded_solar.filename == solar.filename
+
+    with subtests.test("changed file is parsed again"):
+        with open(solar_file, "a") as f:
+            f.write("\n")
+        assert store.get_solar_resource(LAT, LON, YEAR, filepath=solar_file) is not loaded_solar
+
+
+def test_shared_site_resources(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "_resources", {})
+    wind_file, solar_file = copy_weather(tmp_path)
+
+    with store.shared_site_resources():
+        site = SiteInfo(
+            data={"lat": LAT, "lon": LON, "elev": 1099, "year": YEAR, "tz": -6},
+            solar_resource_file=solar_file,
+            wind_resource_file=wind_file,
+            hub_height=115.,
+        )
+
+    assert site.wind_resource is store.get_wind_resource(
+        LAT, LON, YEAR, 115., filepath=wind_file, source="WTK"
+    )
+    assert site.solar_resource is store.get_solar_resource(LAT, LON, YEAR, filepath=solar_file)
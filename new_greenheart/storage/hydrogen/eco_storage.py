@@ -18,6 +18,8 @@ from greenheart.simulation.technologies.offshore.floating_platform import (
 )
 from greenheart.simulation.technologies.hydrogen.h2_transport.h2_compression import Compressor
 
+from new_greenheart.core.representative_periods import annual_mean
+
 
 from greenheart.simulation.technologies.hydrogen.h2_storage.pipe_storage import UndergroundPipeStorage  # noqa: E501  # fmt: skip  # isort:skip
 from greenheart.simulation.technologies.hydrogen.h2_storage.storage_sizing import hydrogen_storage_capacity  # noqa: E501  # fmt: skip  # isort:skip
@@ -58,8 +60,8 @@ class H2Storage(om.ExplicitComponent):
 
         ##################### get storage capacity from hydrogen storage demand
         elif tech_config["details"]["size_capacity_from_demand"]["flag"]:
-            hydrogen_storage_demand = np.mean(
-                inputs["hydrogen"]
+            hydrogen_storage_demand = annual_mean(
+                inputs["hydrogen"], self.options["plant_config"]
             )  # TODO: update demand based on end-use needs
             results_dict = {
                 "Hydrogen Hourly Production [kg/hr]" : inputs["hydrogen"],
@@ -1,3 +1,4 @@
+import numpy as np
 import openmdao.api as om
 
 
@@ -9,5 +10,10 @@ class CablePerformanceModel(om.ExplicitComponent):
         self.add_input('electricity_input', val=0.0, shape_by_conn=True, copy_shape='electricity_output', units='kW')
         self.add_output('electricity_output', val=0.0, shape_by_conn=True, copy_shape='electricity_input', units='kW')
 
+    def setup_partials(self):
+        # The output is the input, so the partials are a constant identity
+        arange = np.arange(self._var_rel2meta['electricity_input']['size'])
+        self.declare_partials('electricity_output', 'electricity_input', rows=arange, cols=arange, val=1.0)
+
     def compute(self, inputs, outputs):
-        outputs['electricity_output'] = inputs['electricity_input']
\ No newline at end of file
+        outputs['electricity_output'] = inputs['electricity_input']
@@ -1,3 +1,4 @@
+import numpy as np
 import openmdao.api as om
 
 
@@ -9,5 +10,10 @@ class PipePerformanceModel(om.ExplicitComponent):
         self.add_input('hydrogen_input', val=0.0, shape_by_conn=True, copy_shape='hydrogen_output', units='kg/s')
         self.add_output('hydrogen_output', val=0.0, shape_by_conn=True, copy_shape='hydrogen_input', units='kg/s')
 
+    def setup_partials(self):
+        # The output is the input, so the partials are a constant identity
+        arange = np.arange(self._var_rel2meta['hydrogen_input']['size'])
+        self.declare_partials('hydrogen_output', 'hydrogen_input', rows=arange, cols=arange, val=1.0)
+
     def compute(self, inputs, outputs):
-        outputs['hydrogen_output'] = inputs['hydrogen_input']
\ No newline at end of file
+        outputs['hydrogen_output'] = inputs['hydrogen_input']
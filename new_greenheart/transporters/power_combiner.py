@@ -1,21 +1,73 @@
+import numpy as np
 import openmdao.api as om
+from attrs import define, field
+
+from new_greenheart.core.utilities import BaseConfig
+from new_greenheart.core.validators import gt_zero, range_val
+
+
+@define
+class CombinerPerformanceModelConfig(BaseConfig):
+    """Configuration class for the CombinerPerformanceModel.
+
+    Args:
+        n_inputs (int): Number of power sources that are combined. Set from the number of
+            transport links into the combiner when the model is built from a plant config.
+            Default = 2.
+        loss_factors (list, optional): Fraction of the power of each source that is lost in
+            the combiner, e.g. in power electronics. Default = no losses.
+    """
+    n_inputs: int = field(default=2, validator=gt_zero)
+    loss_factors: list = field(default=None)
+
+    def __attrs_post_init__(self):
+        if self.loss_factors is None:
+            self.loss_factors = [0.0] * self.n_inputs
+        if len(self.loss_factors) != self.n_inputs:
+            raise ValueError(
+                f"loss_factors must have one entry for each of the {self.n_inputs} inputs, but "
+                f"{len(self.loss_factors)} were given"
+            )
+        for loss_factor in self.loss_factors:
+            range_val(0.0, 1.0)(self, 'loss_factors', loss_factor)
 
 
 class CombinerPerformanceModel(om.ExplicitComponent):
     """
-    Combine power from two sources into one output without losses.
+    Combine power from any number of sources into one output.
 
-    This component is purposefully simple; a more realistic case might include
-    losses or other considerations from power electronics.
+    The sources are connected to `electricity_input1` to `electricity_input<n_inputs>`. They
+    are stacked into one (n_inputs, ...) buffer, which is reduced to the output in a single
+    weighted sum. The weights are one minus the loss factor of each source.
     """
     def initialize(self):
         self.options.declare('plant_config', types=dict)
-        self.options.declare('tech_config', types=dict)
+        self.options.declare('tech_config', types=dict, default={})
 
     def setup(self):
-        self.add_input('electricity_input1', val=0.0, shape_by_conn=True, units='kW')
-        self.add_input('electricity_input2', val=0.0, shape_by_conn=True, units='kW')
+        self.config = CombinerPerformanceModelConfig.from_dict(
+            self.options['tech_config'].get('model_inputs', {}).get('performance_parameters', {})
+        )
+        self.input_names = [f'electricity_input{i + 1}' for i in range(self.config.n_inputs)]
+        for name in self.input_names:
+            self.add_input(name, val=0.0, shape_by_conn=True, units='kW')
         self.add_output('electricity', val=0.0, copy_shape='electricity_input1', units='kW')
+        self.efficiencies = 1.0 - np.asarray(self.config.loss_factors, dtype=float)
+
+    def setup_partials(self):
+        # The output is a weighted sum of the inputs, so the partials are constant diagonals
+        shape = self._var_rel2meta['electricity']['shape']
+        arange = np.arange(self._var_rel2meta['electricity']['size'])
+        for name, efficiency in zip(self.input_names, self.efficiencies):
+            self.declare_partials('electricity', name, rows=arange, cols=arange, val=efficiency)
+
+        # Reused by every compute, so the inputs are stacked without allocating
+        self.buffer = np.zeros((self.config.n_inputs, *shape))
 
     def compute(self, inputs, outputs):
-        outputs['electricity'] = inputs['electricity_input1'] + inputs['electricity_input2']
+        buffer = self.buffer
+        if self.under_complex_step:
+            buffer = np.zeros(self.buffer.shape, dtype=complex)
+        for i, name in enumerate(self.input_names):
+            buffer[i] = inputs[name]
+        outputs['electricity'] = np.tensordot(self.efficiencies, buffer, axes=1)
@@ -0,0 +1,27 @@
+import pytest
+import numpy as np
+
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_check_partials
+
+from new_greenheart.transporters.cable import CablePerformanceModel
+from new_greenheart.transporters.pipe import PipePerformanceModel
+
+
+@pytest.mark.parametrize(
+    "transporter,commodity,units",
+    [(CablePerformanceModel, 'electricity', 'kW'), (PipePerformanceModel, 'hydrogen', 'kg/s')],
+)
+def test_pass_through(transporter, commodity, units):
+    prob = om.Problem()
+    ivc = om.IndepVarComp()
+    ivc.add_output(f'{commodity}_input', val=np.random.rand(2, 24), units=units)
+    prob.model.add_subsystem('ivc', ivc, promotes=['*'])
+    prob.model.add_subsystem("comp", transporter(), promotes=["*"])
+
+    prob.setup(force_alloc_complex=True)
+    prob.run_model()
+
+    assert prob.get_val(f'{commodity}_output') == pytest.approx(prob.get_val(f'{commodity}_input'))
+    partials = prob.check_partials(method='cs', out_stream=None)
+    assert_check_partials(partials)
@@ -4,6 +4,7 @@ from pytest import approx
 import numpy as np
 
 import openmdao.api as om
+from openmdao.utils.assert_utils import assert_check_partials
 
 
 np.random.seed(0)
@@ -27,4 +28,54 @@ def test_combiner_performance():
     prob.set_val('electricity_input2', electricity_input2, units='kW')
     prob.run_model()
 
-    assert prob.get_val('electricity', units='kW') == approx(electricity_output, rel=1e-5)
\ No newline at end of file
+    assert prob.get_val('electricity', units='kW') == approx(electricity_output, rel=1e-5)
+
+def test_combiner_partials():
+    prob = om.Problem()
+    prob.model.add_subsystem("comp", CombinerPerformanceModel(), promotes=["*"])
+    ivc = om.IndepVarComp()
+    ivc.add_output('electricity_input1', val=np.random.rand(24), units='kW')
+    ivc.add_output('electricity_input2', val=np.random.rand(24), units='kW')
+    prob.model.add_subsystem('ivc', ivc, promotes=['*'])
+
+    prob.setup(force_alloc_complex=True)
+    prob.run_model()
+
+    partials = prob.check_partials(method='cs', out_stream=None)
+    assert_check_partials(partials)
+
+
+def test_combiner_n_inputs_with_losses():
+    tech_config = {
+        "model_inputs": {
+            "performance_parameters": {"n_inputs": 3, "loss_factors": [0.0, 0.1, 0.5]},
+        },
+    }
+    prob = om.Problem()
+    ivc = om.IndepVarComp()
+    inputs = np.random.rand(3, 24)
+    for i in range(3):
+        ivc.add_output(f'electricity_input{i + 1}', val=inputs[i], units='kW')
+    prob.model.add_subsystem('ivc', ivc, promotes=['*'])
+    prob.model.add_subsystem(
+        "comp", CombinerPerformanceModel(plant_config={}, tech_config=tech_config), promotes=["*"]
+    )
+
+    prob.setup(force_alloc_complex=True)
+    prob.run_model()
+
+    expected = inputs[0] + 0.9 * inputs[1] + 0.5 * inputs[2]
+    assert prob.get_val('electricity', units='kW') == approx(expected)
+    partials = prob.check_partials(method='cs', out_stream=None)
+    assert_check_partials(partials)
+
+
+def test_combiner_loss_factors_length():
+    tech_config = {
+        "model_inputs": {"performance_parameters": {"n_inputs": 3, "loss_factors": [0.1, 0.1]}},
+    }
+    prob = om.Problem()
+    prob.model.add_subsystem("comp", CombinerPerformanceModel(plant_config={}, tech_config=tech_config))
+
+    with pytest.raises(ValueError, match="one entry for each of the 3 inputs"):
+        prob.setup()